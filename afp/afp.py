@@ -5,11 +5,14 @@ from .auth import (
     TrezorAuthenticator,
 )
 from .config import Config
-from .api.admin import Admin
+from .api.admin import Admin, AsyncAdmin
 from .api.margin_account import MarginAccount
 from .api.product import Product
-from .api.trading import Trading
-from .constants import defaults
+from .api.streams import StreamHub
+from .api.trading import AsyncTrading, Trading
+from .constants import STREAM_QUEUE_SIZE, defaults
+from .enums import OverflowPolicy
+from .nonces import NonceAllocator
 from .exceptions import ConfigurationError
 from .validators import validate_address
 
@@ -23,8 +26,8 @@ class AFP:
        parameters when `AFP_TESTNET=true` is set.
     2) Environment variables override defaults.
     3) AFP constructor arguments override environment variables.
-    4) Admin, MarginAccount, Product, and Trading API constructor arguments override
-       AFP constructor arguments.
+    4) Admin, AsyncAdmin, AsyncTrading, MarginAccount, Product, StreamHub, and
+       Trading API constructor arguments override AFP constructor arguments.
 
     Parameters
     ----------
@@ -41,6 +44,30 @@ class AFP:
         The REST API base URL of the exchange. Defaults to the URL of the AutEx
         exchange. Its default value can be overridden with the `AFP_EXCHANGE_URL`
         environment variable.
+    exchange_pool_size : int, optional
+        The maximum number of connections to the exchange that are kept open for
+        reuse. Should be at least the number of threads or concurrent tasks sending
+        requests to the exchange. Defaults to 32. Its default value can be overridden
+        with the `AFP_EXCHANGE_POOL_SIZE` environment variable.
+    exchange_tcp_keepalive : bool, optional
+        Whether to enable TCP keep-alive probes on connections to the exchange, so that
+        idle connections are not dropped by network middleboxes and requests do not
+        have to wait for a new TCP & TLS handshake. Defaults to `True`. Its default
+        value can be overridden with the `AFP_EXCHANGE_TCP_KEEPALIVE` environment
+        variable.
+    exchange_max_retries : int, optional
+        The maximum number of times a request to the exchange is retried, with
+        exponentially increasing delays with full jitter, or as instructed by the
+        `Retry-After` header. Requests rejected by the rate limit of the exchange are
+        always retried; other failures only if the request is idempotent, i.e. for
+        queries and limit order submissions, which the exchange deduplicates by
+        intent hash. Defaults to 0. Its default value can be overridden with the
+        `AFP_EXCHANGE_MAX_RETRIES` environment variable.
+    exchange_rate_limit : float, optional
+        The maximum number of requests per second sent to the exchange by each API
+        object. Requests over the limit are delayed on the client. Unlimited by
+        default. Its default value can be overridden with the
+        `AFP_EXCHANGE_RATE_LIMIT` environment variable.
     ipfs_api_url : str, optional
         The RPC API root URL of an IPFS node that supports Kubo RPC API v0, required
         for product registration. Defaults to the URL of a local IPFS node. Its default
@@ -100,6 +127,10 @@ class AFP:
         authenticator: Authenticator | None = None,
         rpc_url: str | None = defaults.RPC_URL,
         exchange_url: str = defaults.EXCHANGE_URL,
+        exchange_pool_size: int = defaults.EXCHANGE_POOL_SIZE,
+        exchange_tcp_keepalive: bool = defaults.EXCHANGE_TCP_KEEPALIVE,
+        exchange_max_retries: int = defaults.EXCHANGE_MAX_RETRIES,
+        exchange_rate_limit: float | None = defaults.EXCHANGE_RATE_LIMIT,
         ipfs_api_url: str = defaults.IPFS_API_URL,
         ipfs_api_key: str | None = defaults.IPFS_API_KEY,
         chain_id: int = defaults.CHAIN_ID,
@@ -119,6 +150,10 @@ class AFP:
         self.config = Config(
             authenticator=authenticator,
             exchange_url=exchange_url,
+            exchange_pool_size=exchange_pool_size,
+            exchange_tcp_keepalive=exchange_tcp_keepalive,
+            exchange_max_retries=exchange_max_retries,
+            exchange_rate_limit=exchange_rate_limit,
             rpc_url=rpc_url,
             ipfs_api_url=ipfs_api_url,
             ipfs_api_key=ipfs_api_key,
@@ -198,6 +233,10 @@ class AFP:
         self,
         authenticator: Authenticator | None = None,
         exchange_url: str | None = None,
+        *,
+        presign_cancellations: bool = False,
+        cache_products: bool = False,
+        nonce_allocator: NonceAllocator | None = None,
     ) -> Trading:
         """API for trading in the AutEx exchange.
 
@@ -211,6 +250,17 @@ class AFP:
         exchange_url: str, optional
             The REST API base URL of the exchange. Defaults to the value specified in
             the `AFP` constructor.
+        presign_cancellations : bool
+            Whether to sign a cancellation for each limit order as soon as it has been
+            accepted by the exchange, so that it can be cancelled without delay with
+            `Trading.kill_switch()`. Disabled by default.
+        cache_products : bool
+            Whether to serve `Trading.product()` from a cache of all approved products
+            that is refreshed in the background; see `Trading.product_cache`. Disabled
+            by default.
+        nonce_allocator : afp.nonces.NonceAllocator, optional
+            The strategy for allocating the nonces of intents and cancellations, see
+            `afp.nonces`. Defaults to random nonces.
 
         Raises
         ------
@@ -218,9 +268,110 @@ class AFP:
             If the exchange rejects the login attempt.
         """
         return Trading(
+            self.config,
+            authenticator=authenticator,
+            exchange_url=exchange_url,
+            presign_cancellations=presign_cancellations,
+            cache_products=cache_products,
+            nonce_allocator=nonce_allocator,
+        )
+
+    def AsyncAdmin(
+        self,
+        authenticator: Authenticator | None = None,
+        exchange_url: str | None = None,
+    ) -> AsyncAdmin:
+        """Asynchronous API for AutEx administration, restricted to AutEx admins.
+
+        Authenticates with the exchange when entering the `async with` block.
+
+        Parameters
+        ----------
+        authenticator : afp.Authenticator, optional
+            Authenticator for authenticating with the AutEx exchange. Defaults to the
+            authenticator specified in the `AFP` constructor.
+        exchange_url: str, optional
+            The REST API base URL of the exchange. Defaults to the value specified in
+            the `AFP` constructor.
+        """
+        return AsyncAdmin(
             self.config, authenticator=authenticator, exchange_url=exchange_url
         )
 
+    def AsyncTrading(
+        self,
+        authenticator: Authenticator | None = None,
+        exchange_url: str | None = None,
+        *,
+        nonce_allocator: NonceAllocator | None = None,
+    ) -> AsyncTrading:
+        """Asynchronous API for trading in the AutEx exchange.
+
+        Authenticates with the exchange when entering the `async with` block.
+
+        Parameters
+        ----------
+        authenticator : afp.Authenticator, optional
+            Authenticator for signing intents and authenticating with the AutEx
+            exchange. Defaults to the authenticator specified in the `AFP` constructor.
+        exchange_url: str, optional
+            The REST API base URL of the exchange. Defaults to the value specified in
+            the `AFP` constructor.
+        nonce_allocator : afp.nonces.NonceAllocator, optional
+            The strategy for allocating the nonces of intents and cancellations, see
+            `afp.nonces`. Defaults to random nonces.
+        """
+        return AsyncTrading(
+            self.config,
+            authenticator=authenticator,
+            exchange_url=exchange_url,
+            nonce_allocator=nonce_allocator,
+        )
+
+    def StreamHub(
+        self,
+        authenticator: Authenticator | None = None,
+        exchange_url: str | None = None,
+        *,
+        queue_size: int = STREAM_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> StreamHub:
+        """Multiplexer that reads market depth, OHLCV and order fill streams of the
+        AutEx exchange in a single background thread and fans out the messages to
+        subscribers.
+
+        Authenticates with the exchange on creation.
+
+        Parameters
+        ----------
+        authenticator : afp.Authenticator, optional
+            Authenticator for authenticating with the AutEx exchange. Defaults to the
+            authenticator specified in the `AFP` constructor.
+        exchange_url: str, optional
+            The REST API base URL of the exchange. Defaults to the value specified in
+            the `AFP` constructor.
+        queue_size : int
+            The default maximum number of queued messages per subscriber.
+        overflow : afp.enums.OverflowPolicy
+            What to do when a subscriber's queue is full: `DROP_OLDEST` (default)
+            discards the oldest queued message, `DROP_NEWEST` discards the new message,
+            `COALESCE` replaces the newest queued message with the new one, and `FAIL`
+            ends the subscription with an error. Order fill subscriptions always use
+            `FAIL`, so that order fills are never lost silently.
+
+        Raises
+        ------
+        afp.exceptions.AuthenticationError
+            If the exchange rejects the login attempt.
+        """
+        return StreamHub(
+            self.config,
+            authenticator=authenticator,
+            exchange_url=exchange_url,
+            queue_size=queue_size,
+            overflow=overflow,
+        )
+
 
 def _default_authenticator() -> Authenticator | None:
     auth_variable_count = sum(
@@ -1,8 +1,8 @@
 from .. import validators
-from ..decorators import refresh_token_on_expiry
+from ..decorators import async_refresh_token_on_expiry, refresh_token_on_expiry
 from ..enums import ListingState
 from ..dtos import ExchangeProductListingSubmission, ExchangeProductUpdateSubmission
-from .base import ExchangeAPI
+from .base import AsyncExchangeAPI, ExchangeAPI
 
 
 class Admin(ExchangeAPI):
@@ -67,3 +67,46 @@ class Admin(ExchangeAPI):
         self._exchange.update_product_listing(
             validators.validate_hexstr32(product_id), product_update
         )
+
+
+class AsyncAdmin(AsyncExchangeAPI):
+    """Asynchronous API for AutEx administration, restricted to AutEx admins.
+
+    Authenticates with the exchange when entering the asynchronous context manager
+    and closes the connections to the exchange on exit.
+    """
+
+    @async_refresh_token_on_expiry
+    async def list_product(self, product_id: str) -> None:
+        """Lists a product on the exchange.
+
+        See `Admin.list_product()`.
+        """
+        product_listing = ExchangeProductListingSubmission(id=product_id)
+        await self._exchange.list_product(product_listing)
+
+    @async_refresh_token_on_expiry
+    async def reveal_product(self, product_id: str) -> None:
+        """Makes a product publicly available for trading on the exchange.
+
+        See `Admin.reveal_product()`.
+        """
+        product_update = ExchangeProductUpdateSubmission(
+            listing_state=ListingState.PUBLIC
+        )
+        await self._exchange.update_product_listing(
+            validators.validate_hexstr32(product_id), product_update
+        )
+
+    @async_refresh_token_on_expiry
+    async def delist_product(self, product_id: str) -> None:
+        """Delists a product from the exchange.
+
+        See `Admin.delist_product()`.
+        """
+        product_update = ExchangeProductUpdateSubmission(
+            listing_state=ListingState.DELISTED
+        )
+        await self._exchange.update_product_listing(
+            validators.validate_hexstr32(product_id), product_update
+        )
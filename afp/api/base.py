@@ -1,23 +1,36 @@
+import asyncio
+import threading
 from abc import ABC
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import UTC, datetime
 from functools import cache
 from urllib.parse import urlparse
-from typing import cast
+from typing import Any, Iterable, Self, cast
 
 from eth_typing.evm import ChecksumAddress
+from hexbytes import HexBytes
 from siwe import ISO8601Datetime, SiweMessage, siwe  # type: ignore (untyped library)
 from web3 import Web3, HTTPProvider
 from web3.contract.contract import ContractFunction
+from web3.exceptions import Web3RPCError
 from web3.types import TxParams
 
+from .. import constants
 from ..auth import Authenticator
 from ..bindings.erc20 import ERC20
 from ..config import Config
-from ..dtos import LoginSubmission
+from ..constants import DEFAULT_BATCH_SIZE
+from ..dtos import LoginSubmission, OrderFillFilter
+from ..enums import TradeState
 from ..exceptions import ConfigurationError
-from ..exchange import ExchangeClient
+from ..exchange import AsyncExchangeClient, ExchangeClient
+from ..gas import FeeOracle
 from ..ipfs import IPFSClient
-from ..schemas import Transaction
+from ..nonces import TransactionNonceManager
+from ..receipts import PendingTransaction, ReceiptPoller
+from ..records import LazyRecord
+from ..schemas import OrderFill, Transaction
 
 
 class BaseAPI(ABC):
@@ -52,23 +65,13 @@ class ClearingSystemAPI(BaseAPI, ABC):
         self._w3.eth.default_account = self._authenticator.address
 
     def _transact(self, func: ContractFunction) -> Transaction:
-        tx_count = self._w3.eth.get_transaction_count(self._authenticator.address)
-        tx_params = {
-            "from": self._authenticator.address,
-            "nonce": tx_count,
-            "gasLimit": self._config.gas_limit,
-            "maxFeePerGas": self._config.max_fee_per_gas,
-            "maxPriorityFeePerGas": self._config.max_priority_fee_per_gas,
-        }
-
-        prepared_tx = func.build_transaction(
-            cast(TxParams, {k: v for k, v in tx_params.items() if v is not None})
-        )
-        signed_tx = self._authenticator.sign_transaction(prepared_tx)
-        tx_hash = self._w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash, prepared_tx = self._send_transaction(func)
         tx_receipt = self._w3.eth.wait_for_transaction_receipt(
             tx_hash, timeout=self._config.timeout_seconds
         )
+        if tx_receipt.get("status") == 0 and self._config.gas_limit is None:
+            # The transaction may have run out of gas with a memoized estimate
+            _fee_oracle(self._w3).forget(func)
 
         return Transaction(
             hash=tx_hash.to_0x_hex(),
@@ -76,15 +79,260 @@ class ClearingSystemAPI(BaseAPI, ABC):
             receipt=dict(tx_receipt),
         )
 
+    def _transact_nowait(self, func: ContractFunction) -> PendingTransaction:
+        tx_hash, prepared_tx = self._send_transaction(func)
+        pending = _receipt_poller(self._w3).watch(
+            tx_hash, dict(prepared_tx), timeout=self._config.timeout_seconds
+        )
+        if self._config.gas_limit is None:
+            oracle = _fee_oracle(self._w3)
+
+            def forget_gas_if_failed(future: "Future[Transaction]") -> None:
+                # The transaction may have run out of gas with a memoized estimate
+                if (
+                    not future.cancelled()
+                    and future.exception() is None
+                    and future.result().receipt.get("status") == 0
+                ):
+                    oracle.forget(func)
+
+            pending.add_done_callback(forget_gas_if_failed)
+        return pending
+
+    def _send_transaction(self, func: ContractFunction) -> tuple[HexBytes, TxParams]:
+        nonces = _transaction_nonces(self._w3, self._authenticator.address)
+        # Estimate gas before allocating a nonce so that reverting calls fail early
+        gas_params = self._gas_params(func)
+        attempts = 0
+        while True:
+            attempts += 1
+            nonce = nonces.allocate()
+            try:
+                tx_params = {
+                    "from": self._authenticator.address,
+                    "nonce": nonce,
+                    "chainId": self._config.chain_id,
+                    **gas_params,
+                }
+                prepared_tx = func.build_transaction(
+                    cast(
+                        TxParams, {k: v for k, v in tx_params.items() if v is not None}
+                    )
+                )
+                signed_tx = self._authenticator.sign_transaction(prepared_tx)
+                tx_hash = self._w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            except Exception as error:
+                if not _is_nonce_error(error):
+                    # The nonce has not been used, so it is allocated again to the
+                    # next transaction
+                    nonces.release(nonce)
+                    raise
+                # The nonce has been used by a transaction sent by another client,
+                # so the counter has to be resynchronized with the node
+                nonces.reset()
+                if attempts <= constants.TRANSACTION_NONCE_RETRIES:
+                    continue
+                raise
+            return tx_hash, prepared_tx
+
+    def _gas_params(self, func: ContractFunction) -> dict[str, int | None]:
+        # Gas parameters that are not configured are taken from the fee oracle, so
+        # that they are not requested from the node for each transaction
+        oracle = _fee_oracle(self._w3)
+        max_fee_per_gas = self._config.max_fee_per_gas
+        max_priority_fee_per_gas = self._config.max_priority_fee_per_gas
+        if max_fee_per_gas is None or max_priority_fee_per_gas is None:
+            base_fee, priority_fee = oracle.fees()
+            if max_priority_fee_per_gas is None:
+                max_priority_fee_per_gas = priority_fee
+            if max_fee_per_gas is None:
+                # Allow for the base fee to double before the transaction is mined
+                max_fee_per_gas = 2 * base_fee + max_priority_fee_per_gas
+        return {
+            "gasLimit": self._config.gas_limit,
+            "gas": (
+                oracle.gas(func, self._authenticator.address)
+                if self._config.gas_limit is None
+                else None
+            ),
+            "maxFeePerGas": max_fee_per_gas,
+            "maxPriorityFeePerGas": max_priority_fee_per_gas,
+        }
+
     @cache
     def _decimals(self, collateral_asset: ChecksumAddress) -> int:
         token_contract = ERC20(self._w3, collateral_asset)
         return token_contract.decimals()
 
 
-class ExchangeAPI(BaseAPI, ABC):
-    _exchange: ExchangeClient
+# Transactions of an account share a nonce sequence across all API objects, and
+# transactions sent to a node share a fee oracle and a receipt poller
+_nonce_managers: dict[tuple[str, ChecksumAddress], TransactionNonceManager] = {}
+_fee_oracles: dict[str, FeeOracle] = {}
+_receipt_pollers: dict[str, ReceiptPoller] = {}
+_registry_lock = threading.Lock()
+
+
+def _transaction_nonces(w3: Web3, address: ChecksumAddress) -> TransactionNonceManager:
+    key = (_endpoint(w3), address)
+    with _registry_lock:
+        manager = _nonce_managers.get(key)
+        if manager is None:
+            manager = _nonce_managers[key] = TransactionNonceManager(
+                lambda: w3.eth.get_transaction_count(address, "pending")
+            )
+    return manager
+
+
+def _fee_oracle(w3: Web3) -> FeeOracle:
+    key = _endpoint(w3)
+    with _registry_lock:
+        oracle = _fee_oracles.get(key)
+        if oracle is None:
+            oracle = _fee_oracles[key] = FeeOracle(w3)
+    return oracle
+
+
+def _receipt_poller(w3: Web3) -> ReceiptPoller:
+    key = _endpoint(w3)
+    with _registry_lock:
+        poller = _receipt_pollers.get(key)
+        if poller is None:
+            poller = _receipt_pollers[key] = ReceiptPoller(w3)
+    return poller
+
+
+def _endpoint(w3: Web3) -> str:
+    return str(getattr(w3.provider, "endpoint_uri", id(w3)))
+
+
+def _is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return isinstance(error, Web3RPCError) and any(
+        reason in message
+        for reason in (
+            "nonce too low",
+            "replacement transaction underpriced",
+            "already known",
+        )
+    )
+
+
+class BaseExchangeAPI(BaseAPI, ABC):
     _trading_protocol_id: str
+    _login_count: int
+    _login_lock: asyncio.Lock | None
+
+    def __init__(self, config: Config, authenticator: Authenticator | None = None):
+        super().__init__(config, authenticator)
+        self._login_count = 0
+        self._login_lock = None
+
+    @staticmethod
+    def _create_backfill_filter(
+        filter: OrderFillFilter, since: datetime, batch: int
+    ) -> OrderFillFilter:
+        # Query all trade states so that order fills that have moved on to a later
+        # state while disconnected are also found
+        return filter.model_copy(
+            update=dict(
+                start=since,
+                trade_states=[],
+                batch=batch,
+                batch_size=DEFAULT_BATCH_SIZE,
+                newest_first=False,
+            )
+        )
+
+    async def _login_async(
+        self, exchange: AsyncExchangeClient, expired_login: int | None = None
+    ) -> None:
+        # Coroutines whose token has expired concurrently log in only once; the
+        # others skip logging in if the login they started with has been refreshed
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        async with self._login_lock:
+            if expired_login is not None and expired_login != self._login_count:
+                return
+            nonce = await exchange.generate_login_nonce()
+            exchange_parameters = await exchange.login(
+                self._create_login_submission(nonce)
+            )
+            self._trading_protocol_id = exchange_parameters.trading_protocol_id
+            self._login_count += 1
+
+    def _create_login_submission(self, nonce: str) -> LoginSubmission:
+        message = self._generate_eip4361_message(nonce)
+        signature = self._authenticator.sign_message(message.encode("ascii"))
+        return LoginSubmission(message=message, signature=Web3.to_hex(signature))
+
+    def _generate_eip4361_message(self, nonce: str) -> str:
+        message = SiweMessage(
+            domain=urlparse(self._config.exchange_url).netloc,
+            address=self._authenticator.address,
+            uri=self._config.exchange_url,
+            version=siwe.VersionEnum.one,  # type: ignore
+            chain_id=self._config.chain_id,
+            issued_at=ISO8601Datetime.from_datetime(datetime.now()),
+            nonce=nonce,
+            statement=None,
+        )
+        return message.prepare_message()
+
+
+class OrderFillTracker:
+    """Deduplicates order fill updates across reconnections and keeps track of the
+    point in time from which missed updates should be retrieved."""
+
+    _trade_states: frozenset[TradeState]
+    _track_open: bool
+    _seen: OrderedDict[tuple[str, str], set[TradeState]]
+    _open: dict[tuple[str, str], datetime]
+    _latest: datetime
+
+    def __init__(self, trade_states: Iterable[TradeState]):
+        self._trade_states = frozenset(trade_states)
+        # Pending order fills only need to be revisited if later states are subscribed
+        self._track_open = not self._trade_states or bool(
+            self._trade_states - {TradeState.PENDING}
+        )
+        self._seen = OrderedDict()
+        self._open = {}
+        self._latest = datetime.now(UTC)
+
+    @property
+    def cursor(self) -> datetime:
+        if self._open:
+            return min(min(self._open.values()), self._latest)
+        return self._latest
+
+    def add(self, order_fill: OrderFill | LazyRecord[OrderFill]) -> bool:
+        """Records an order fill update and returns whether it has not been seen."""
+        key = (order_fill.order.id, order_fill.trade.id)
+        state = order_fill.trade.state
+        states = self._seen.get(key)
+        if states is None:
+            # An order fill that was missed entirely is reported in its current state
+            states = self._seen[key] = set()
+            if len(self._seen) > constants.RECONNECT_DEDUPLICATION_WINDOW:
+                oldest, _ = self._seen.popitem(last=False)
+                self._open.pop(oldest, None)
+        elif state in states or (
+            self._trade_states and state not in self._trade_states
+        ):
+            return False
+
+        states.add(state)
+        self._latest = max(self._latest, order_fill.trade.timestamp)
+        if self._track_open and state == TradeState.PENDING:
+            self._open[key] = order_fill.trade.timestamp
+        else:
+            self._open.pop(key, None)
+        return True
+
+
+class ExchangeAPI(BaseExchangeAPI, ABC):
+    _exchange: ExchangeClient
 
     def __init__(
         self,
@@ -96,7 +344,13 @@ class ExchangeAPI(BaseAPI, ABC):
             exchange_url = config.exchange_url
 
         super().__init__(config, authenticator)
-        self._exchange = ExchangeClient(exchange_url)
+        self._exchange = ExchangeClient(
+            exchange_url,
+            pool_size=config.exchange_pool_size,
+            tcp_keepalive=config.exchange_tcp_keepalive,
+            max_retries=config.exchange_max_retries,
+            rate_limit=config.exchange_rate_limit,
+        )
         self._login()
 
     def __repr__(self) -> str:
@@ -107,28 +361,50 @@ class ExchangeAPI(BaseAPI, ABC):
 
     def _login(self):
         nonce = self._exchange.generate_login_nonce()
-        message = self._generate_eip4361_message(nonce)
-        signature = self._authenticator.sign_message(message.encode("ascii"))
+        exchange_parameters = self._exchange.login(self._create_login_submission(nonce))
+        self._trading_protocol_id = exchange_parameters.trading_protocol_id
 
-        login_submission = LoginSubmission(
-            message=message, signature=Web3.to_hex(signature)
-        )
-        exchange_parameters = self._exchange.login(login_submission)
 
-        self._trading_protocol_id = exchange_parameters.trading_protocol_id
+class AsyncExchangeAPI(BaseExchangeAPI, ABC):
+    _exchange: AsyncExchangeClient
 
-    def _generate_eip4361_message(self, nonce: str) -> str:
-        message = SiweMessage(
-            domain=urlparse(self._config.exchange_url).netloc,
-            address=self._authenticator.address,
-            uri=self._config.exchange_url,
-            version=siwe.VersionEnum.one,  # type: ignore
-            chain_id=self._config.chain_id,
-            issued_at=ISO8601Datetime.from_datetime(datetime.now()),
-            nonce=nonce,
-            statement=None,
+    def __init__(
+        self,
+        config: Config,
+        authenticator: Authenticator | None = None,
+        exchange_url: str | None = None,
+    ):
+        if exchange_url is None:
+            exchange_url = config.exchange_url
+
+        super().__init__(config, authenticator)
+        self._exchange = AsyncExchangeClient(
+            exchange_url,
+            pool_size=config.exchange_pool_size,
+            tcp_keepalive=config.exchange_tcp_keepalive,
+            max_retries=config.exchange_max_retries,
+            rate_limit=config.exchange_rate_limit,
         )
-        return message.prepare_message()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(authenticator={repr(self._authenticator)}, "
+            f"exchange={repr(self._exchange)})"
+        )
+
+    async def __aenter__(self) -> Self:
+        await self._login()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the connections to the exchange."""
+        await self._exchange.close()
+
+    async def _login(self, expired_login: int | None = None):
+        await self._login_async(self._exchange, expired_login)
 
 
 class IPFSManager(ABC):
@@ -1,9 +1,11 @@
 from decimal import Decimal
 from functools import cache
+from typing import Literal, cast, overload
 
 from eth_typing.evm import ChecksumAddress
 from hexbytes import HexBytes
 from web3 import Web3
+from web3.contract import Contract
 from web3.exceptions import ContractCustomError
 
 from .. import validators
@@ -11,14 +13,17 @@ from ..bindings import (
     MarginAccount as MarginContract,
     MarginAccountRegistry,
     ProductRegistry,
+    SystemViewer,
 )
 from ..bindings.erc20 import ERC20
 from ..bindings.facade import CLEARING_DIAMOND_ABI
 from ..bindings.margin_account import ABI as MARGIN_CONTRACT_ABI
 from ..bindings.margin_account_registry import ABI as MARGIN_ACCOUNT_REGISTRY_ABI
+from ..bindings.system_viewer import ABI as SYSTEM_VIEWER_ABI
 from ..decorators import convert_web3_error
 from ..exceptions import NotFoundError
-from ..schemas import Position, Transaction
+from ..receipts import PendingTransaction
+from ..schemas import MarginAccountSummary, Position, Transaction
 from .base import ClearingSystemAPI
 
 
@@ -27,8 +32,24 @@ class MarginAccount(ClearingSystemAPI):
 
     ### Transactions ###
 
+    @overload
+    def authorize(
+        self,
+        collateral_asset: str,
+        intent_account_id: str,
+        *,
+        wait: Literal[True] = True,
+    ) -> Transaction: ...
+
+    @overload
+    def authorize(
+        self, collateral_asset: str, intent_account_id: str, *, wait: Literal[False]
+    ) -> PendingTransaction: ...
+
     @convert_web3_error(MARGIN_CONTRACT_ABI, CLEARING_DIAMOND_ABI)
-    def authorize(self, collateral_asset: str, intent_account_id: str) -> Transaction:
+    def authorize(
+        self, collateral_asset: str, intent_account_id: str, *, wait: bool = True
+    ) -> Transaction | PendingTransaction:
         """Authorizes a blockchain account to submit intents to the clearing system
         using the margin account associated with the collateral asset.
 
@@ -38,27 +59,40 @@ class MarginAccount(ClearingSystemAPI):
             The address of the collateral token.
         intent_account_id : str
             The address of the intent account.
+        wait : bool
+            Whether to wait for the transaction to be mined, or to return a pending
+            transaction as soon as it has been sent.
 
         Returns
         -------
-        afp.schemas.Transaction
+        afp.schemas.Transaction or afp.receipts.PendingTransaction
             Transaction parameters.
         """
         collateral_asset = validators.validate_address(collateral_asset)
         intent_account_id = validators.validate_address(intent_account_id)
-        return self._transact(
-            self._margin_contract(collateral_asset).authorize(intent_account_id)
-        )
+        func = self._margin_contract(collateral_asset).authorize(intent_account_id)
+        return self._transact(func) if wait else self._transact_nowait(func)
+
+    @overload
+    def deposit(
+        self, collateral_asset: str, amount: Decimal, *, wait: Literal[True] = True
+    ) -> tuple[Transaction, Transaction]: ...
+
+    @overload
+    def deposit(
+        self, collateral_asset: str, amount: Decimal, *, wait: Literal[False]
+    ) -> tuple[Transaction, PendingTransaction]: ...
 
     @convert_web3_error(MARGIN_CONTRACT_ABI, CLEARING_DIAMOND_ABI)
     def deposit(
-        self, collateral_asset: str, amount: Decimal
-    ) -> tuple[Transaction, Transaction]:
+        self, collateral_asset: str, amount: Decimal, *, wait: bool = True
+    ) -> tuple[Transaction, Transaction | PendingTransaction]:
         """Deposits the specified amount of collateral tokens into the margin account
         associated with the collateral asset.
 
         First approves the token transfer with the collateral token, then executes the
-        transfer.
+        transfer. The approval is always waited for, because the deposit transaction
+        can only be built once the allowance is in effect.
 
         Parameters
         ----------
@@ -66,12 +100,15 @@ class MarginAccount(ClearingSystemAPI):
             The address of the collateral token.
         amount : Decimal
             The amount of collateral tokens to deposit.
+        wait : bool
+            Whether to wait for the deposit transaction to be mined, or to return a
+            pending transaction as soon as it has been sent.
 
         Returns
         -------
         afp.schemas.Transaction
             Parameters of the approval transaction.
-        afp.schemas.Transaction
+        afp.schemas.Transaction or afp.receipts.PendingTransaction
             Parameters of the deposit transaction.
         """
         collateral_asset = validators.validate_address(collateral_asset)
@@ -84,13 +121,24 @@ class MarginAccount(ClearingSystemAPI):
                 token_amount,
             )
         )
-        tx2 = self._transact(
-            self._margin_contract(collateral_asset).deposit(token_amount)
-        )
+        func = self._margin_contract(collateral_asset).deposit(token_amount)
+        tx2 = self._transact(func) if wait else self._transact_nowait(func)
         return (tx1, tx2)
 
+    @overload
+    def withdraw(
+        self, collateral_asset: str, amount: Decimal, *, wait: Literal[True] = True
+    ) -> Transaction: ...
+
+    @overload
+    def withdraw(
+        self, collateral_asset: str, amount: Decimal, *, wait: Literal[False]
+    ) -> PendingTransaction: ...
+
     @convert_web3_error(MARGIN_CONTRACT_ABI, CLEARING_DIAMOND_ABI)
-    def withdraw(self, collateral_asset: str, amount: Decimal) -> Transaction:
+    def withdraw(
+        self, collateral_asset: str, amount: Decimal, *, wait: bool = True
+    ) -> Transaction | PendingTransaction:
         """Withdraws the specified amount of collateral tokens from the margin account
         associated with the collateral asset.
 
@@ -100,17 +148,19 @@ class MarginAccount(ClearingSystemAPI):
             The address of the collateral token.
         amount : Decimal
             The amount of collateral tokens to withdraw.
+        wait : bool
+            Whether to wait for the transaction to be mined, or to return a pending
+            transaction as soon as it has been sent.
 
         Returns
         -------
-        afp.schemas.Transaction
+        afp.schemas.Transaction or afp.receipts.PendingTransaction
             Transaction parameters.
         """
         collateral_asset = validators.validate_address(collateral_asset)
         token_amount = int(amount * 10 ** self._decimals(collateral_asset))
-        return self._transact(
-            self._margin_contract(collateral_asset).withdraw(token_amount)
-        )
+        func = self._margin_contract(collateral_asset).withdraw(token_amount)
+        return self._transact(func) if wait else self._transact_nowait(func)
 
     ### Views ###
 
@@ -156,18 +206,20 @@ class MarginAccount(ClearingSystemAPI):
         )
         decimals = self._decimals(collateral_asset)
         return Position(
-            id=Web3.to_hex(data.position_id),
+            id=Web3.to_hex(data.product_id),
             quantity=data.quantity,
             cost_basis=Decimal(data.cost_basis) / 10**decimals,
             maintenance_margin=Decimal(data.maintenance_margin) / 10**decimals,
             pnl=Decimal(data.pnl) / 10**decimals,
         )
 
-    @convert_web3_error(MARGIN_CONTRACT_ABI, CLEARING_DIAMOND_ABI)
+    @convert_web3_error(SYSTEM_VIEWER_ABI, CLEARING_DIAMOND_ABI)
     def positions(self, collateral_asset: str) -> list[Position]:
         """Returns all positions in the margin account associated with the collateral
         asset.
 
+        The positions are read with a single call to the SystemViewer contract.
+
         Parameters
         ----------
         collateral_asset : str
@@ -178,10 +230,21 @@ class MarginAccount(ClearingSystemAPI):
         list of afp.schemas.Position
         """
         collateral_asset = validators.validate_address(collateral_asset)
-        position_ids = self._margin_contract(collateral_asset).positions(
-            self._authenticator.address
+        system_viewer = SystemViewer(self._w3, self._config.system_viewer_address)
+        (positions,) = system_viewer.positions_by_collateral_asset(
+            collateral_asset, [self._authenticator.address]
         )
-        return [self.position(collateral_asset, Web3.to_hex(id)) for id in position_ids]
+        decimals = self._decimals(collateral_asset)
+        return [
+            Position(
+                id=Web3.to_hex(data.product_id),
+                quantity=data.quantity,
+                cost_basis=Decimal(data.cost_basis) / 10**decimals,
+                maintenance_margin=Decimal(data.maintenance_margin) / 10**decimals,
+                pnl=Decimal(data.pnl) / 10**decimals,
+            )
+            for data in positions
+        ]
 
     @convert_web3_error(MARGIN_CONTRACT_ABI, CLEARING_DIAMOND_ABI)
     def equity(self, collateral_asset: str) -> Decimal:
@@ -283,23 +346,80 @@ class MarginAccount(ClearingSystemAPI):
         )
         return Decimal(amount) / 10 ** self._decimals(collateral_asset)
 
+    @convert_web3_error(MARGIN_CONTRACT_ABI, CLEARING_DIAMOND_ABI)
+    def summary(self, collateral_asset: str) -> MarginAccountSummary:
+        """Returns the capital, equity, maintenance margin, profit and loss and
+        withdrawable amount of the margin account associated with the collateral
+        asset.
+
+        The values are read in a single JSON-RPC batch request at the same block, so
+        that they are consistent with each other.
+
+        Parameters
+        ----------
+        collateral_asset : str
+            The address of the collateral token.
+
+        Returns
+        -------
+        afp.schemas.MarginAccountSummary
+        """
+        collateral_asset = validators.validate_address(collateral_asset)
+        functions = cast(
+            Contract,
+            self._w3.eth.contract(
+                address=self._margin_contract_address(collateral_asset),
+                abi=MARGIN_CONTRACT_ABI,
+            ),
+        ).functions
+        decimals = self._decimals(collateral_asset)
+        block_number = self._w3.eth.block_number
+        with self._w3.batch_requests() as batch:
+            for function in (
+                functions.capital,
+                functions.mae,
+                functions.mma,
+                functions.mmu,
+                functions.pnl,
+                functions.withdrawable,
+            ):
+                batch.add(
+                    function(self._authenticator.address).call(
+                        block_identifier=block_number
+                    )
+                )
+            results = batch.execute()
+        amounts = [Decimal(cast(int, amount)) / 10**decimals for amount in results]
+        return MarginAccountSummary(
+            block_number=block_number,
+            capital=amounts[0],
+            equity=amounts[1],
+            maintenance_margin_available=amounts[2],
+            maintenance_margin_used=amounts[3],
+            profit_and_loss=amounts[4],
+            withdrawable_amount=amounts[5],
+        )
+
     ### Internal getters ###
 
     @cache
-    @convert_web3_error(MARGIN_ACCOUNT_REGISTRY_ABI)
     def _margin_contract(self, collateral_asset: ChecksumAddress) -> MarginContract:
+        return MarginContract(self._w3, self._margin_contract_address(collateral_asset))
+
+    @cache
+    @convert_web3_error(MARGIN_ACCOUNT_REGISTRY_ABI)
+    def _margin_contract_address(
+        self, collateral_asset: ChecksumAddress
+    ) -> ChecksumAddress:
         margin_account_registry_contract = MarginAccountRegistry(
             self._w3, self._config.margin_account_registry_address
         )
         try:
-            margin_contract_address = (
-                margin_account_registry_contract.get_margin_account(
-                    Web3.to_checksum_address(collateral_asset)
-                )
+            return margin_account_registry_contract.get_margin_account(
+                Web3.to_checksum_address(collateral_asset)
             )
         except ContractCustomError:
             raise NotFoundError("No margin account found for collateral asset")
-        return MarginContract(self._w3, margin_contract_address)
 
     @cache
     def _tick_size(self, product_id: str) -> int:
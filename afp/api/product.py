@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, cast
+from typing import Any, Literal, cast, overload
 
 from eth_typing.evm import ChecksumAddress
 from hexbytes import HexBytes
@@ -24,6 +24,7 @@ from ..bindings.product_registry import ABI as PRODUCT_REGISTRY_ABI
 from ..decorators import convert_web3_error
 from ..dtos import ExtendedMetadata
 from ..exceptions import NotFoundError, ValidationError
+from ..receipts import PendingTransaction
 from ..schemas import (
     BaseProduct,
     ExpirySpecification,
@@ -179,10 +180,32 @@ class Product(ClearingSystemAPI, IPFSManager):
         )
         return product_spec.model_copy(update=dict(product=updated_product))
 
+    @overload
+    def register(
+        self,
+        product_spec: PredictionProduct,
+        initial_builder_stake: Decimal,
+        *,
+        wait: Literal[True] = True,
+    ) -> Transaction: ...
+
+    @overload
+    def register(
+        self,
+        product_spec: PredictionProduct,
+        initial_builder_stake: Decimal,
+        *,
+        wait: Literal[False],
+    ) -> PendingTransaction: ...
+
     @convert_web3_error(PRODUCT_REGISTRY_ABI, CLEARING_DIAMOND_ABI)
     def register(
-        self, product_spec: PredictionProduct, initial_builder_stake: Decimal
-    ) -> Transaction:
+        self,
+        product_spec: PredictionProduct,
+        initial_builder_stake: Decimal,
+        *,
+        wait: bool = True,
+    ) -> Transaction | PendingTransaction:
         """Submits a product specification to the clearing system.
 
         The extended metadata should already be pinned to IPFS and the CID should be
@@ -195,10 +218,13 @@ class Product(ClearingSystemAPI, IPFSManager):
         initial_builder_stake : Decimal
             Registration stake (product maintenance fee) in units of the collateral
             asset.
+        wait : bool
+            Whether to wait for the transaction to be mined, or to return a pending
+            transaction as soon as it has been sent.
 
         Returns
         -------
-        afp.schemas.Transaction
+        afp.schemas.Transaction or afp.receipts.PendingTransaction
             Transaction parameters.
         """
         if product_spec.product.base.extended_metadata is None:
@@ -214,19 +240,28 @@ class Product(ClearingSystemAPI, IPFSManager):
         product_registry_contract = ProductRegistry(
             self._w3, self._config.product_registry_address
         )
-        return self._transact(
-            product_registry_contract.register_prediction_product(
-                self._convert_prediction_product_specification(
-                    product_spec.product, decimals
-                ),
-                int(initial_builder_stake * 10**decimals),
-            )
+        func = product_registry_contract.register_prediction_product(
+            self._convert_prediction_product_specification(
+                product_spec.product, decimals
+            ),
+            int(initial_builder_stake * 10**decimals),
         )
+        return self._transact(func) if wait else self._transact_nowait(func)
+
+    @overload
+    def initiate_final_settlement(
+        self, product_id: str, accounts: list[str], *, wait: Literal[True] = True
+    ) -> Transaction: ...
+
+    @overload
+    def initiate_final_settlement(
+        self, product_id: str, accounts: list[str], *, wait: Literal[False]
+    ) -> PendingTransaction: ...
 
     @convert_web3_error(CLEARING_DIAMOND_ABI)
     def initiate_final_settlement(
-        self, product_id: str, accounts: list[str]
-    ) -> Transaction:
+        self, product_id: str, accounts: list[str], *, wait: bool = True
+    ) -> Transaction | PendingTransaction:
         """Initiate final settlement (closeout) process for the specified accounts.
 
         The product must be in Final Settlement state. The accounts must hold non-zero
@@ -239,10 +274,13 @@ class Product(ClearingSystemAPI, IPFSManager):
             The ID of the product.
         accounts : list of str
             List of margin account IDs to initiate settlement for.
+        wait : bool
+            Whether to wait for the transaction to be mined, or to return a pending
+            transaction as soon as it has been sent.
 
         Returns
         -------
-        afp.schemas.Transaction
+        afp.schemas.Transaction or afp.receipts.PendingTransaction
             Transaction parameters.
         """
         product_id = validators.validate_hexstr32(product_id)
@@ -251,9 +289,10 @@ class Product(ClearingSystemAPI, IPFSManager):
         clearing_contract = ClearingDiamond(
             self._w3, self._config.clearing_diamond_address
         )
-        return self._transact(
-            clearing_contract.initiate_final_settlement(HexBytes(product_id), addresses)
+        func = clearing_contract.initiate_final_settlement(
+            HexBytes(product_id), addresses
         )
+        return self._transact(func) if wait else self._transact_nowait(func)
 
     ### Views ###
 
@@ -0,0 +1,574 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Iterable,
+    Self,
+)
+
+from .. import validators
+from ..auth import Authenticator
+from ..backoff import Backoff
+from ..config import Config
+from ..constants import DEFAULT_BATCH_SIZE, STREAM_QUEUE_SIZE
+from ..dtos import OrderFillFilter
+from ..enums import OverflowPolicy, TradeState
+from ..exceptions import (
+    AuthenticationError,
+    AuthorizationError,
+    ExchangeError,
+    NotFoundError,
+    ValidationError,
+)
+from ..exchange import AsyncExchangeClient
+from ..schemas import MarketDepthData, OHLCVItem, OrderFill
+from .base import BaseExchangeAPI, OrderFillTracker
+
+
+class Subscription[T]:
+    """A subscriber's handle to a stream managed by a `StreamHub`.
+
+    Messages are buffered in a bounded queue. If the consumer falls behind and the
+    queue is full then the overflow policy of the subscription decides which message
+    is discarded.
+
+    Subscriptions can be consumed with a `for` loop in any thread or with an
+    `async for` loop in any event loop. Iteration stops when the subscription is
+    closed. If the underlying stream fails with a non-recoverable error then the
+    error is raised after the queued messages have been consumed.
+    """
+
+    _channel: "_Channel[T]"
+    _on_close: Callable[[], None]
+
+    def __init__(self, channel: "_Channel[T]", on_close: Callable[[], None]):
+        self._channel = channel
+        self._on_close = on_close
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(queued={self.queued}, dropped={self.dropped})"
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Self:
+        return self
+
+    def __next__(self) -> T:
+        return self._channel.get()
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> T:
+        return await self._channel.aget()
+
+    @property
+    def dropped(self) -> int:
+        """The number of messages discarded because the queue was full."""
+        return self._channel.dropped
+
+    @property
+    def queued(self) -> int:
+        """The number of messages waiting to be consumed."""
+        return self._channel.queued
+
+    def close(self) -> None:
+        """Unsubscribes from the stream and discards the queued messages."""
+        self._channel.close()
+        self._on_close()
+
+
+class StreamHub(BaseExchangeAPI):
+    """Multiplexer of exchange subscriptions.
+
+    All streams are read by a single background thread running an event loop, and
+    each message is fanned out to the queues of the subscribers of the stream.
+    Subscribers of the same stream share a single connection to the exchange, which is
+    closed when the last subscriber unsubscribes. Lost connections are re-established
+    with exponential backoff.
+
+    Authenticates with the exchange on creation. Should be closed with `close()` or
+    used as a context manager.
+
+    Parameters
+    ----------
+    config : afp.config.Config
+    authenticator : afp.Authenticator, optional
+    exchange_url : str, optional
+    queue_size : int
+        The default maximum number of queued messages per subscriber.
+    overflow : afp.enums.OverflowPolicy
+        The default policy for handling messages that do not fit in the queue.
+    """
+
+    _exchange: AsyncExchangeClient
+    _queue_size: int
+    _overflow: OverflowPolicy
+    _loop: asyncio.AbstractEventLoop
+    _thread: threading.Thread
+    _lock: threading.Lock
+    _streams: dict[tuple[Any, ...], "_Stream"]
+    _closed: bool
+
+    def __init__(
+        self,
+        config: Config,
+        authenticator: Authenticator | None = None,
+        exchange_url: str | None = None,
+        *,
+        queue_size: int = STREAM_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        if exchange_url is None:
+            exchange_url = config.exchange_url
+
+        super().__init__(config, authenticator)
+        self._exchange = AsyncExchangeClient(
+            exchange_url,
+            pool_size=config.exchange_pool_size,
+            tcp_keepalive=config.exchange_tcp_keepalive,
+            max_retries=config.exchange_max_retries,
+            rate_limit=config.exchange_rate_limit,
+        )
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._closed = False
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="afp-stream-hub", daemon=True
+        )
+        self._thread.start()
+        try:
+            self._run(self._login())
+        except BaseException:
+            self.close()
+            raise
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(authenticator={repr(self._authenticator)}, "
+            f"exchange={repr(self._exchange)})"
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes all subscriptions, the connections to the exchange and the
+        background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            streams = list(self._streams.values())
+            self._streams.clear()
+
+        for stream in streams:
+            stream.task.cancel()
+            for channel in stream.channels:
+                channel.finish(None)
+
+        self._run(self._exchange.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def market_depth(
+        self,
+        product_id: str,
+        *,
+        queue_size: int | None = None,
+        overflow: OverflowPolicy | None = None,
+    ) -> Subscription[MarketDepthData]:
+        """Subscribes to updates of the depth of market for the given product.
+
+        Parameters
+        ----------
+        product_id : str
+        queue_size : int, optional
+            Defaults to the queue size of the stream hub.
+        overflow : afp.enums.OverflowPolicy, optional
+            Defaults to the overflow policy of the stream hub. `COALESCE` keeps the
+            queued market depth up to date when the consumer falls behind.
+
+        Returns
+        -------
+        afp.api.streams.Subscription of afp.schemas.MarketDepthData
+        """
+        value = validators.validate_hexstr32(product_id)
+        return self._subscribe(
+            ("market-depth", value),
+            lambda: self._exchange.iter_market_depth_data(value),
+            queue_size,
+            overflow,
+        )
+
+    def ohlcv(
+        self,
+        product_id: str,
+        interval: timedelta = timedelta(seconds=5),
+        *,
+        queue_size: int | None = None,
+        overflow: OverflowPolicy | None = None,
+    ) -> Subscription[OHLCVItem]:
+        """Subscribes to Open-High-Low-Close-Volume time series data updates for the
+        given product.
+
+        Parameters
+        ----------
+        product_id : str
+        interval : timedelta
+            The distance between 2 data points. Gets rounded to a multiple of 5 seconds.
+            Defaults to 5 seconds.
+        queue_size : int, optional
+            Defaults to the queue size of the stream hub.
+        overflow : afp.enums.OverflowPolicy, optional
+            Defaults to the overflow policy of the stream hub.
+
+        Returns
+        -------
+        afp.api.streams.Subscription of afp.schemas.OHLCVItem
+        """
+        product_id = validators.validate_hexstr32(product_id)
+        start_timestamp = int(datetime.now().timestamp())
+        interval_secs = int(validators.validate_timedelta(interval).total_seconds())
+        last_timestamp: int | None = None
+
+        async def connect() -> AsyncGenerator[OHLCVItem, None]:
+            nonlocal last_timestamp
+            # Resume from the last data point as it may have been updated since
+            start = start_timestamp if last_timestamp is None else last_timestamp
+            async for ohlcv_item in self._exchange.iter_time_series_data(
+                product_id, start, interval_secs
+            ):
+                timestamp = int(ohlcv_item.timestamp.timestamp())
+                if last_timestamp is None or timestamp >= last_timestamp:
+                    last_timestamp = timestamp
+                    yield ohlcv_item
+
+        return self._subscribe(
+            ("ohlcv", product_id, interval_secs), connect, queue_size, overflow
+        )
+
+    def order_fills(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_hash: str | None = None,
+        trade_states: Iterable[str] = ("PENDING",),
+        queue_size: int | None = None,
+        overflow: OverflowPolicy | None = None,
+    ) -> Subscription[OrderFill]:
+        """Subscribes to the authenticated account's new order fills that match the
+        given parameters.
+
+        See `Trading.iter_order_fills()` for the meaning of `trade_states`.
+
+        When the connection is re-established, the order fills published while
+        disconnected are retrieved from the order fill history and delivered before
+        new updates, and each order fill update is delivered only once. Order fills
+        are never discarded: if the subscriber's queue is full then the subscription
+        fails with an error after the queued order fills have been consumed.
+
+        Parameters
+        ----------
+        product_id : str, optional
+        intent_hash : str, optional
+        trade_states : iterable of str
+            Any of `PENDING`, `CLEARED` and `REJECTED`.
+        queue_size : int, optional
+            Defaults to the queue size of the stream hub.
+        overflow : afp.enums.OverflowPolicy, optional
+            Must be `FAIL` if specified.
+
+        Returns
+        -------
+        afp.api.streams.Subscription of afp.schemas.OrderFill
+
+        Raises
+        ------
+        ValueError
+            If an overflow policy other than `FAIL` is specified.
+        """
+        if overflow not in (None, OverflowPolicy.FAIL):
+            raise ValueError(
+                "Order fill subscriptions must use the FAIL overflow policy"
+            )
+        filter = OrderFillFilter(
+            intent_account_id=self._authenticator.address,
+            product_id=product_id,
+            intent_hash=intent_hash,
+            start=None,
+            end=None,
+            trade_states=[TradeState(state.upper()) for state in trade_states],
+            batch=None,
+            batch_size=None,
+            newest_first=None,
+        )
+        tracker = OrderFillTracker(filter.trade_states)
+        connected = False
+
+        async def connect() -> AsyncGenerator[OrderFill, None]:
+            nonlocal connected
+            since = tracker.cursor if connected else None
+            connected = True
+            async for order_fill in self._iter_order_fills(filter, since):
+                if tracker.add(order_fill):
+                    yield order_fill
+
+        return self._subscribe(
+            (
+                "order-fills",
+                filter.product_id,
+                filter.intent_hash,
+                frozenset(filter.trade_states),
+            ),
+            connect,
+            queue_size,
+            OverflowPolicy.FAIL,
+        )
+
+    async def _iter_order_fills(
+        self, filter: OrderFillFilter, since: datetime | None
+    ) -> AsyncGenerator[OrderFill, None]:
+        stream = self._exchange.iter_order_fills(filter)
+        if since is not None:
+            # Open the stream before querying the history so that there is no gap
+            # between the backfilled order fills and the streamed ones
+            first = asyncio.ensure_future(anext(stream))
+            try:
+                batch = 1
+                while True:
+                    order_fills = await self._exchange.get_order_fills(
+                        self._create_backfill_filter(filter, since, batch)
+                    )
+                    for order_fill in order_fills:
+                        yield order_fill
+                    if len(order_fills) < DEFAULT_BATCH_SIZE:
+                        break
+                    batch += 1
+                try:
+                    yield await first
+                except StopAsyncIteration:
+                    return
+            finally:
+                if not first.cancel() and not first.cancelled():
+                    # Retrieve the error of a failed stream so that it is not logged
+                    first.exception()
+        async for order_fill in stream:
+            yield order_fill
+
+    def _subscribe[T](
+        self,
+        key: tuple[Any, ...],
+        connect: Callable[[], AsyncIterator[T]],
+        queue_size: int | None,
+        overflow: OverflowPolicy | None,
+    ) -> Subscription[T]:
+        channel = _Channel[T](
+            self._queue_size if queue_size is None else queue_size,
+            self._overflow if overflow is None else overflow,
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Stream hub is closed")
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = _Stream()
+                stream.task = asyncio.run_coroutine_threadsafe(
+                    self._pump(key, stream, connect), self._loop
+                )
+                self._streams[key] = stream
+            stream.channels.append(channel)
+        return Subscription(channel, lambda: self._unsubscribe(key, channel))
+
+    def _unsubscribe(self, key: tuple[Any, ...], channel: "_Channel[Any]") -> None:
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None or channel not in stream.channels:
+                return
+            stream.channels.remove(channel)
+            if not stream.channels:
+                del self._streams[key]
+                stream.task.cancel()
+
+    async def _pump[T](
+        self,
+        key: tuple[Any, ...],
+        stream: "_Stream",
+        connect: Callable[[], AsyncIterator[T]],
+    ) -> None:
+        backoff = Backoff()
+        login = False
+        login_count = self._login_count
+        while True:
+            try:
+                if login:
+                    await self._login(login_count)
+                    login = False
+                login_count = self._login_count
+                async for message in connect():
+                    backoff.reset()
+                    with self._lock:
+                        channels = list(stream.channels)
+                    for channel in channels:
+                        channel.put(message)
+            except AuthenticationError as error:
+                if login:
+                    # Logging in has failed so the credentials are not valid
+                    self._terminate(key, stream, error)
+                    return
+                login = True
+            except (AuthorizationError, NotFoundError, ValidationError) as error:
+                self._terminate(key, stream, error)
+                return
+            except (ExchangeError, asyncio.TimeoutError):
+                pass
+            except Exception as error:
+                self._terminate(key, stream, error)
+                return
+            await asyncio.sleep(backoff.next_delay())
+
+    def _terminate(
+        self, key: tuple[Any, ...], stream: "_Stream", error: Exception
+    ) -> None:
+        with self._lock:
+            if self._streams.get(key) is stream:
+                del self._streams[key]
+            channels = list(stream.channels)
+            stream.channels.clear()
+        for channel in channels:
+            channel.finish(error)
+
+    def _run[T](self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _login(self, expired_login: int | None = None):
+        await self._login_async(self._exchange, expired_login)
+
+
+class _Stream:
+    task: Future[None]
+    channels: "list[_Channel[Any]]"
+
+    def __init__(self):
+        self.channels = []
+
+
+class _Channel[T]:
+    """Thread-safe bounded queue that can be awaited from any event loop."""
+
+    dropped: int
+    _queue: deque[T]
+    _size: int
+    _overflow: OverflowPolicy
+    _condition: threading.Condition
+    _waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]]
+    _closed: bool
+    _error: BaseException | None
+
+    def __init__(self, size: int, overflow: OverflowPolicy):
+        if size < 1:
+            raise ValueError("Queue size must be positive")
+        self.dropped = 0
+        self._queue = deque()
+        self._size = size
+        self._overflow = overflow
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._closed = False
+        self._error = None
+
+    @property
+    def queued(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def put(self, message: T) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) >= self._size:
+                self.dropped += 1
+                match self._overflow:
+                    case OverflowPolicy.DROP_NEWEST:
+                        return
+                    case OverflowPolicy.DROP_OLDEST:
+                        self._queue.popleft()
+                    case OverflowPolicy.COALESCE:
+                        self._queue.pop()
+                    case OverflowPolicy.FAIL:
+                        self._closed = True
+                        self._error = RuntimeError("Subscription queue is full")
+                        self._notify()
+                        return
+            self._queue.append(message)
+            self._notify()
+
+    def finish(self, error: BaseException | None) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._error = error
+            self._notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._error = None
+            self._queue.clear()
+            self._notify()
+
+    def get(self) -> T:
+        with self._condition:
+            self._condition.wait_for(lambda: self._queue or self._closed)
+            return self._pop(StopIteration)
+
+    async def aget(self) -> T:
+        while True:
+            with self._condition:
+                if self._queue or self._closed:
+                    return self._pop(StopAsyncIteration)
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    def _pop(self, stop: type[Exception]) -> T:
+        if self._queue:
+            return self._queue.popleft()
+        if self._error is not None:
+            raise self._error
+        raise stop
+
+    def _notify(self) -> None:
+        self._condition.notify_all()
+        for loop, waiter in self._waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+        self._waiters.clear()
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -1,16 +1,50 @@
-import secrets
-from datetime import datetime, timedelta
+import threading
+import time
+from abc import ABC
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
-from typing import Generator, Iterable
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Literal,
+    Sequence,
+    overload,
+)
 
+from hexbytes import HexBytes
 from web3 import Web3
 from web3.constants import CHECKSUM_ADDRESSS_ZERO
 
 from .. import hashing, validators
-from ..constants import DEFAULT_BATCH_SIZE
-from ..decorators import refresh_token_on_expiry
-from ..dtos import ExchangeProductFilter, OrderFilter, OrderFillFilter, OrderSubmission
+from ..auth import Authenticator, PrivateKeyAuthenticator
+from ..backoff import Backoff
+from ..config import Config
+from ..constants import DEFAULT_BATCH_SIZE, MAX_BATCH_SIZE
+from ..decorators import async_refresh_token_on_expiry, refresh_token_on_expiry
+from ..dtos import (
+    ExchangeProductFilter,
+    OrderFilter,
+    OrderFillFilter,
+    OrderSubmission,
+    PaginationFilter,
+)
 from ..enums import OrderSide, OrderState, OrderType, TradeState
+from ..exceptions import (
+    AuthenticationError,
+    AuthorizationError,
+    ExchangeError,
+    NotFoundError,
+    ReplaceOrderError,
+    ValidationError,
+)
 from ..schemas import (
     ExchangeProduct,
     Intent,
@@ -21,15 +55,40 @@ from ..schemas import (
     OrderCancellationData,
     OrderFill,
 )
-from .base import ExchangeAPI
+from ..nonces import NonceAllocator, RandomNonceAllocator
+from ..ordermanager import LIVE_ORDER_STATES
+from ..productcache import ProductCache
+from ..records import LazyRecord
+from .base import AsyncExchangeAPI, BaseExchangeAPI, ExchangeAPI, OrderFillTracker
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+
+@dataclass(frozen=True)
+class IntentSpec:
+    """Parameters of an intent to be created with `Trading.create_intents()`; see
+    `Trading.create_intent()` for their meaning."""
+
+    product: ExchangeProduct
+    side: str
+    limit_price: Decimal
+    quantity: int
+    max_trading_fee_rate: Decimal
+    good_until_time: datetime
+    margin_account_id: str | None = None
+    referral: str | None = None
+    rounding: str | None = None
+
 
+class BaseTrading(BaseExchangeAPI, ABC):
+    """Trading functionality shared by the synchronous and asynchronous APIs."""
 
-class Trading(ExchangeAPI):
-    """API for trading in the AutEx exchange."""
+    _nonce_allocator: NonceAllocator = RandomNonceAllocator()
 
-    @staticmethod
-    def _generate_nonce() -> int:
-        return secrets.randbelow(2**31)  # Postgres integer range
+    def _generate_nonce(self) -> int:
+        return self._nonce_allocator.allocate()
 
     def create_intent(
         self,
@@ -76,36 +135,100 @@ class Trading(ExchangeAPI):
         -------
         afp.schemas.Intent
         """
-        margin_account_id = (
-            validators.validate_address(margin_account_id)
-            if margin_account_id is not None
-            else self._authenticator.address
-        )
-
-        intent_data = IntentData(
-            trading_protocol_id=self._trading_protocol_id,
-            product_id=product.id,
-            limit_price=validators.validate_limit_price(
-                Decimal(limit_price),
-                product.min_price,
-                product.max_price,
-                product.tick_size,
-                rounding,
-            ),
+        spec = IntentSpec(
+            product=product,
+            side=side,
+            limit_price=limit_price,
             quantity=quantity,
             max_trading_fee_rate=max_trading_fee_rate,
-            side=OrderSide(side.upper()),
             good_until_time=good_until_time,
-            nonce=self._generate_nonce(),
-            referral=(referral if referral is not None else CHECKSUM_ADDRESSS_ZERO),
-        )
-        intent_hash = hashing.generate_intent_hash(
-            intent_data=intent_data,
             margin_account_id=margin_account_id,
-            intent_account_id=self._authenticator.address,
-            tick_size=product.tick_size,
+            referral=referral,
+            rounding=rounding,
+        )
+        return self.create_intents([spec])[0]
+
+    def create_intents(self, specs: Iterable[IntentSpec]) -> list[Intent]:
+        """Creates multiple intents, generates their hashes and signs them with the
+        configured account's private key.
+
+        All intents are validated and hashed before any of them is signed, and
+        intents of a `PrivateKeyAuthenticator` are signed in bulk, which makes this
+        considerably faster than calling `create_intent()` repeatedly, e.g. when
+        refreshing a ladder of quotes.
+
+        Parameters
+        ----------
+        specs : iterable of afp.api.trading.IntentSpec
+
+        Returns
+        -------
+        list of afp.schemas.Intent
+            The intents in the order of the specs.
+        """
+        prepared = self._hash_intents(specs)
+        signatures = self._sign_messages(
+            [intent_hash for _, _, intent_hash in prepared]
         )
-        signature = self._authenticator.sign_message(intent_hash)
+        return [
+            self._to_intent(*intent, signature)
+            for intent, signature in zip(prepared, signatures)
+        ]
+
+    def _hash_intents(
+        self, specs: Iterable[IntentSpec]
+    ) -> list[tuple[str, IntentData, HexBytes]]:
+        intent_account_id = self._authenticator.address
+        hashers: dict[tuple[str, str, int], hashing.IntentHasher] = {}
+        prepared: list[tuple[str, IntentData, HexBytes]] = []
+        for spec in specs:
+            margin_account_id = (
+                validators.validate_address(spec.margin_account_id)
+                if spec.margin_account_id is not None
+                else intent_account_id
+            )
+            intent_data = IntentData(
+                trading_protocol_id=self._trading_protocol_id,
+                product_id=spec.product.id,
+                limit_price=validators.validate_limit_price(
+                    Decimal(spec.limit_price),
+                    spec.product.min_price,
+                    spec.product.max_price,
+                    spec.product.tick_size,
+                    spec.rounding,
+                ),
+                quantity=spec.quantity,
+                max_trading_fee_rate=spec.max_trading_fee_rate,
+                side=OrderSide(spec.side.upper()),
+                good_until_time=spec.good_until_time,
+                nonce=self._generate_nonce(),
+                referral=(
+                    spec.referral
+                    if spec.referral is not None
+                    else CHECKSUM_ADDRESSS_ZERO
+                ),
+            )
+            key = (margin_account_id, spec.product.id, spec.product.tick_size)
+            hasher = hashers.get(key)
+            if hasher is None:
+                hasher = hashers[key] = hashing.IntentHasher(
+                    margin_account_id=margin_account_id,
+                    intent_account_id=intent_account_id,
+                    trading_protocol_id=self._trading_protocol_id,
+                    product_id=spec.product.id,
+                    tick_size=spec.product.tick_size,
+                )
+            intent_hash = hasher.hash(intent_data)
+            prepared.append((margin_account_id, intent_data, intent_hash))
+        return prepared
+
+    def _to_intent(
+        self,
+        margin_account_id: str,
+        intent_data: IntentData,
+        intent_hash: HexBytes,
+        signature: HexBytes,
+    ) -> Intent:
         return Intent(
             hash=Web3.to_hex(intent_hash),
             margin_account_id=margin_account_id,
@@ -114,6 +237,179 @@ class Trading(ExchangeAPI):
             data=intent_data,
         )
 
+    def _sign_messages(self, messages: Sequence[bytes]) -> list[HexBytes]:
+        if isinstance(self._authenticator, PrivateKeyAuthenticator):
+            return self._authenticator.sign_messages(messages)
+        return [self._authenticator.sign_message(message) for message in messages]
+
+    def _create_cancellation_submission(self, intent_hash: str) -> OrderSubmission:
+        return self._create_cancellation_submissions([intent_hash])[0]
+
+    def _create_cancellation_submissions(
+        self, intent_hashes: Iterable[str]
+    ) -> list[OrderSubmission]:
+        cancellations = [
+            (intent_hash, self._generate_nonce()) for intent_hash in intent_hashes
+        ]
+        signatures = self._sign_messages(
+            [
+                hashing.generate_order_cancellation_hash(nonce, intent_hash)
+                for intent_hash, nonce in cancellations
+            ]
+        )
+        return [
+            OrderSubmission(
+                type=OrderType.CANCEL_ORDER,
+                cancellation_data=OrderCancellationData(
+                    intent_hash=intent_hash,
+                    nonce=nonce,
+                    intent_account_id=self._authenticator.address,
+                    signature=Web3.to_hex(signature),
+                ),
+            )
+            for (intent_hash, nonce), signature in zip(cancellations, signatures)
+        ]
+
+    def _create_replacement_submissions(
+        self,
+        old_intent_hash: str,
+        spec: IntentSpec,
+        cancellation: OrderSubmission | None = None,
+    ) -> tuple[OrderSubmission, OrderSubmission]:
+        # Sign the cancellation, unless presigned, and the new intent in one batch
+        ((margin_account_id, intent_data, intent_hash),) = self._hash_intents([spec])
+        if cancellation is not None:
+            (signature,) = self._sign_messages([intent_hash])
+        else:
+            nonce = self._generate_nonce()
+            signature, cancellation_signature = self._sign_messages(
+                [
+                    intent_hash,
+                    hashing.generate_order_cancellation_hash(nonce, old_intent_hash),
+                ]
+            )
+            cancellation = OrderSubmission(
+                type=OrderType.CANCEL_ORDER,
+                cancellation_data=OrderCancellationData(
+                    intent_hash=old_intent_hash,
+                    nonce=nonce,
+                    intent_account_id=self._authenticator.address,
+                    signature=Web3.to_hex(cancellation_signature),
+                ),
+            )
+        intent = self._to_intent(margin_account_id, intent_data, intent_hash, signature)
+        return (
+            cancellation,
+            OrderSubmission(type=OrderType.LIMIT_ORDER, intent=intent),
+        )
+
+    def _create_order_filter(
+        self,
+        *,
+        product_id: str | None,
+        intent_account_id: str | None,
+        type_: str | None,
+        states: Iterable[str],
+        side: str | None,
+        start: datetime | None,
+        end: datetime | None,
+        batch: int,
+        batch_size: int,
+        newest_first: bool,
+    ) -> OrderFilter:
+        if intent_account_id is None:
+            intent_account_id = self._authenticator.address
+
+        return OrderFilter(
+            intent_account_id=intent_account_id,
+            product_id=product_id,
+            type=None if type_ is None else OrderType(type_.upper()),
+            states=[OrderState(state.upper()) for state in states],
+            side=None if side is None else OrderSide(side.upper()),
+            start=start,
+            end=end,
+            batch=batch,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+
+    def _create_order_fill_filter(
+        self,
+        *,
+        product_id: str | None,
+        intent_account_id: str | None,
+        intent_hash: str | None,
+        trade_states: Iterable[str],
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch: int | None = None,
+        batch_size: int | None = None,
+        newest_first: bool | None = None,
+    ) -> OrderFillFilter:
+        if intent_account_id is None:
+            intent_account_id = self._authenticator.address
+
+        return OrderFillFilter(
+            intent_account_id=intent_account_id,
+            product_id=product_id,
+            intent_hash=intent_hash,
+            start=start,
+            end=end,
+            trade_states=[TradeState(state.upper()) for state in trade_states],
+            batch=batch,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+
+
+class Trading(BaseTrading, ExchangeAPI):
+    """API for trading in the AutEx exchange.
+
+    Authenticates with the exchange on creation.
+
+    Parameters
+    ----------
+    config : afp.config.Config
+    authenticator : afp.Authenticator, optional
+    exchange_url : str, optional
+    presign_cancellations : bool
+        Whether to sign a cancellation for each limit order as soon as it has been
+        accepted by the exchange, so that cancelling it, e.g. with `kill_switch()`,
+        does not involve any cryptographic operations. Presigned cancellations are
+        discarded when the order is seen in a final state, is cancelled or expires.
+    cache_products : bool
+        Whether to serve `product()` from an `afp.productcache.ProductCache` that
+        loads all approved products in bulk and refreshes them in the background.
+    nonce_allocator : afp.nonces.NonceAllocator, optional
+        The strategy for allocating the nonces of intents and cancellations. Defaults
+        to random nonces; processes that share an intent account should allocate
+        nonces from disjoint ranges instead.
+    """
+
+    _presigned: "_PresignedCancellations | None"
+    _product_cache: ProductCache | None
+
+    def __init__(
+        self,
+        config: Config,
+        authenticator: Authenticator | None = None,
+        exchange_url: str | None = None,
+        *,
+        presign_cancellations: bool = False,
+        cache_products: bool = False,
+        nonce_allocator: NonceAllocator | None = None,
+    ):
+        super().__init__(config, authenticator, exchange_url)
+        if nonce_allocator is not None:
+            self._nonce_allocator = nonce_allocator
+        self._presigned = _PresignedCancellations() if presign_cancellations else None
+        self._product_cache = ProductCache(self) if cache_products else None
+
+    @property
+    def product_cache(self) -> ProductCache | None:
+        """The product cache if `cache_products` is enabled."""
+        return self._product_cache
+
     @refresh_token_on_expiry
     def submit_limit_order(self, intent: Intent) -> Order:
         """Sends an intent expressing a limit order to the exchange.
@@ -136,7 +432,9 @@ class Trading(ExchangeAPI):
             type=OrderType.LIMIT_ORDER,
             intent=intent,
         )
-        return self._exchange.submit_order(submission)
+        order = self._exchange.submit_order(submission)
+        self._presign_cancellations([order])
+        return order
 
     @refresh_token_on_expiry
     def submit_cancel_order(self, intent_hash: str) -> Order:
@@ -160,20 +458,200 @@ class Trading(ExchangeAPI):
         afp.exceptions.ValidationError
             If the exchange rejects the cancellation because it is invalid.
         """
-        nonce = self._generate_nonce()
-        cancellation_hash = hashing.generate_order_cancellation_hash(nonce, intent_hash)
-        signature = self._authenticator.sign_message(cancellation_hash)
-        cancellation_data = OrderCancellationData(
-            intent_hash=intent_hash,
-            nonce=nonce,
-            intent_account_id=self._authenticator.address,
-            signature=Web3.to_hex(signature),
+        (submission,) = self._get_cancellation_submissions([intent_hash])
+        order = self._exchange.submit_order(submission)
+        self._evict_presigned_cancellations([intent_hash], [order])
+        return order
+
+    def submit_limit_orders(
+        self, intents: Iterable[Intent]
+    ) -> list[Order | ExchangeError]:
+        """Sends multiple intents expressing limit orders to the exchange concurrently.
+
+        The orders are submitted in parallel over the pooled connections to the
+        exchange; see the `exchange_pool_size` parameter of `afp.AFP`. The failure of
+        one submission does not affect the others, the returned list contains either
+        the created order or the exception raised by the exchange for each intent, in
+        the same order as the intents.
+
+        Parameters
+        ----------
+        intents : iterable of afp.schemas.Intent
+
+        Returns
+        -------
+        list of afp.schemas.Order or afp.exceptions.ExchangeError
+        """
+        submissions = [
+            OrderSubmission(type=OrderType.LIMIT_ORDER, intent=intent)
+            for intent in intents
+        ]
+        results = self._submit_orders(submissions)
+        self._presign_cancellations(
+            [result for result in results if isinstance(result, Order)]
         )
-        submission = OrderSubmission(
-            type=OrderType.CANCEL_ORDER,
-            cancellation_data=cancellation_data,
+        return results
+
+    def submit_cancel_orders(
+        self, intent_hashes: Iterable[str]
+    ) -> list[Order | ExchangeError]:
+        """Sends multiple cancellation orders to the exchange concurrently.
+
+        The cancellations are submitted in parallel over the pooled connections to the
+        exchange; see the `exchange_pool_size` parameter of `afp.AFP`. The failure of
+        one submission does not affect the others, the returned list contains either
+        the cancellation order or the exception raised by the exchange for each intent
+        hash, in the same order as the intent hashes.
+
+        Parameters
+        ----------
+        intent_hashes : iterable of str
+
+        Returns
+        -------
+        list of afp.schemas.Order or afp.exceptions.ExchangeError
+        """
+        intent_hashes = list(intent_hashes)
+        submissions = self._get_cancellation_submissions(intent_hashes)
+        results = self._submit_orders(submissions)
+        self._evict_presigned_cancellations(intent_hashes, results)
+        return results
+
+    def replace_order(
+        self,
+        old_intent_hash: str,
+        *,
+        product: ExchangeProduct,
+        side: str,
+        limit_price: Decimal,
+        quantity: int,
+        max_trading_fee_rate: Decimal,
+        good_until_time: datetime,
+        margin_account_id: str | None = None,
+        referral: str | None = None,
+        rounding: str | None = None,
+    ) -> tuple[Order, Order]:
+        """Cancels an order and submits a new limit order in its place, e.g. to
+        re-price a quote.
+
+        The cancellation and the new intent are signed together and submitted
+        concurrently, so replacing an order takes about as long as a single
+        submission. The exchange processes the two submissions independently, there
+        is no guarantee that the old order is cancelled before the new one is placed.
+
+        Parameters
+        ----------
+        old_intent_hash : str
+            The intent hash of the order to be cancelled.
+        product : afp.schemas.ExchangeProduct
+        side : str
+        limit_price : decimal.Decimal
+        quantity : decimal.Decimal
+        max_trading_fee_rate : decimal.Decimal
+        good_until_time : datetime.datetime
+        margin_account_id : str, optional
+        referral : str, optional
+        rounding : str, optional
+            See `create_intent()` for the parameters of the new intent.
+
+        Returns
+        -------
+        afp.schemas.Order
+            The cancellation order.
+        afp.schemas.Order
+            The new limit order.
+
+        Raises
+        ------
+        afp.exceptions.ReplaceOrderError
+            If either submission is rejected by the exchange. The exception's
+            `cancellation` and `order` attributes contain the result of each.
+        """
+        spec = IntentSpec(
+            product=product,
+            side=side,
+            limit_price=limit_price,
+            quantity=quantity,
+            max_trading_fee_rate=max_trading_fee_rate,
+            good_until_time=good_until_time,
+            margin_account_id=margin_account_id,
+            referral=referral,
+            rounding=rounding,
         )
-        return self._exchange.submit_order(submission)
+        presigned = (
+            None if self._presigned is None else self._presigned.get(old_intent_hash)
+        )
+        cancellation, order = self._submit_orders(
+            list(self._create_replacement_submissions(old_intent_hash, spec, presigned))
+        )
+        self._evict_presigned_cancellations([old_intent_hash], [cancellation])
+        if isinstance(order, Order):
+            self._presign_cancellations([order])
+        return _check_replacement(cancellation, order)
+
+    def kill_switch(
+        self, product_id: str | None = None
+    ) -> dict[str, Order | ExchangeError]:
+        """Submits all presigned cancellations concurrently, optionally only those of
+        the orders of a product.
+
+        Only orders submitted through this instance since it was created with
+        `presign_cancellations` enabled are cancelled; see `cancel_all()` for
+        cancelling all open orders on the exchange.
+
+        Parameters
+        ----------
+        product_id : str, optional
+
+        Returns
+        -------
+        dict of str to afp.schemas.Order or afp.exceptions.ExchangeError
+            The cancellation order or the exception raised by the exchange by the
+            intent hash of each cancelled order.
+
+        Raises
+        ------
+        RuntimeError
+            If presigning cancellations is not enabled.
+        """
+        if self._presigned is None:
+            raise RuntimeError("Presigning cancellations is not enabled")
+        intent_hashes, submissions = self._presigned.get_all(product_id)
+        results = self._submit_orders(submissions)
+        self._evict_presigned_cancellations(intent_hashes, results)
+        return dict(zip(intent_hashes, results))
+
+    def cancel_all(
+        self, product_id: str | None = None, side: str | None = None
+    ) -> dict[str, Order | ExchangeError]:
+        """Cancels all open orders of the authenticated account, optionally only those
+        of a product or side.
+
+        The open orders are retrieved with automatic pagination, the cancellations are
+        signed in bulk and submitted concurrently as in `submit_cancel_orders()`.
+
+        Parameters
+        ----------
+        product_id : str, optional
+        side : str, optional
+            One of `BID` and `ASK`.
+
+        Returns
+        -------
+        dict of str to afp.schemas.Order or afp.exceptions.ExchangeError
+            The cancellation order or the exception raised by the exchange by the
+            intent hash of each open order.
+        """
+        intent_hashes = [
+            order.intent.hash
+            for order in self.iter_all_orders(
+                product_id=product_id,
+                type_=OrderType.LIMIT_ORDER,
+                states=LIVE_ORDER_STATES,
+                side=side,
+            )
+        ]
+        return dict(zip(intent_hashes, self.submit_cancel_orders(intent_hashes)))
 
     def products(
         self,
@@ -204,9 +682,52 @@ class Trading(ExchangeAPI):
         )
         return self._exchange.get_approved_products(filter)
 
+    def iter_all_products(
+        self,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        newest_first: bool = False,
+    ) -> Generator[ExchangeProduct, None, None]:
+        """Iterates over all products approved for trading on the exchange.
+
+        Batches are requested automatically; the next batch is fetched in the
+        background while the current one is being consumed, and the batch size grows
+        from `batch_size` up to `max_batch_size` as long as batches are full.
+
+        Parameters
+        ----------
+        batch_size : int, optional
+            The number of products in the first batch.
+        max_batch_size : int, optional
+            The maximum number of products in one batch. Must not exceed the page
+            size limit of the exchange.
+        newest_first : bool, optional
+            Whether to sort products in descending or ascending order by creation time.
+            Ascending order is not affected by products that are approved during the
+            iteration.
+
+        Yields
+        ------
+        afp.schemas.ExchangeProduct
+        """
+        filter = ExchangeProductFilter(
+            batch=1, batch_size=batch_size, newest_first=newest_first
+        )
+        yield from _paginate(
+            lambda batch, size: self._fetch_batch(
+                self._exchange.get_approved_products, filter, batch, size
+            ),
+            batch_size,
+            max_batch_size,
+        )
+
     def product(self, product_id: str) -> ExchangeProduct:
         """Retrieves a product for trading by its ID.
 
+        If `cache_products` is enabled then the product is served from the product
+        cache, which only contacts the exchange if the product is not yet known.
+
         Parameters
         ----------
         product_id : str
@@ -221,6 +742,8 @@ class Trading(ExchangeAPI):
             If no such product exists.
         """
         value = validators.validate_hexstr32(product_id)
+        if self._product_cache is not None:
+            return self._product_cache.product(value)
         return self._exchange.get_product_by_id(value)
 
     @refresh_token_on_expiry
@@ -242,7 +765,9 @@ class Trading(ExchangeAPI):
             If no such order exists.
         """
         value = validators.validate_hexstr32(order_id)
-        return self._exchange.get_order_by_id(value)
+        order = self._exchange.get_order_by_id(value)
+        self._discard_presigned_cancellations([order])
+        return order
 
     @refresh_token_on_expiry
     def orders(
@@ -288,22 +813,97 @@ class Trading(ExchangeAPI):
         -------
         list of afp.schemas.OrderFill
         """
-        if intent_account_id is None:
-            intent_account_id = self._authenticator.address
-
-        filter = OrderFilter(
-            intent_account_id=intent_account_id,
+        filter = self._create_order_filter(
             product_id=product_id,
-            type=None if type_ is None else OrderType(type_.upper()),
-            states=[OrderState(state.upper()) for state in states],
-            side=None if side is None else OrderSide(side.upper()),
+            intent_account_id=intent_account_id,
+            type_=type_,
+            states=states,
+            side=side,
             start=start,
             end=end,
             batch=batch,
             batch_size=batch_size,
             newest_first=newest_first,
         )
-        return self._exchange.get_orders(filter)
+        orders = self._exchange.get_orders(filter)
+        self._discard_presigned_cancellations(orders)
+        return orders
+
+    def iter_all_orders(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        type_: str | None = None,
+        states: Iterable[str] = (),
+        side: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        newest_first: bool = False,
+    ) -> Generator[Order, None, None]:
+        """Iterates over all of the authenticated account's orders that match the
+        given parameters.
+
+        Batches are requested automatically; the next batch is fetched in the
+        background while the current one is being consumed, and the batch size grows
+        from `batch_size` up to `max_batch_size` as long as batches are full. The
+        iteration stops without requesting further batches at the first order that is
+        beyond the `start`/`end` bounds in the direction of sorting.
+
+        Parameters
+        ----------
+        product_id : str, optional
+        intent_account_id : str, optional
+            Defaults to the address of the authenticated account.
+        type_ : str, optional
+            One of `LIMIT_ORDER` and `CANCEL_ORDER`.
+        states : iterable of str
+            Any of `RECEIVED`, `PENDING`, `OPEN`, `COMPLETED` and `REJECTED`.
+        side : str, optional
+            One of `BID` and `ASK`.
+        start : datetime.datetime, optional
+        end : datetime.datetime, optional
+        batch_size : int, optional
+            The number of orders in the first batch.
+        max_batch_size : int, optional
+            The maximum number of orders in one batch. Must not exceed the page size
+            limit of the exchange.
+        newest_first : bool, optional
+            Whether to sort orders in descending or ascending order by creation time.
+            Ascending order is not affected by orders that are submitted during the
+            iteration.
+
+        Yields
+        ------
+        afp.schemas.Order
+        """
+        filter = self._create_order_filter(
+            product_id=product_id,
+            intent_account_id=intent_account_id,
+            type_=type_,
+            states=states,
+            side=side,
+            start=start,
+            end=end,
+            batch=1,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+        orders = _paginate(
+            lambda batch, size: self._fetch_batch(
+                self._exchange.get_orders, filter, batch, size
+            ),
+            batch_size,
+            max_batch_size,
+        )
+        with closing(orders):
+            for order in orders:
+                if _is_beyond_bounds(order.timestamp, filter):
+                    return
+                self._discard_presigned_cancellations([order])
+                yield order
 
     @refresh_token_on_expiry
     def order_fills(
@@ -346,43 +946,40 @@ class Trading(ExchangeAPI):
         -------
         list of afp.schemas.OrderFill
         """
-        if intent_account_id is None:
-            intent_account_id = self._authenticator.address
-
-        filter = OrderFillFilter(
-            intent_account_id=intent_account_id,
+        filter = self._create_order_fill_filter(
             product_id=product_id,
+            intent_account_id=intent_account_id,
             intent_hash=intent_hash,
             start=start,
             end=end,
-            trade_states=[TradeState(state.upper()) for state in trade_states],
+            trade_states=trade_states,
             batch=batch,
             batch_size=batch_size,
             newest_first=newest_first,
         )
         return self._exchange.get_order_fills(filter)
 
-    @refresh_token_on_expiry
-    def iter_order_fills(
+    def iter_all_order_fills(
         self,
         *,
         product_id: str | None = None,
         intent_account_id: str | None = None,
         intent_hash: str | None = None,
-        trade_states: Iterable[str] = ("PENDING",),
+        start: datetime | None = None,
+        end: datetime | None = None,
+        trade_states: Iterable[str] = (),
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        newest_first: bool = False,
     ) -> Generator[OrderFill, None, None]:
-        """Subscribes to the authenticated account's new order fills that match the
+        """Iterates over all of the authenticated account's order fills that match the
         given parameters.
 
-        Returns a generator that yields order fills as they are published by the
-        exchange.
-
-        If `trade_states` includes `PENDING` (the default value) then a new order fill
-        is yielded as soon as there is a match in the order book, before the trade is
-        submitted to clearing.
-
-        If `trade_states` is empty or more than one trade state is specified then
-        updates to order fills are yielded at every state transition.
+        Batches are requested automatically; the next batch is fetched in the
+        background while the current one is being consumed, and the batch size grows
+        from `batch_size` up to `max_batch_size` as long as batches are full. The
+        iteration stops without requesting further batches at the first order fill
+        whose trade is beyond the `start`/`end` bounds in the direction of sorting.
 
         Parameters
         ----------
@@ -390,28 +987,198 @@ class Trading(ExchangeAPI):
         intent_account_id : str, optional
             Defaults to the address of the authenticated account.
         intent_hash : str, optional
-        trade_states: iterable of str
+        start : datetime.datetime, optional
+        end : datetime.datetime, optional
+        trade_states : iterable of str
             Any of `PENDING`, `CLEARED` and `REJECTED`.
+        batch_size : int, optional
+            The number of order fills in the first batch.
+        max_batch_size : int, optional
+            The maximum number of order fills in one batch. Must not exceed the page
+            size limit of the exchange.
+        newest_first : bool, optional
+            Whether to sort order fills in descending or ascending order by creation time.
+            Ascending order is not affected by trades that occur during the iteration.
 
         Yields
-        -------
+        ------
         afp.schemas.OrderFill
         """
-        if intent_account_id is None:
-            intent_account_id = self._authenticator.address
+        filter = self._create_order_fill_filter(
+            product_id=product_id,
+            intent_account_id=intent_account_id,
+            intent_hash=intent_hash,
+            start=start,
+            end=end,
+            trade_states=trade_states,
+            batch=1,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+        order_fills = _paginate(
+            lambda batch, size: self._fetch_batch(
+                self._exchange.get_order_fills, filter, batch, size
+            ),
+            batch_size,
+            max_batch_size,
+        )
+        with closing(order_fills):
+            for order_fill in order_fills:
+                if _is_beyond_bounds(order_fill.trade.timestamp, filter):
+                    return
+                yield order_fill
 
-        filter = OrderFillFilter(
+    @refresh_token_on_expiry
+    def order_fills_table(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        intent_hash: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        trade_states: Iterable[str] = (),
+        batch: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        newest_first: bool = True,
+    ) -> "dict[str, npt.NDArray[Any]]":
+        """Retrieves the authenticated account's order fills that match the given
+        parameters as NumPy arrays.
+
+        The columns are decoded directly from the response of the exchange, without
+        creating `afp.schemas.OrderFill` objects. Prices are fixed-point integers
+        scaled by the tick size of the product, i.e. in number of ticks.
+
+        Requires the `numpy` extra, e.g. `pip install afp-sdk[numpy]`.
+
+        Parameters
+        ----------
+        See `Trading.order_fills()`.
+
+        Returns
+        -------
+        dict of str to numpy.ndarray
+            The `timestamp`, `product_id`, `trade_id`, `trade_state`, `order_id`,
+            `intent_hash`, `side`, `quantity`, `price` and `trading_fee_rate` columns.
+        """
+        from .. import columnar
+
+        filter = self._create_order_fill_filter(
+            product_id=product_id,
             intent_account_id=intent_account_id,
+            intent_hash=intent_hash,
+            start=start,
+            end=end,
+            trade_states=trade_states,
+            batch=batch,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+        order_fills = self._exchange.get_raw_order_fills(filter)
+        product_ids = {order_fill["trade"]["productId"] for order_fill in order_fills}
+        tick_sizes = {
+            product_id: self._exchange.get_product_by_id(product_id).tick_size
+            for product_id in product_ids
+        }
+        return columnar.order_fills_to_table(order_fills, tick_sizes)
+
+    @overload
+    def iter_order_fills(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        intent_hash: str | None = None,
+        trade_states: Iterable[str] = ("PENDING",),
+        reconnect: bool = False,
+        trusted: Literal[False] = False,
+    ) -> Generator[OrderFill, None, None]: ...
+
+    @overload
+    def iter_order_fills(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        intent_hash: str | None = None,
+        trade_states: Iterable[str] = ("PENDING",),
+        reconnect: bool = False,
+        trusted: Literal[True],
+    ) -> Generator[LazyRecord[OrderFill], None, None]: ...
+
+    @refresh_token_on_expiry
+    def iter_order_fills(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        intent_hash: str | None = None,
+        trade_states: Iterable[str] = ("PENDING",),
+        reconnect: bool = False,
+        trusted: bool = False,
+    ) -> Generator[OrderFill | LazyRecord[OrderFill], None, None]:
+        """Subscribes to the authenticated account's new order fills that match the
+        given parameters.
+
+        Returns a generator that yields order fills as they are published by the
+        exchange.
+
+        If `trade_states` includes `PENDING` (the default value) then a new order fill
+        is yielded as soon as there is a match in the order book, before the trade is
+        submitted to clearing.
+
+        If `trade_states` is empty or more than one trade state is specified then
+        updates to order fills are yielded at every state transition.
+
+        If `reconnect` is set then the subscription is re-established with exponential
+        backoff whenever the connection is lost or the session expires. Order fills
+        published while disconnected are retrieved from the order fill history and
+        yielded before new updates, and each order fill update is yielded only once.
+
+        Parameters
+        ----------
+        product_id : str, optional
+        intent_account_id : str, optional
+            Defaults to the address of the authenticated account.
+        intent_hash : str, optional
+        trade_states: iterable of str
+            Any of `PENDING`, `CLEARED` and `REJECTED`.
+        reconnect : bool
+            Whether to resume the subscription automatically after connection errors.
+        trusted : bool
+            Whether to skip validation and yield lazily validated records instead of
+            models, see `afp.records.LazyRecord`.
+
+        Yields
+        -------
+        afp.schemas.OrderFill or afp.records.LazyRecord
+        """
+        filter = self._create_order_fill_filter(
             product_id=product_id,
+            intent_account_id=intent_account_id,
             intent_hash=intent_hash,
-            start=None,
-            end=None,
-            trade_states=[TradeState(state.upper()) for state in trade_states],
-            batch=None,
-            batch_size=None,
-            newest_first=None,
+            trade_states=trade_states,
         )
-        yield from self._exchange.iter_order_fills(filter)
+        if not reconnect:
+            for order_fill in self._exchange.iter_order_fills(filter, trusted):
+                self._discard_presigned_cancellations([order_fill.order])
+                yield order_fill
+            return
+
+        tracker = OrderFillTracker(filter.trade_states)
+
+        def connect(resume: bool) -> Iterator[OrderFill | LazyRecord[OrderFill]]:
+            # Subscribe before querying the history so that there is no gap between
+            # the backfilled order fills and the streamed ones
+            stream = self._exchange.iter_order_fills(filter, trusted)
+            if resume:
+                yield from self._iter_missed_order_fills(filter, tracker.cursor)
+            yield from stream
+
+        for order_fill in self._iter_with_reconnect(connect):
+            if tracker.add(order_fill):
+                self._discard_presigned_cancellations([order_fill.order])
+                yield order_fill
 
     def market_depth(self, product_id: str) -> MarketDepthData:
         """Retrieves the depth of market for the given product.
@@ -432,21 +1199,42 @@ class Trading(ExchangeAPI):
         value = validators.validate_hexstr32(product_id)
         return self._exchange.get_market_depth_data(value)
 
+    @overload
     def iter_market_depth(
-        self, product_id: str
-    ) -> Generator[MarketDepthData, None, None]:
+        self,
+        product_id: str,
+        reconnect: bool = False,
+        trusted: Literal[False] = False,
+    ) -> Generator[MarketDepthData, None, None]: ...
+
+    @overload
+    def iter_market_depth(
+        self, product_id: str, reconnect: bool = False, *, trusted: Literal[True]
+    ) -> Generator[LazyRecord[MarketDepthData], None, None]: ...
+
+    def iter_market_depth(
+        self, product_id: str, reconnect: bool = False, trusted: bool = False
+    ) -> Generator[MarketDepthData | LazyRecord[MarketDepthData], None, None]:
         """Subscribes to updates of the depth of market for the given product.
 
         Returns a generator that yields the updated market depth data as it is published
         by the exhange.
 
+        If `reconnect` is set then the subscription is re-established with exponential
+        backoff whenever the connection is lost.
+
         Parameters
         ----------
         product_id : str
+        reconnect : bool
+            Whether to resume the subscription automatically after connection errors.
+        trusted : bool
+            Whether to skip validation and yield lazily validated records instead of
+            models, see `afp.records.LazyRecord`.
 
         Yields
         -------
-        afp.schemas.MarketDepthData
+        afp.schemas.MarketDepthData or afp.records.LazyRecord
 
         Raises
         ------
@@ -454,7 +1242,14 @@ class Trading(ExchangeAPI):
             If no such product exists.
         """
         value = validators.validate_hexstr32(product_id)
-        yield from self._exchange.iter_market_depth_data(value)
+        if not reconnect:
+            yield from self._exchange.iter_market_depth_data(value, trusted)
+            return
+
+        # Each update is a full snapshot so there is nothing to recover after reconnecting
+        yield from self._iter_with_reconnect(
+            lambda _: self._exchange.iter_market_depth_data(value, trusted)
+        )
 
     def ohlcv(
         self,
@@ -492,25 +1287,100 @@ class Trading(ExchangeAPI):
             product_id, start_timestamp, interval_secs
         )
 
+    def ohlcv_array(
+        self,
+        product_id: str,
+        start: datetime | None = None,
+        interval: timedelta = timedelta(minutes=5),
+    ) -> "npt.NDArray[np.void]":
+        """Retrieves Open-High-Low-Close-Volume time series data for the given product
+        as a NumPy structured array.
+
+        The array is decoded directly from the response of the exchange, without
+        creating `afp.schemas.OHLCVItem` objects. Timestamps are UNIX timestamps and
+        prices are fixed-point integers scaled by the tick size of the product, i.e.
+        in number of ticks.
+
+        Requires the `numpy` extra, e.g. `pip install afp-sdk[numpy]`.
+
+        Parameters
+        ----------
+        See `Trading.ohlcv()`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of `afp.columnar.OHLCV_DTYPE` with `timestamp`, `open`, `high`,
+            `low`, `close` and `volume` fields.
+
+        Raises
+        ------
+        afp.exceptions.NotFoundError
+            If no such product exists.
+        """
+        from .. import columnar
+
+        if start is None:
+            start = datetime.now() - timedelta(days=1)
+
+        product = self.product(product_id)
+        start_timestamp = int(start.timestamp())
+        interval_secs = int(validators.validate_timedelta(interval).total_seconds())
+        items = self._exchange.get_raw_time_series_data(
+            product.id, start_timestamp, interval_secs
+        )
+        return columnar.ohlcv_to_array(items, product.tick_size)
+
+    @overload
     def iter_ohlcv(
-        self, product_id: str, interval: timedelta = timedelta(seconds=5)
-    ) -> Generator[OHLCVItem, None, None]:
+        self,
+        product_id: str,
+        interval: timedelta = timedelta(seconds=5),
+        reconnect: bool = False,
+        trusted: Literal[False] = False,
+    ) -> Generator[OHLCVItem, None, None]: ...
+
+    @overload
+    def iter_ohlcv(
+        self,
+        product_id: str,
+        interval: timedelta = timedelta(seconds=5),
+        reconnect: bool = False,
+        *,
+        trusted: Literal[True],
+    ) -> Generator[LazyRecord[OHLCVItem], None, None]: ...
+
+    def iter_ohlcv(
+        self,
+        product_id: str,
+        interval: timedelta = timedelta(seconds=5),
+        reconnect: bool = False,
+        trusted: bool = False,
+    ) -> Generator[OHLCVItem | LazyRecord[OHLCVItem], None, None]:
         """Subscribes to Open-High-Low-Close-Volume time series data updates for the
         given product.
 
         Returns a generator that yields OHLCV data points as they are published
         by the exhange.
 
+        If `reconnect` is set then the subscription is re-established with exponential
+        backoff whenever the connection is lost, resuming from the last data point.
+
         Parameters
         ----------
         product_id : str
         interval : timedelta
             The distance between 2 data points. Gets rounded to a multiple of 5 seconds.
             Defaults to 5 seconds.
+        reconnect : bool
+            Whether to resume the subscription automatically after connection errors.
+        trusted : bool
+            Whether to skip validation and yield lazily validated records instead of
+            models, see `afp.records.LazyRecord`.
 
         Yields
         -------
-        afp.schemas.OHLCVItem
+        afp.schemas.OHLCVItem or afp.records.LazyRecord
 
         Raises
         ------
@@ -520,6 +1390,549 @@ class Trading(ExchangeAPI):
         product_id = validators.validate_hexstr32(product_id)
         start_timestamp = int(datetime.now().timestamp())
         interval_secs = int(validators.validate_timedelta(interval).total_seconds())
-        yield from self._exchange.iter_time_series_data(
+        if not reconnect:
+            yield from self._exchange.iter_time_series_data(
+                product_id, start_timestamp, interval_secs, trusted
+            )
+            return
+
+        last_timestamp: int | None = None
+
+        def connect(resume: bool) -> Iterator[OHLCVItem | LazyRecord[OHLCVItem]]:
+            # Resume from the last data point as it may have been updated since
+            start = start_timestamp if last_timestamp is None else last_timestamp
+            return self._exchange.iter_time_series_data(
+                product_id, start, interval_secs, trusted
+            )
+
+        for ohlcv_item in self._iter_with_reconnect(connect):
+            timestamp = int(ohlcv_item.timestamp.timestamp())
+            if last_timestamp is None or timestamp >= last_timestamp:
+                last_timestamp = timestamp
+                yield ohlcv_item
+
+    def _iter_with_reconnect[T](
+        self, connect: Callable[[bool], Iterable[T]]
+    ) -> Generator[T, None, None]:
+        backoff = Backoff()
+        resume = False
+        login = False
+        while True:
+            try:
+                if login:
+                    self._login()
+                    login = False
+                for item in connect(resume):
+                    backoff.reset()
+                    yield item
+            except AuthenticationError:
+                if login:
+                    # Logging in has failed so the credentials are not valid
+                    raise
+                login = True
+            except (AuthorizationError, NotFoundError, ValidationError):
+                raise
+            except ExchangeError:
+                pass
+            resume = True
+            time.sleep(backoff.next_delay())
+
+    def _get_cancellation_submissions(
+        self, intent_hashes: list[str]
+    ) -> list[OrderSubmission]:
+        # Use presigned cancellations where available and sign the rest in bulk
+        if self._presigned is None:
+            return self._create_cancellation_submissions(intent_hashes)
+        presigned = [self._presigned.get(intent_hash) for intent_hash in intent_hashes]
+        unsigned = [
+            intent_hash
+            for intent_hash, submission in zip(intent_hashes, presigned)
+            if submission is None
+        ]
+        missing = iter(
+            self._create_cancellation_submissions(unsigned) if unsigned else []
+        )
+        return [
+            submission if submission is not None else next(missing)
+            for submission in presigned
+        ]
+
+    def _presign_cancellations(self, orders: list[Order]) -> None:
+        if self._presigned is None:
+            return
+        orders = [
+            order
+            for order in orders
+            if order.type == OrderType.LIMIT_ORDER and order.state in LIVE_ORDER_STATES
+        ]
+        if orders:
+            submissions = self._create_cancellation_submissions(
+                order.intent.hash for order in orders
+            )
+            self._presigned.add(orders, submissions)
+
+    def _evict_presigned_cancellations(
+        self, intent_hashes: list[str], results: list[Order | ExchangeError]
+    ) -> None:
+        # Presigned cancellations are kept for retries until the exchange accepts them
+        if self._presigned is None:
+            return
+        for intent_hash, result in zip(intent_hashes, results):
+            if isinstance(result, Order):
+                self._presigned.discard(intent_hash)
+
+    def _discard_presigned_cancellations(
+        self, orders: Iterable[Order | LazyRecord[Order]]
+    ) -> None:
+        if self._presigned is None:
+            return
+        for order in orders:
+            if order.state not in LIVE_ORDER_STATES:
+                self._presigned.discard(order.intent.hash)
+
+    @refresh_token_on_expiry
+    def _fetch_batch[F: PaginationFilter, T](
+        self, fetch: Callable[[F], list[T]], filter: F, batch: int, batch_size: int
+    ) -> list[T]:
+        return fetch(filter.model_copy(update=dict(batch=batch, batch_size=batch_size)))
+
+    def _iter_missed_order_fills(
+        self, filter: OrderFillFilter, since: datetime
+    ) -> Generator[OrderFill, None, None]:
+        batch = 1
+        while True:
+            order_fills = self._exchange.get_order_fills(
+                self._create_backfill_filter(filter, since, batch)
+            )
+            yield from order_fills
+            if len(order_fills) < DEFAULT_BATCH_SIZE:
+                return
+            batch += 1
+
+    def _submit_orders(
+        self, submissions: list[OrderSubmission]
+    ) -> list[Order | ExchangeError]:
+        results = self._exchange.submit_orders(submissions)
+        expired = [
+            i for i, r in enumerate(results) if isinstance(r, AuthenticationError)
+        ]
+        if expired:
+            self._login()
+            retried = self._exchange.submit_orders([submissions[i] for i in expired])
+            for i, result in zip(expired, retried):
+                results[i] = result
+        return results
+
+
+class AsyncTrading(BaseTrading, AsyncExchangeAPI):
+    """Asynchronous API for trading in the AutEx exchange.
+
+    Has the same methods as `Trading` but the methods that communicate with the
+    exchange are coroutines, so that many requests can be in flight concurrently on
+    a single event loop.
+
+    Authenticates with the exchange when entering the asynchronous context manager
+    and closes the connections to the exchange on exit:
+
+    ```py
+    async with app.AsyncTrading() as trading:
+        order = await trading.submit_limit_order(intent)
+    ```
+
+    Parameters
+    ----------
+    config : afp.config.Config
+    authenticator : afp.Authenticator, optional
+    exchange_url : str, optional
+    nonce_allocator : afp.nonces.NonceAllocator, optional
+        See `Trading`.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        authenticator: Authenticator | None = None,
+        exchange_url: str | None = None,
+        *,
+        nonce_allocator: NonceAllocator | None = None,
+    ):
+        super().__init__(config, authenticator, exchange_url)
+        if nonce_allocator is not None:
+            self._nonce_allocator = nonce_allocator
+
+    @async_refresh_token_on_expiry
+    async def submit_limit_order(self, intent: Intent) -> Order:
+        """Sends an intent expressing a limit order to the exchange.
+
+        See `Trading.submit_limit_order()`.
+        """
+        submission = OrderSubmission(
+            type=OrderType.LIMIT_ORDER,
+            intent=intent,
+        )
+        return await self._exchange.submit_order(submission)
+
+    @async_refresh_token_on_expiry
+    async def submit_cancel_order(self, intent_hash: str) -> Order:
+        """Sends a cancellation order to the exchange.
+
+        See `Trading.submit_cancel_order()`.
+        """
+        submission = self._create_cancellation_submission(intent_hash)
+        return await self._exchange.submit_order(submission)
+
+    async def submit_limit_orders(
+        self, intents: Iterable[Intent]
+    ) -> list[Order | ExchangeError]:
+        """Sends multiple intents expressing limit orders to the exchange concurrently.
+
+        See `Trading.submit_limit_orders()`.
+        """
+        submissions = [
+            OrderSubmission(type=OrderType.LIMIT_ORDER, intent=intent)
+            for intent in intents
+        ]
+        return await self._submit_orders(submissions)
+
+    async def submit_cancel_orders(
+        self, intent_hashes: Iterable[str]
+    ) -> list[Order | ExchangeError]:
+        """Sends multiple cancellation orders to the exchange concurrently.
+
+        See `Trading.submit_cancel_orders()`.
+        """
+        submissions = self._create_cancellation_submissions(intent_hashes)
+        return await self._submit_orders(submissions)
+
+    async def replace_order(
+        self,
+        old_intent_hash: str,
+        *,
+        product: ExchangeProduct,
+        side: str,
+        limit_price: Decimal,
+        quantity: int,
+        max_trading_fee_rate: Decimal,
+        good_until_time: datetime,
+        margin_account_id: str | None = None,
+        referral: str | None = None,
+        rounding: str | None = None,
+    ) -> tuple[Order, Order]:
+        """Cancels an order and submits a new limit order in its place.
+
+        See `Trading.replace_order()`.
+        """
+        spec = IntentSpec(
+            product=product,
+            side=side,
+            limit_price=limit_price,
+            quantity=quantity,
+            max_trading_fee_rate=max_trading_fee_rate,
+            good_until_time=good_until_time,
+            margin_account_id=margin_account_id,
+            referral=referral,
+            rounding=rounding,
+        )
+        cancellation, order = await self._submit_orders(
+            list(self._create_replacement_submissions(old_intent_hash, spec))
+        )
+        return _check_replacement(cancellation, order)
+
+    async def products(
+        self,
+        batch: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        newest_first: bool = True,
+    ) -> list[ExchangeProduct]:
+        """Retrieves the products approved for trading on the exchange.
+
+        See `Trading.products()`.
+        """
+        filter = ExchangeProductFilter(
+            batch=batch, batch_size=batch_size, newest_first=newest_first
+        )
+        return await self._exchange.get_approved_products(filter)
+
+    async def product(self, product_id: str) -> ExchangeProduct:
+        """Retrieves a product for trading by its ID.
+
+        See `Trading.product()`.
+        """
+        value = validators.validate_hexstr32(product_id)
+        return await self._exchange.get_product_by_id(value)
+
+    @async_refresh_token_on_expiry
+    async def order(self, order_id: str) -> Order:
+        """Retrieves an order by its ID from the orders that have been submitted by the
+        authenticated account.
+
+        See `Trading.order()`.
+        """
+        value = validators.validate_hexstr32(order_id)
+        return await self._exchange.get_order_by_id(value)
+
+    @async_refresh_token_on_expiry
+    async def orders(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        type_: str | None = None,
+        states: Iterable[str] = (),
+        side: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        newest_first: bool = True,
+    ) -> list[Order]:
+        """Retrieves the authenticated account's orders that match the given parameters.
+
+        See `Trading.orders()`.
+        """
+        filter = self._create_order_filter(
+            product_id=product_id,
+            intent_account_id=intent_account_id,
+            type_=type_,
+            states=states,
+            side=side,
+            start=start,
+            end=end,
+            batch=batch,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+        return await self._exchange.get_orders(filter)
+
+    @async_refresh_token_on_expiry
+    async def order_fills(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        intent_hash: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        trade_states: Iterable[str] = (),
+        batch: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        newest_first: bool = True,
+    ) -> list[OrderFill]:
+        """Retrieves the authenticated account's order fills that match the given
+        parameters.
+
+        See `Trading.order_fills()`.
+        """
+        filter = self._create_order_fill_filter(
+            product_id=product_id,
+            intent_account_id=intent_account_id,
+            intent_hash=intent_hash,
+            start=start,
+            end=end,
+            trade_states=trade_states,
+            batch=batch,
+            batch_size=batch_size,
+            newest_first=newest_first,
+        )
+        return await self._exchange.get_order_fills(filter)
+
+    async def iter_order_fills(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_account_id: str | None = None,
+        intent_hash: str | None = None,
+        trade_states: Iterable[str] = ("PENDING",),
+    ) -> AsyncGenerator[OrderFill, None]:
+        """Subscribes to the authenticated account's new order fills that match the
+        given parameters.
+
+        See `Trading.iter_order_fills()`.
+        """
+        filter = self._create_order_fill_filter(
+            product_id=product_id,
+            intent_account_id=intent_account_id,
+            intent_hash=intent_hash,
+            trade_states=trade_states,
+        )
+        async for order_fill in self._exchange.iter_order_fills(filter):
+            yield order_fill
+
+    async def market_depth(self, product_id: str) -> MarketDepthData:
+        """Retrieves the depth of market for the given product.
+
+        See `Trading.market_depth()`.
+        """
+        value = validators.validate_hexstr32(product_id)
+        return await self._exchange.get_market_depth_data(value)
+
+    async def iter_market_depth(
+        self, product_id: str
+    ) -> AsyncGenerator[MarketDepthData, None]:
+        """Subscribes to updates of the depth of market for the given product.
+
+        See `Trading.iter_market_depth()`.
+        """
+        value = validators.validate_hexstr32(product_id)
+        async for market_depth_data in self._exchange.iter_market_depth_data(value):
+            yield market_depth_data
+
+    async def ohlcv(
+        self,
+        product_id: str,
+        start: datetime | None = None,
+        interval: timedelta = timedelta(minutes=5),
+    ) -> list[OHLCVItem]:
+        """Retrieves Open-High-Low-Close-Volume time series data for the given product.
+
+        See `Trading.ohlcv()`.
+        """
+        if start is None:
+            start = datetime.now() - timedelta(days=1)
+
+        product_id = validators.validate_hexstr32(product_id)
+        start_timestamp = int(start.timestamp())
+        interval_secs = int(validators.validate_timedelta(interval).total_seconds())
+        return await self._exchange.get_time_series_data(
             product_id, start_timestamp, interval_secs
         )
+
+    async def iter_ohlcv(
+        self, product_id: str, interval: timedelta = timedelta(seconds=5)
+    ) -> AsyncGenerator[OHLCVItem, None]:
+        """Subscribes to Open-High-Low-Close-Volume time series data updates for the
+        given product.
+
+        See `Trading.iter_ohlcv()`.
+        """
+        product_id = validators.validate_hexstr32(product_id)
+        start_timestamp = int(datetime.now().timestamp())
+        interval_secs = int(validators.validate_timedelta(interval).total_seconds())
+        async for ohlcv_item in self._exchange.iter_time_series_data(
+            product_id, start_timestamp, interval_secs
+        ):
+            yield ohlcv_item
+
+    async def _submit_orders(
+        self, submissions: list[OrderSubmission]
+    ) -> list[Order | ExchangeError]:
+        login = self._login_count
+        results = await self._exchange.submit_orders(submissions)
+        expired = [
+            i for i, r in enumerate(results) if isinstance(r, AuthenticationError)
+        ]
+        if expired:
+            await self._login(login)
+            retried = await self._exchange.submit_orders(
+                [submissions[i] for i in expired]
+            )
+            for i, result in zip(expired, retried):
+                results[i] = result
+        return results
+
+
+def _check_replacement(
+    cancellation: Order | ExchangeError, order: Order | ExchangeError
+) -> tuple[Order, Order]:
+    if isinstance(cancellation, Order) and isinstance(order, Order):
+        return cancellation, order
+    if isinstance(order, Order):
+        message = "Order was placed but the cancellation was rejected"
+    elif isinstance(cancellation, Order):
+        message = "Order was cancelled but the new order was rejected"
+    else:
+        message = "Both the cancellation and the new order were rejected"
+    raise ReplaceOrderError(message, cancellation, order)
+
+
+def _paginate[T](
+    fetch: Callable[[int, int], list[T]], batch_size: int, max_batch_size: int
+) -> Generator[T, None, None]:
+    """Yields the items of consecutive batches while fetching the next batch in a
+    background thread.
+
+    Batches are addressed by index, so the batch size is only doubled when the number
+    of items fetched so far is a multiple of the new size.
+    """
+    if batch_size <= 0 or max_batch_size < batch_size:
+        raise ValueError("Batch sizes must satisfy 0 < batch_size <= max_batch_size")
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="afp-pagination")
+    offset = 0
+    size = batch_size
+    future: Future[list[T]] = executor.submit(fetch, 1, size)
+    try:
+        while True:
+            items = future.result()
+            if len(items) < size:
+                yield from items
+                return
+            offset += size
+            if 2 * size <= max_batch_size and offset % (2 * size) == 0:
+                size *= 2
+            future = executor.submit(fetch, offset // size + 1, size)
+            yield from items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_beyond_bounds(
+    timestamp: datetime, filter: OrderFilter | OrderFillFilter
+) -> bool:
+    if filter.newest_first:
+        return filter.start is not None and timestamp < filter.start
+    return filter.end is not None and timestamp > filter.end
+
+
+class _PresignedCancellations:
+    """Thread-safe store of presigned cancellations of live orders."""
+
+    _lock: threading.Lock
+    _cancellations: dict[str, tuple[str, datetime, OrderSubmission]]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancellations = {}
+
+    def __len__(self) -> int:
+        return len(self._cancellations)
+
+    def add(self, orders: list[Order], submissions: list[OrderSubmission]) -> None:
+        now = datetime.now(UTC)
+        with self._lock:
+            # Orders that have expired cannot be cancelled anymore
+            for intent_hash, (_, good_until_time, _) in list(
+                self._cancellations.items()
+            ):
+                if good_until_time < now:
+                    del self._cancellations[intent_hash]
+            for order, submission in zip(orders, submissions):
+                data = order.intent.data
+                self._cancellations[order.intent.hash] = (
+                    data.product_id,
+                    data.good_until_time,
+                    submission,
+                )
+
+    def get(self, intent_hash: str) -> OrderSubmission | None:
+        with self._lock:
+            cancellation = self._cancellations.get(intent_hash)
+        return None if cancellation is None else cancellation[2]
+
+    def get_all(
+        self, product_id: str | None
+    ) -> tuple[list[str], list[OrderSubmission]]:
+        with self._lock:
+            intent_hashes = [
+                intent_hash
+                for intent_hash, (order_product_id, _, _) in self._cancellations.items()
+                if product_id is None or order_product_id == product_id
+            ]
+            submissions = [
+                self._cancellations[intent_hash][2] for intent_hash in intent_hashes
+            ]
+        return intent_hashes, submissions
+
+    def discard(self, intent_hash: str) -> None:
+        with self._lock:
+            self._cancellations.pop(intent_hash, None)
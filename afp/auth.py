@@ -2,7 +2,7 @@ import atexit
 import json
 import os
 import sys
-from typing import Protocol, cast
+from typing import Protocol, Sequence, cast
 
 import trezorlib.ethereum as trezor_eth
 from eth_account.account import Account
@@ -10,6 +10,7 @@ from eth_account.datastructures import SignedTransaction
 from eth_account.messages import encode_defunct
 from eth_account.signers.local import LocalAccount
 from eth_account.types import TransactionDictType
+from eth_keys.datatypes import PrivateKey
 from eth_account._utils.legacy_transactions import (
     encode_transaction,
     serializable_unsigned_transaction_from_dict,
@@ -65,6 +66,7 @@ class PrivateKeyAuthenticator(Authenticator):
 
     def __init__(self, private_key: str) -> None:
         self._account = Account.from_key(private_key)
+        self._private_key = PrivateKey(self._account.key)
         self.address = self._account.address
 
     def sign_message(self, message: bytes) -> HexBytes:
@@ -72,6 +74,36 @@ class PrivateKeyAuthenticator(Authenticator):
         signed_message = self._account.sign_message(eip191_message)
         return signed_message.signature
 
+    def sign_messages(self, messages: Sequence[bytes]) -> list[HexBytes]:
+        """Signs multiple messages, with the same result as calling `sign_message()`
+        on each of them.
+
+        Signing skips the per-message overhead of `eth_account`. Installing the
+        `coincurve` extra makes `eth_keys` sign with the native secp256k1 library
+        instead of its pure Python implementation, which is about two orders of
+        magnitude faster.
+
+        Parameters
+        ----------
+        messages : sequence of bytes
+
+        Returns
+        -------
+        list of hexbytes.HexBytes
+        """
+        signatures: list[HexBytes] = []
+        for message in messages:
+            signature = self._private_key.sign_msg_hash(_hash_eip191_message(message))
+            # Ethereum signatures encode the recovery ID as 27 or 28
+            signatures.append(
+                HexBytes(
+                    signature.r.to_bytes(32)
+                    + signature.s.to_bytes(32)
+                    + (signature.v + 27).to_bytes(1)
+                )
+            )
+        return signatures
+
     def sign_transaction(self, params: TxParams) -> SignedTransaction:
         return self._account.sign_transaction(cast(TransactionDictType, params))
 
@@ -79,6 +111,10 @@ class PrivateKeyAuthenticator(Authenticator):
         return f"{self.__class__.__name__}(address='{self.address}')"
 
 
+def _hash_eip191_message(message: bytes) -> bytes:
+    return keccak(b"\x19Ethereum Signed Message:\n%d%b" % (len(message), message))
+
+
 class KeyfileAuthenticator(PrivateKeyAuthenticator):
     """Authenticates with a private key read from an encrypted keyfile.
 
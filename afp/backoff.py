@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+
+from . import constants
+
+
+class Backoff:
+    """Exponentially increasing delays with full jitter.
+
+    Parameters
+    ----------
+    initial_delay : float
+        The upper bound of the first delay in seconds.
+    max_delay : float
+        The upper bound of any delay in seconds.
+    """
+
+    _initial_delay: float
+    _max_delay: float
+    _attempts: int
+
+    def __init__(
+        self,
+        initial_delay: float = constants.RECONNECT_INITIAL_DELAY,
+        max_delay: float = constants.RECONNECT_MAX_DELAY,
+    ):
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._attempts = 0
+
+    def next_delay(self) -> float:
+        """Returns the number of seconds to wait before the next attempt."""
+        # Limit the exponent so that the multiplication does not overflow
+        ceiling = self._initial_delay * 2 ** min(self._attempts, 32)
+        self._attempts += 1
+        return random.uniform(0, min(ceiling, self._max_delay))
+
+    def reset(self) -> None:
+        """Restarts the sequence of delays after a successful attempt."""
+        self._attempts = 0
+
+
+class RateLimiter:
+    """Token bucket that spaces out requests to stay below a rate limit.
+
+    Parameters
+    ----------
+    rate : float
+        The sustained number of requests per second.
+    burst : int, optional
+        The number of requests that may be sent at once after an idle period.
+        Defaults to one second's worth of requests.
+    """
+
+    _rate: float
+    _burst: float
+    _tokens: float
+    _updated_at: float
+    _lock: threading.Lock
+
+    def __init__(self, rate: float, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self._rate = rate
+        self._burst = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self._burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket and returns the number of seconds to wait
+        before sending the request."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated_at) * self._rate
+            )
+            self._updated_at = now
+            # Tokens may go negative, which queues concurrent callers behind each other
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self._rate)
@@ -0,0 +1,115 @@
+from decimal import Decimal
+from typing import Any, Iterable, Mapping
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as import_error:
+    raise ImportError(
+        "Columnar exports require NumPy, install it with 'pip install afp-sdk[numpy]'"
+    ) from import_error
+
+
+OHLCV_DTYPE = np.dtype(
+    [
+        ("timestamp", np.int64),
+        ("open", np.int64),
+        ("high", np.int64),
+        ("low", np.int64),
+        ("close", np.int64),
+        ("volume", np.int64),
+    ]
+)
+
+
+def ohlcv_to_array(
+    items: Iterable[Mapping[str, Any]], tick_size: int
+) -> npt.NDArray[np.void]:
+    """Converts serialized OHLCV data points into a structured array.
+
+    Parameters
+    ----------
+    items : iterable of dict
+        OHLCV data points as returned by the exchange API.
+    tick_size : int
+        The number of fractional digits of the product's prices.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of `OHLCV_DTYPE` with UNIX timestamps and fixed-point prices in ticks.
+    """
+    items = list(items)
+    array = np.empty(len(items), dtype=OHLCV_DTYPE)
+    array["timestamp"] = [item["timestamp"] for item in items]
+    for field in ("open", "high", "low", "close"):
+        array[field] = to_ticks([item[field] for item in items], tick_size)
+    array["volume"] = [item["volume"] for item in items]
+    return array
+
+
+def order_fills_to_table(
+    order_fills: Iterable[Mapping[str, Any]], tick_sizes: Mapping[str, int]
+) -> dict[str, npt.NDArray[Any]]:
+    """Converts serialized order fills into a table of columns.
+
+    Parameters
+    ----------
+    order_fills : iterable of dict
+        Order fills as returned by the exchange API.
+    tick_sizes : dict
+        The number of fractional digits of the prices of each product.
+
+    Returns
+    -------
+    dict of str to numpy.ndarray
+        Columns of equal length. Timestamps are UNIX timestamps of the trades and
+        prices are fixed-point integers in ticks of the product.
+    """
+    order_fills = list(order_fills)
+    trades = [order_fill["trade"] for order_fill in order_fills]
+    intents = [order_fill["order"]["intent"] for order_fill in order_fills]
+    product_ids = [trade["productId"] for trade in trades]
+    scales = [tick_sizes[product_id] for product_id in product_ids]
+    return {
+        "timestamp": np.array([trade["timestamp"] for trade in trades], dtype=np.int64),
+        "product_id": np.array(product_ids, dtype=np.str_),
+        "trade_id": np.array([str(trade["id"]) for trade in trades], dtype=np.str_),
+        "trade_state": np.array([trade["state"] for trade in trades], dtype=np.str_),
+        "order_id": np.array(
+            [order_fill["order"]["id"] for order_fill in order_fills], dtype=np.str_
+        ),
+        "intent_hash": np.array([intent["hash"] for intent in intents], dtype=np.str_),
+        "side": np.array([intent["data"]["side"] for intent in intents], dtype=np.str_),
+        "quantity": np.array(
+            [order_fill["quantity"] for order_fill in order_fills], dtype=np.int64
+        ),
+        "price": _scale([order_fill["price"] for order_fill in order_fills], scales),
+        "trading_fee_rate": np.array(
+            [order_fill["tradingFeeRate"] for order_fill in order_fills],
+            dtype=np.float64,
+        ),
+    }
+
+
+def to_ticks(values: Iterable[Any], tick_size: int) -> npt.NDArray[np.int64]:
+    """Converts decimal prices, in numeric or string representation, into fixed-point
+    integers with `tick_size` fractional digits.
+
+    Prices are scaled exactly in decimal arithmetic; prices with more than
+    `tick_size` fractional digits are rounded half to even.
+    """
+    values = list(values)
+    return _scale(values, [tick_size] * len(values))
+
+
+def _scale(values: Iterable[Any], tick_sizes: Iterable[int]) -> npt.NDArray[np.int64]:
+    # Numbers go through their string representation so that floats are scaled by
+    # their shortest decimal form rather than their binary approximation
+    return np.array(
+        [
+            int(Decimal(str(value)).scaleb(tick_size).to_integral_value())
+            for value, tick_size in zip(values, tick_sizes)
+        ],
+        dtype=np.int64,
+    )
@@ -15,6 +15,10 @@ class Config:
 
     # Venue parameters
     exchange_url: str
+    exchange_pool_size: int
+    exchange_tcp_keepalive: bool
+    exchange_max_retries: int
+    exchange_rate_limit: float | None
 
     # Blockchain parameters
     rpc_url: str | None
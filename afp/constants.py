@@ -8,15 +8,40 @@ def _int_or_none(value: str | None) -> int | None:
     return int(value) if value is not None else None
 
 
+def _float_or_none(value: str | None) -> float | None:
+    return float(value) if value is not None else None
+
+
+def _bool(value: str | None) -> bool:
+    return value in ("1", "true", "True")
+
+
 # Venue API constants
 USER_AGENT = "afp-sdk/{}".format(metadata.version("afp-sdk"))
 DEFAULT_BATCH_SIZE = 50
+MAX_BATCH_SIZE = 400
 DEFAULT_EXCHANGE_API_VERSION = 1
+EXCHANGE_KEEPALIVE_TIMEOUT = 60
+EXCHANGE_CONNECT_TIMEOUT = 10
+EXCHANGE_REQUEST_TIMEOUT = 30
+RECONNECT_INITIAL_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+RETRY_INITIAL_DELAY = 0.1
+RETRY_MAX_DELAY = 10.0
+RECONNECT_DEDUPLICATION_WINDOW = 10_000
+STREAM_QUEUE_SIZE = 1000
+ORDER_MANAGER_HISTORY_SIZE = 10_000
+PRODUCT_CACHE_TTL = timedelta(minutes=1)
+NONCE_LEASE_SIZE = 1000
 
 # Clearing System constants
 RATE_MULTIPLIER = 10**4
 FEE_RATE_MULTIPLIER = 10**6
 FULL_PRECISION_MULTIPLIER = 10**18
+TRANSACTION_NONCE_RETRIES = 3
+RECEIPT_POLL_INTERVAL = 1.0
+GAS_FEE_CACHE_TTL = timedelta(seconds=1)
+GAS_ESTIMATE_MULTIPLIER = 1.2
 
 # IPFS client constants
 IPFS_CID_ENCODING = "base32"
@@ -81,7 +106,7 @@ bakerloo = SimpleNamespace(
     SYSTEM_VIEWER_ADDRESS="0xF2F903B8956Ca6868E165989A9ebEEE72F4D3e3F",
 )
 
-TESTNET = os.getenv("AFP_TESTNET") in ("1", "true", "True")
+TESTNET = _bool(os.getenv("AFP_TESTNET"))
 _current_env = bakerloo if TESTNET else mainnet
 
 defaults = SimpleNamespace(
@@ -93,6 +118,10 @@ defaults = SimpleNamespace(
     TREZOR_PASSPHRASE=os.getenv("AFP_TREZOR_PASSPHRASE", ""),
     # Venue parameters
     EXCHANGE_URL=os.getenv("AFP_EXCHANGE_URL", _current_env.EXCHANGE_URL),
+    EXCHANGE_POOL_SIZE=int(os.getenv("AFP_EXCHANGE_POOL_SIZE", 32)),
+    EXCHANGE_TCP_KEEPALIVE=_bool(os.getenv("AFP_EXCHANGE_TCP_KEEPALIVE", "true")),
+    EXCHANGE_MAX_RETRIES=int(os.getenv("AFP_EXCHANGE_MAX_RETRIES", 0)),
+    EXCHANGE_RATE_LIMIT=_float_or_none(os.getenv("AFP_EXCHANGE_RATE_LIMIT", None)),
     # IPFS client parameters
     IPFS_API_URL=os.getenv("AFP_IPFS_API_URL", IPFS_LOCAL_NODE_URL),
     IPFS_API_KEY=os.getenv("AFP_IPFS_API_KEY", None),
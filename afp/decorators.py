@@ -17,7 +17,7 @@ from web3.exceptions import (
 )
 from web3._utils import contracts, normalizers
 
-from .api.base import ExchangeAPI
+from .api.base import AsyncExchangeAPI, ExchangeAPI
 from .exceptions import ClearingSystemError, AuthenticationError
 
 
@@ -34,6 +34,20 @@ def refresh_token_on_expiry(
         return f(*args, **kwargs)
 
 
+@decorator
+async def async_refresh_token_on_expiry(
+    f: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    exchange_api = args[0]
+    assert isinstance(exchange_api, AsyncExchangeAPI)
+    login = exchange_api._login_count  # type: ignore
+    try:
+        return await f(*args, **kwargs)
+    except AuthenticationError:
+        await exchange_api._login(login)  # type: ignore
+        return await f(*args, **kwargs)
+
+
 def convert_web3_error(*contract_abis: ABI) -> Callable[..., Any]:
     def caller(f: Callable[..., Any], *args: Any, **kwargs: Any) -> Callable[..., Any]:
         try:
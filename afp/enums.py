@@ -33,3 +33,10 @@ class TradeState(StrEnum):
     PENDING = "PENDING"
     CLEARED = "CLEARED"
     REJECTED = "REJECTED"
+
+
+class OverflowPolicy(StrEnum):
+    DROP_OLDEST = "DROP_OLDEST"
+    DROP_NEWEST = "DROP_NEWEST"
+    COALESCE = "COALESCE"
+    FAIL = "FAIL"
@@ -1,3 +1,9 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .schemas import Order
+
+
 class AFPException(Exception):
     pass
 
@@ -46,3 +52,29 @@ class RateLimitExceeded(ExchangeError):
 
 class ValidationError(ExchangeError):
     pass
+
+
+class ReplaceOrderError(ExchangeError):
+    """Raised by `Trading.replace_order()` if the exchange rejects either the
+    cancellation or the new order.
+
+    Attributes
+    ----------
+    cancellation : afp.schemas.Order or afp.exceptions.ExchangeError
+        The cancellation order or the exception raised by the exchange.
+    order : afp.schemas.Order or afp.exceptions.ExchangeError
+        The new limit order or the exception raised by the exchange.
+    """
+
+    cancellation: "Order | ExchangeError"
+    order: "Order | ExchangeError"
+
+    def __init__(
+        self,
+        message: str,
+        cancellation: "Order | ExchangeError",
+        order: "Order | ExchangeError",
+    ):
+        super().__init__(message)
+        self.cancellation = cancellation
+        self.order = order
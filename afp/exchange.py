@@ -1,11 +1,30 @@
 import json
 import re
-from typing import Any, Generator
+import asyncio
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Literal,
+    Mapping,
+    Sequence,
+    overload,
+)
 
+import aiohttp
 import requests
+from pydantic import BaseModel
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
 
 from . import constants
+from .backoff import Backoff, RateLimiter
+from .constants import defaults
 from .dtos import (
     ExchangeParameters,
     ExchangeProductFilter,
@@ -16,6 +35,7 @@ from .dtos import (
     OrderFillFilter,
     OrderSubmission,
 )
+from .enums import OrderType
 from .exceptions import (
     AuthenticationError,
     AuthorizationError,
@@ -31,15 +51,35 @@ from .schemas import (
     Order,
     OrderFill,
 )
+from .records import LazyRecord
 
 
 class ExchangeClient:
     _base_url: str
+    _pool_size: int
+    _max_retries: int
+    _rate_limiter: RateLimiter | None
     _session: Session
 
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool_size: int = defaults.EXCHANGE_POOL_SIZE,
+        tcp_keepalive: bool = defaults.EXCHANGE_TCP_KEEPALIVE,
+        max_retries: int = defaults.EXCHANGE_MAX_RETRIES,
+        rate_limit: float | None = defaults.EXCHANGE_RATE_LIMIT,
+    ):
         self._base_url = re.sub(r"/$", "", base_url)
+        self._pool_size = pool_size
+        self._max_retries = max_retries
+        self._rate_limiter = RateLimiter(rate_limit) if rate_limit is not None else None
         self._session = Session()
+        adapter = _TransportAdapter(
+            _socket_options(tcp_keepalive), pool_maxsize=pool_size
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(base_url={self._base_url})"
@@ -91,10 +131,33 @@ class ExchangeClient:
     # POST /orders
     def submit_order(self, order_submission: OrderSubmission) -> Order:
         response = self._send_request(
-            "POST", "/orders", data=order_submission.model_dump_json()
+            "POST",
+            "/orders",
+            data=order_submission.model_dump_json(),
+            idempotent=_is_idempotent(order_submission),
         )
         return Order(**response.json())
 
+    # POST /orders (concurrently)
+    def submit_orders(
+        self, order_submissions: Sequence[OrderSubmission]
+    ) -> list[Order | ExchangeError]:
+        if not order_submissions:
+            return []
+        max_workers = min(self._pool_size, len(order_submissions))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.submit_order, submission)
+                for submission in order_submissions
+            ]
+        results: list[Order | ExchangeError] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except ExchangeError as error:
+                results.append(error)
+        return results
+
     # GET /orders
     def get_orders(self, filter: OrderFilter) -> list[Order]:
         response = self._send_request(
@@ -109,62 +172,121 @@ class ExchangeClient:
 
     # GET /order-fills
     def get_order_fills(self, filter: OrderFillFilter) -> list[OrderFill]:
+        return [OrderFill(**item) for item in self.get_raw_order_fills(filter)]
+
+    # GET /order-fills
+    def get_raw_order_fills(self, filter: OrderFillFilter) -> list[dict[str, Any]]:
         response = self._send_request(
             "GET", "/order-fills", params=filter.model_dump(exclude_none=True)
         )
-        return [OrderFill(**item) for item in response.json()["orderFills"]]
+        return response.json(parse_float=Decimal)["orderFills"]
+
+    @overload
+    def iter_order_fills(
+        self, filter: OrderFillFilter, trusted: Literal[False] = False
+    ) -> Generator[OrderFill, None, None]: ...
+
+    @overload
+    def iter_order_fills(
+        self, filter: OrderFillFilter, trusted: Literal[True]
+    ) -> Generator[LazyRecord[OrderFill], None, None]: ...
+
+    @overload
+    def iter_order_fills(
+        self, filter: OrderFillFilter, trusted: bool
+    ) -> Generator[OrderFill | LazyRecord[OrderFill], None, None]: ...
 
     # GET /stream/order-fills
     def iter_order_fills(
-        self, filter: OrderFillFilter
-    ) -> Generator[OrderFill, None, None]:
+        self, filter: OrderFillFilter, trusted: bool = False
+    ) -> Generator[OrderFill | LazyRecord[OrderFill], None, None]:
         response = self._send_request(
             "GET",
             "/stream/order-fills",
             params=filter.model_dump(exclude_none=True),
             stream=True,
         )
-        for line in response.iter_lines():
-            yield OrderFill.model_validate_json(line)
+        return self._decode_lines(response, OrderFill, trusted)
 
     # GET /market-depth/{product_id}
     def get_market_depth_data(self, product_id: str) -> MarketDepthData:
         response = self._send_request("GET", f"/market-depth/{product_id}")
         return MarketDepthData(**response.json())
 
+    @overload
+    def iter_market_depth_data(
+        self, product_id: str, trusted: Literal[False] = False
+    ) -> Generator[MarketDepthData, None, None]: ...
+
+    @overload
+    def iter_market_depth_data(
+        self, product_id: str, trusted: Literal[True]
+    ) -> Generator[LazyRecord[MarketDepthData], None, None]: ...
+
+    @overload
+    def iter_market_depth_data(
+        self, product_id: str, trusted: bool
+    ) -> Generator[MarketDepthData | LazyRecord[MarketDepthData], None, None]: ...
+
     # GET /stream/market-depth/{product_id}
     def iter_market_depth_data(
-        self, product_id: str
-    ) -> Generator[MarketDepthData, None, None]:
+        self, product_id: str, trusted: bool = False
+    ) -> Generator[MarketDepthData | LazyRecord[MarketDepthData], None, None]:
         response = self._send_request(
             "GET", f"/stream/market-depth/{product_id}", stream=True
         )
-        for line in response.iter_lines():
-            yield MarketDepthData.model_validate_json(line)
+        return self._decode_lines(response, MarketDepthData, trusted)
 
     # GET /time-series/{product_id}
     def get_time_series_data(
         self, product_id: str, start: int, interval: int
     ) -> list[OHLCVItem]:
+        return [
+            OHLCVItem(**item)
+            for item in self.get_raw_time_series_data(product_id, start, interval)
+        ]
+
+    # GET /time-series/{product_id}
+    def get_raw_time_series_data(
+        self, product_id: str, start: int, interval: int
+    ) -> list[dict[str, Any]]:
         response = self._send_request(
             "GET",
             f"/time-series/{product_id}",
             params=dict(start=start, interval=interval),
         )
-        return [OHLCVItem(**item) for item in response.json()["data"]]
+        return response.json(parse_float=Decimal)["data"]
+
+    @overload
+    def iter_time_series_data(
+        self,
+        product_id: str,
+        start: int,
+        interval: int,
+        trusted: Literal[False] = False,
+    ) -> Generator[OHLCVItem, None, None]: ...
+
+    @overload
+    def iter_time_series_data(
+        self, product_id: str, start: int, interval: int, trusted: Literal[True]
+    ) -> Generator[LazyRecord[OHLCVItem], None, None]: ...
+
+    @overload
+    def iter_time_series_data(
+        self, product_id: str, start: int, interval: int, trusted: bool
+    ) -> Generator[OHLCVItem | LazyRecord[OHLCVItem], None, None]: ...
 
     # GET /stream/time-series/{product_id}
     def iter_time_series_data(
-        self, product_id: str, start: int, interval: int
-    ) -> Generator[OHLCVItem, None, None]:
+        self, product_id: str, start: int, interval: int, trusted: bool = False
+    ) -> Generator[OHLCVItem | LazyRecord[OHLCVItem], None, None]:
         response = self._send_request(
             "GET",
             f"/stream/time-series/{product_id}",
             params=dict(start=start, interval=interval),
             stream=True,
         )
-        for line in response.iter_lines():
-            yield OHLCVItem.model_validate_json(line)
+        return self._decode_lines(response, OHLCVItem, trusted)
 
     def _send_request(
         self,
@@ -172,50 +294,434 @@ class ExchangeClient:
         endpoint: str,
         *,
         stream: bool = False,
+        idempotent: bool | None = None,
         api_version: int = constants.DEFAULT_EXCHANGE_API_VERSION,
         **kwargs: Any,
     ) -> Response:
-        kwargs["headers"] = {
-            "Content-Type": "application/json",
-            "Accept": "application/x-ndjson" if stream else "application/json",
-            "User-Agent": constants.USER_AGENT,
-        }
+        kwargs["headers"] = _request_headers(stream)
+        if idempotent is None:
+            idempotent = method == "GET"
 
+        backoff = Backoff(constants.RETRY_INITIAL_DELAY, constants.RETRY_MAX_DELAY)
+        attempts = 0
+        while True:
+            if self._rate_limiter is not None:
+                time.sleep(self._rate_limiter.reserve())
+            attempts += 1
+            retry = attempts <= self._max_retries
+            try:
+                response = self._session.request(
+                    method,
+                    f"{self._base_url}/v{api_version}{endpoint}",
+                    stream=stream,
+                    **kwargs,
+                )
+            except requests.exceptions.RequestException as request_exception:
+                if retry and _is_retryable(None, idempotent):
+                    time.sleep(backoff.next_delay())
+                    continue
+                raise ExchangeError(
+                    "Failed to send request to the exchange"
+                ) from request_exception
+            if retry and _is_retryable(response.status_code, idempotent):
+                response.close()
+                time.sleep(_retry_delay(response.headers, backoff))
+                continue
+            break
         try:
-            response = self._session.request(
-                method,
-                f"{self._base_url}/v{api_version}{endpoint}",
-                stream=stream,
-                **kwargs,
-            )
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as http_error:
+            raise _convert_http_error(
+                http_error.response.status_code, http_error, response.json
+            ) from http_error
+
+        return response
+
+    def _decode_lines[M: BaseModel](
+        self, response: Response, model_type: type[M], trusted: bool
+    ) -> Generator[M | LazyRecord[M], None, None]:
+        lines = self._iter_lines(response)
+        if trusted:
+            return (LazyRecord[M].from_json(model_type, line) for line in lines)
+        return (model_type.model_validate_json(line) for line in lines)
+
+    @staticmethod
+    def _iter_lines(response: Response) -> Generator[bytes, None, None]:
+        try:
+            for line in response.iter_lines():
+                if line.strip():
+                    yield line
         except requests.exceptions.RequestException as request_exception:
             raise ExchangeError(
-                "Failed to send request to the exchange"
+                "Lost connection to the exchange"
             ) from request_exception
+        finally:
+            response.close()
+
+
+class AsyncExchangeClient:
+    """Asynchronous counterpart of `ExchangeClient` built on `aiohttp`.
+
+    The underlying client session is created on first use so that it is bound to
+    the running event loop. It should be closed with `close()` when no longer needed.
+    """
+
+    _base_url: str
+    _pool_size: int
+    _max_retries: int
+    _rate_limiter: RateLimiter | None
+    _session: aiohttp.ClientSession | None
+    _socket_options: list[tuple[int, int, int]]
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool_size: int = defaults.EXCHANGE_POOL_SIZE,
+        tcp_keepalive: bool = defaults.EXCHANGE_TCP_KEEPALIVE,
+        max_retries: int = defaults.EXCHANGE_MAX_RETRIES,
+        rate_limit: float | None = defaults.EXCHANGE_RATE_LIMIT,
+    ):
+        self._base_url = re.sub(r"/$", "", base_url)
+        self._pool_size = pool_size
+        self._max_retries = max_retries
+        self._rate_limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+        self._session = None
+        self._socket_options = _socket_options(tcp_keepalive)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(base_url={self._base_url})"
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # POST /nonce
+    async def generate_login_nonce(self) -> str:
+        response = await self._send_request("GET", "/nonce")
+        return (await response.json(content_type=None))["message"]
+
+    # POST /login
+    async def login(self, login_submission: LoginSubmission) -> ExchangeParameters:
+        response = await self._send_request(
+            "POST", "/login", data=login_submission.model_dump_json()
+        )
+        return ExchangeParameters(**await response.json(content_type=None))
+
+    # GET /products
+    async def get_approved_products(
+        self, filter: ExchangeProductFilter
+    ) -> list[ExchangeProduct]:
+        response = await self._send_request(
+            "GET", "/products", params=filter.model_dump(exclude_none=True)
+        )
+        return [
+            ExchangeProduct(**item)
+            for item in (await response.json(content_type=None))["products"]
+        ]
+
+    # GET /products/{product_id}
+    async def get_product_by_id(self, product_id: str) -> ExchangeProduct:
+        response = await self._send_request("GET", f"/products/{product_id}")
+        return ExchangeProduct(**await response.json(content_type=None))
+
+    # POST /products
+    async def list_product(
+        self, listing_submission: ExchangeProductListingSubmission
+    ) -> None:
+        await self._send_request(
+            "POST", "/products", data=listing_submission.model_dump_json()
+        )
+
+    # PATCH /products
+    async def update_product_listing(
+        self, product_id: str, update_submission: ExchangeProductUpdateSubmission
+    ) -> None:
+        await self._send_request(
+            "PATCH",
+            f"/products/{product_id}",
+            data=update_submission.model_dump_json(),
+        )
+
+    # POST /orders
+    async def submit_order(self, order_submission: OrderSubmission) -> Order:
+        response = await self._send_request(
+            "POST",
+            "/orders",
+            data=order_submission.model_dump_json(),
+            idempotent=_is_idempotent(order_submission),
+        )
+        return Order(**await response.json(content_type=None))
+
+    # POST /orders (concurrently)
+    async def submit_orders(
+        self, order_submissions: Sequence[OrderSubmission]
+    ) -> list[Order | ExchangeError]:
+        outcomes = await asyncio.gather(
+            *(self.submit_order(submission) for submission in order_submissions),
+            return_exceptions=True,
+        )
+        results: list[Order | ExchangeError] = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(
+                outcome, ExchangeError
+            ):
+                raise outcome
+            results.append(outcome)
+        return results
+
+    # GET /orders
+    async def get_orders(self, filter: OrderFilter) -> list[Order]:
+        response = await self._send_request(
+            "GET", "/orders", params=filter.model_dump(exclude_none=True)
+        )
+        return [
+            Order(**item) for item in (await response.json(content_type=None))["orders"]
+        ]
+
+    # GET /orders/{order_id}
+    async def get_order_by_id(self, order_id: str) -> Order:
+        response = await self._send_request("GET", f"/orders/{order_id}")
+        return Order(**await response.json(content_type=None))
+
+    # GET /order-fills
+    async def get_order_fills(self, filter: OrderFillFilter) -> list[OrderFill]:
+        response = await self._send_request(
+            "GET", "/order-fills", params=filter.model_dump(exclude_none=True)
+        )
+        return [
+            OrderFill(**item)
+            for item in (await response.json(content_type=None))["orderFills"]
+        ]
+
+    # GET /stream/order-fills
+    async def iter_order_fills(
+        self, filter: OrderFillFilter
+    ) -> AsyncGenerator[OrderFill, None]:
+        response = await self._send_request(
+            "GET",
+            "/stream/order-fills",
+            params=filter.model_dump(exclude_none=True),
+            stream=True,
+        )
+        async for line in self._iter_lines(response):
+            yield OrderFill.model_validate_json(line)
+
+    # GET /market-depth/{product_id}
+    async def get_market_depth_data(self, product_id: str) -> MarketDepthData:
+        response = await self._send_request("GET", f"/market-depth/{product_id}")
+        return MarketDepthData(**await response.json(content_type=None))
+
+    # GET /stream/market-depth/{product_id}
+    async def iter_market_depth_data(
+        self, product_id: str
+    ) -> AsyncGenerator[MarketDepthData, None]:
+        response = await self._send_request(
+            "GET", f"/stream/market-depth/{product_id}", stream=True
+        )
+        async for line in self._iter_lines(response):
+            yield MarketDepthData.model_validate_json(line)
+
+    # GET /time-series/{product_id}
+    async def get_time_series_data(
+        self, product_id: str, start: int, interval: int
+    ) -> list[OHLCVItem]:
+        response = await self._send_request(
+            "GET",
+            f"/time-series/{product_id}",
+            params=dict(start=start, interval=interval),
+        )
+        return [
+            OHLCVItem(**item)
+            for item in (await response.json(content_type=None))["data"]
+        ]
+
+    # GET /stream/time-series/{product_id}
+    async def iter_time_series_data(
+        self, product_id: str, start: int, interval: int
+    ) -> AsyncGenerator[OHLCVItem, None]:
+        response = await self._send_request(
+            "GET",
+            f"/stream/time-series/{product_id}",
+            params=dict(start=start, interval=interval),
+            stream=True,
+        )
+        async for line in self._iter_lines(response):
+            yield OHLCVItem.model_validate_json(line)
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        stream: bool = False,
+        idempotent: bool | None = None,
+        api_version: int = constants.DEFAULT_EXCHANGE_API_VERSION,
+        **kwargs: Any,
+    ) -> aiohttp.ClientResponse:
+        kwargs["headers"] = _request_headers(stream)
+        if stream:
+            # Streams are open-ended, so only limit the time to connect
+            kwargs["timeout"] = aiohttp.ClientTimeout(
+                total=None, sock_connect=constants.EXCHANGE_CONNECT_TIMEOUT
+            )
+
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_size,
+                keepalive_timeout=constants.EXCHANGE_KEEPALIVE_TIMEOUT,
+                socket_factory=self._create_socket,
+            )
+            # Accept cookies from IP address hosts like `requests.Session` does
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                timeout=aiohttp.ClientTimeout(
+                    total=constants.EXCHANGE_REQUEST_TIMEOUT,
+                    sock_connect=constants.EXCHANGE_CONNECT_TIMEOUT,
+                ),
+            )
+
+        if idempotent is None:
+            idempotent = method == "GET"
+
+        backoff = Backoff(constants.RETRY_INITIAL_DELAY, constants.RETRY_MAX_DELAY)
+        attempts = 0
+        while True:
+            if self._rate_limiter is not None:
+                await asyncio.sleep(self._rate_limiter.reserve())
+            attempts += 1
+            retry = attempts <= self._max_retries
+            body = b""
+            try:
+                response = await self._session.request(
+                    method, f"{self._base_url}/v{api_version}{endpoint}", **kwargs
+                )
+                if not stream or response.status >= 400:
+                    # Read the body so that the connection is released to the pool
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as client_error:
+                if retry and _is_retryable(None, idempotent):
+                    await asyncio.sleep(backoff.next_delay())
+                    continue
+                raise ExchangeError(
+                    "Failed to send request to the exchange"
+                ) from client_error
+            if retry and _is_retryable(response.status, idempotent):
+                await asyncio.sleep(_retry_delay(response.headers, backoff))
+                continue
+            break
         try:
             response.raise_for_status()
-        except requests.exceptions.HTTPError as http_error:
-            if http_error.response.status_code == requests.codes.UNAUTHORIZED:
-                raise AuthenticationError(http_error) from http_error
-            if http_error.response.status_code == requests.codes.FORBIDDEN:
-                raise AuthorizationError(http_error) from http_error
-            if http_error.response.status_code == requests.codes.NOT_FOUND:
-                raise NotFoundError(http_error) from http_error
-            if http_error.response.status_code == requests.codes.TOO_MANY_REQUESTS:
-                raise RateLimitExceeded(http_error) from http_error
-            if http_error.response.status_code == requests.codes.BAD_REQUEST:
-                try:
-                    reason = response.json()["detail"]
-                except (json.JSONDecodeError, KeyError):
-                    reason = http_error
-                raise ValidationError(reason) from http_error
-            if http_error.response.status_code == requests.codes.UNPROCESSABLE:
-                try:
-                    reason = ", ".join(err["msg"] for err in response.json()["detail"])
-                except (json.JSONDecodeError, KeyError, TypeError):
-                    reason = http_error
-                raise ValidationError(reason) from http_error
-
-            raise ExchangeError(http_error) from http_error
+        except aiohttp.ClientResponseError as http_error:
+            raise _convert_http_error(
+                http_error.status, http_error, lambda: json.loads(body)
+            ) from http_error
 
         return response
+
+    def _create_socket(self, addr_info: tuple[Any, ...]) -> socket.socket:
+        family, type_, proto, _, _ = addr_info
+        sock = socket.socket(family=family, type=type_, proto=proto)
+        for level, option, value in self._socket_options:
+            sock.setsockopt(level, option, value)
+        return sock
+
+    @staticmethod
+    async def _iter_lines(
+        response: aiohttp.ClientResponse,
+    ) -> AsyncGenerator[bytes, None]:
+        try:
+            async for line in response.content:
+                if line.strip():
+                    yield line
+        except (aiohttp.ClientError, asyncio.TimeoutError) as client_error:
+            raise ExchangeError("Lost connection to the exchange") from client_error
+        finally:
+            response.release()
+
+
+class _TransportAdapter(HTTPAdapter):
+    """HTTP adapter that applies socket options to pooled connections."""
+
+    _socket_options: list[tuple[int, int, int]]
+
+    def __init__(self, socket_options: list[tuple[int, int, int]], **kwargs: Any):
+        # Set before calling the parent constructor as it creates the pool manager
+        self._socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        pool_kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(  # type: ignore (untyped method)
+            connections, maxsize, block, **pool_kwargs
+        )
+
+
+def _socket_options(tcp_keepalive: bool) -> list[tuple[int, int, int]]:
+    # Disable Nagle's algorithm so that small order payloads are sent immediately
+    options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    if tcp_keepalive:
+        # Keep idle pooled connections from being dropped by NATs and load balancers
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    return options
+
+
+def _request_headers(stream: bool) -> dict[str, str]:
+    return {
+        "Content-Type": "application/json",
+        "Accept": "application/x-ndjson" if stream else "application/json",
+        "User-Agent": constants.USER_AGENT,
+    }
+
+
+def _is_idempotent(order_submission: OrderSubmission) -> bool:
+    # The exchange identifies limit orders by intent hash, so a limit order that is
+    # submitted again is not placed twice
+    return order_submission.type == OrderType.LIMIT_ORDER
+
+
+def _is_retryable(status_code: int | None, idempotent: bool) -> bool:
+    # Requests that exceed the rate limit are rejected without being processed,
+    # whereas failed requests may or may not have been processed
+    if status_code == requests.codes.TOO_MANY_REQUESTS:
+        return True
+    return idempotent and (status_code is None or status_code >= 500)
+
+
+def _retry_delay(headers: Mapping[str, str], backoff: Backoff) -> float:
+    try:
+        return max(0.0, float(headers["Retry-After"]))
+    except (KeyError, ValueError):
+        # Retry-After may also be an HTTP date, which is not worth parsing
+        return backoff.next_delay()
+
+
+def _convert_http_error(
+    status_code: int, http_error: Exception, read_json: Callable[[], Any]
+) -> ExchangeError:
+    if status_code == requests.codes.UNAUTHORIZED:
+        return AuthenticationError(http_error)
+    if status_code == requests.codes.FORBIDDEN:
+        return AuthorizationError(http_error)
+    if status_code == requests.codes.NOT_FOUND:
+        return NotFoundError(http_error)
+    if status_code == requests.codes.TOO_MANY_REQUESTS:
+        return RateLimitExceeded(http_error)
+    if status_code == requests.codes.BAD_REQUEST:
+        try:
+            reason = read_json()["detail"]
+        except (ValueError, KeyError, TypeError):
+            reason = http_error
+        return ValidationError(reason)
+    if status_code == requests.codes.UNPROCESSABLE:
+        try:
+            reason = ", ".join(err["msg"] for err in read_json()["detail"])
+        except (ValueError, KeyError, TypeError):
+            reason = http_error
+        return ValidationError(reason)
+
+    return ExchangeError(http_error)
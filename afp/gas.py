@@ -0,0 +1,148 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Any, cast
+
+from eth_typing.evm import ChecksumAddress
+from web3 import Web3
+from web3.contract.contract import ContractFunction
+from web3.exceptions import Web3RPCError
+from web3.providers.base import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse, TxParams
+
+from . import constants
+
+
+class FeeOracle:
+    """Cache of the gas parameters of the transactions sent to a node.
+
+    The base fee of the latest block and the node's suggested priority fee are
+    requested together in one JSON-RPC batch, at most once per `ttl`, which should not
+    exceed the block time.
+
+    Gas estimates are memoized per contract function and the lengths of its array
+    arguments, and multiplied by `gas_multiplier` to absorb variations of the gas used
+    with the other arguments and the contract state.
+
+    Parameters
+    ----------
+    w3 : web3.Web3
+    ttl : datetime.timedelta, optional
+        The time after which the fees are requested again.
+    gas_multiplier : float, optional
+        The safety margin applied to gas estimates.
+    """
+
+    ttl: timedelta
+    gas_multiplier: float
+    _w3: Web3
+    _lock: threading.Lock
+    _fees: tuple[int, int] | None
+    _fetched_at: float
+    _gas: dict[tuple[Any, ...], int]
+
+    def __init__(
+        self,
+        w3: Web3,
+        ttl: timedelta = constants.GAS_FEE_CACHE_TTL,
+        gas_multiplier: float = constants.GAS_ESTIMATE_MULTIPLIER,
+    ):
+        self.ttl = ttl
+        self.gas_multiplier = gas_multiplier
+        self._w3 = w3
+        self._lock = threading.Lock()
+        self._fees = None
+        self._fetched_at = 0.0
+        self._gas = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(fees={self._fees}, estimates={len(self._gas)})"
+        )
+
+    def fees(self) -> tuple[int, int]:
+        """Returns the base fee per gas of the latest block and the suggested
+        priority fee per gas.
+
+        Returns
+        -------
+        int
+            Base fee per gas in wei.
+        int
+            Max priority fee per gas in wei.
+        """
+        with self._lock:
+            if (
+                self._fees is None
+                or time.monotonic() - self._fetched_at >= self.ttl.total_seconds()
+            ):
+                self._fees = self._fetch_fees()
+                self._fetched_at = time.monotonic()
+            return self._fees
+
+    def gas(self, func: ContractFunction, sender: ChecksumAddress) -> int:
+        """Returns the gas limit of a contract function call, estimating it only the
+        first time the function is called with arrays of the same lengths.
+
+        Parameters
+        ----------
+        func : web3.contract.contract.ContractFunction
+        sender : eth_typing.evm.ChecksumAddress
+
+        Returns
+        -------
+        int
+        """
+        key = _gas_key(func)
+        with self._lock:
+            gas = self._gas.get(key)
+        if gas is None:
+            # Estimate without holding the lock so as not to block the other threads
+            estimate = func.estimate_gas(cast(TxParams, {"from": sender}))
+            gas = int(estimate * self.gas_multiplier)
+            with self._lock:
+                self._gas[key] = gas
+        return gas
+
+    def forget(self, func: ContractFunction) -> None:
+        """Discards the gas estimate of a contract function call, e.g. after a
+        transaction has run out of gas.
+
+        Parameters
+        ----------
+        func : web3.contract.contract.ContractFunction
+        """
+        key = _gas_key(func)
+        with self._lock:
+            self._gas.pop(key, None)
+
+    def _fetch_fees(self) -> tuple[int, int]:
+        provider = cast(JSONBaseProvider, self._w3.provider)
+        responses = provider.make_batch_request(
+            [
+                (RPCEndpoint("eth_getBlockByNumber"), ["latest", False]),
+                (RPCEndpoint("eth_maxPriorityFeePerGas"), []),
+            ]
+        )
+        if not isinstance(responses, list):
+            raise Web3RPCError(str(responses.get("error")), rpc_response=responses)
+        block, priority_fee = (_result(response) for response in responses)
+        return int(block["baseFeePerGas"], 16), int(priority_fee, 16)
+
+
+def _gas_key(func: ContractFunction) -> tuple[Any, ...]:
+    return (
+        func.address,
+        func.selector,
+        *(
+            len(cast(list[Any], arg))
+            for arg in func.args
+            if isinstance(arg, (list, tuple))
+        ),
+    )
+
+
+def _result(response: RPCResponse) -> Any:
+    if "error" in response:
+        raise Web3RPCError(str(response["error"]), rpc_response=response)
+    return response.get("result")
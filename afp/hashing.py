@@ -1,20 +1,41 @@
-from typing import Any, cast
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, cast
 
 from eth_abi.packed import encode_packed
 from eth_typing.evm import ChecksumAddress
+from eth_hash.auto import keccak
 from hexbytes import HexBytes
 from web3 import Web3
+from web3.constants import CHECKSUM_ADDRESSS_ZERO
 
-from . import constants
+from . import constants, validators
 from .bindings import Side as OnChainSide
 from .schemas import IntentData, OrderSide
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 ORDER_SIDE_MAPPING: dict[OrderSide, int] = {
     OrderSide.BID: OnChainSide.BID.value,
     OrderSide.ASK: OnChainSide.ASK.value,
 }
 
+_INTENT_TYPES = [
+    "address",  # margin_account_id
+    "address",  # intent_account_id
+    "uint256",  # nonce
+    "address",  # trading_protocol_id
+    "bytes32",  # product_id
+    "int256",  # limit_price
+    "uint256",  # quantity
+    "uint32",  # max_trading_fee_rate
+    "uint256",  # good_until_time
+    "uint8",  # side
+    "address",  # referral
+]
+
 
 def generate_intent_hash(
     intent_data: IntentData,
@@ -22,19 +43,6 @@ def generate_intent_hash(
     intent_account_id: ChecksumAddress,
     tick_size: int,
 ) -> HexBytes:
-    types = [
-        "address",  # margin_account_id
-        "address",  # intent_account_id
-        "uint256",  # nonce
-        "address",  # trading_protocol_id
-        "bytes32",  # product_id
-        "int256",  # limit_price
-        "uint256",  # quantity
-        "uint32",  # max_trading_fee_rate
-        "uint256",  # good_until_time
-        "uint8",  # side
-        "address",  # referral
-    ]
     values: list[Any] = [
         margin_account_id,
         intent_account_id,
@@ -48,7 +56,229 @@ def generate_intent_hash(
         ORDER_SIDE_MAPPING[intent_data.side],
         cast(ChecksumAddress, intent_data.referral),
     ]
-    return Web3.keccak(encode_packed(types, values))
+    return Web3.keccak(encode_packed(_INTENT_TYPES, values))
+
+
+class IntentHasher:
+    """Generates intent hashes for a fixed margin account, intent account, trading
+    protocol and product.
+
+    Produces the same hashes as `generate_intent_hash()`, but the packed encoding of
+    the fixed fields is computed once, and only the fields that vary between intents
+    are encoded into a copy of it for each intent.
+
+    Parameters
+    ----------
+    margin_account_id : str
+    intent_account_id : str
+    trading_protocol_id : str
+    product_id : str
+    tick_size : int
+    """
+
+    # Offsets of the fields in the packed encoding
+    _NONCE = slice(40, 72)
+    _LIMIT_PRICE = slice(124, 156)
+    _QUANTITY = slice(156, 188)
+    _MAX_TRADING_FEE_RATE = slice(188, 192)
+    _GOOD_UNTIL_TIME = slice(192, 224)
+    _SIDE = 224
+    _REFERRAL = slice(225, 245)
+
+    __slots__ = (
+        "_template",
+        "_trading_protocol_id",
+        "_product_id",
+        "_price_multiplier",
+        "_referral",
+    )
+
+    _template: bytes
+    _trading_protocol_id: str
+    _product_id: str
+    _price_multiplier: int
+    # The last referral address and its encoding
+    _referral: tuple[str, bytes]
+
+    def __init__(
+        self,
+        margin_account_id: ChecksumAddress,
+        intent_account_id: ChecksumAddress,
+        trading_protocol_id: str,
+        product_id: str,
+        tick_size: int,
+    ):
+        self._template = encode_packed(
+            _INTENT_TYPES,
+            [
+                margin_account_id,
+                intent_account_id,
+                0,
+                cast(ChecksumAddress, trading_protocol_id),
+                HexBytes(product_id),
+                0,
+                0,
+                0,
+                0,
+                0,
+                CHECKSUM_ADDRESSS_ZERO,
+            ],
+        )
+        self._trading_protocol_id = trading_protocol_id.lower()
+        self._product_id = product_id.lower()
+        self._price_multiplier = 10**tick_size
+        self._referral = (CHECKSUM_ADDRESSS_ZERO, bytes(20))
+
+    def hash(self, intent_data: IntentData) -> HexBytes:
+        """Generates the hash of an intent.
+
+        Parameters
+        ----------
+        intent_data : afp.schemas.IntentData
+
+        Returns
+        -------
+        hexbytes.HexBytes
+
+        Raises
+        ------
+        ValueError
+            If the intent belongs to another trading protocol or product.
+        OverflowError
+            If a field does not fit into its Solidity type.
+        """
+        if (
+            intent_data.product_id.lower() != self._product_id
+            or intent_data.trading_protocol_id.lower() != self._trading_protocol_id
+        ):
+            raise ValueError(
+                "Intent data does not match the product and trading protocol of the "
+                "hasher"
+            )
+        buffer = bytearray(self._template)
+        buffer[self._NONCE] = intent_data.nonce.to_bytes(32)
+        buffer[self._LIMIT_PRICE] = int(
+            intent_data.limit_price * self._price_multiplier
+        ).to_bytes(32, signed=True)
+        buffer[self._QUANTITY] = intent_data.quantity.to_bytes(32)
+        buffer[self._MAX_TRADING_FEE_RATE] = int(
+            intent_data.max_trading_fee_rate * constants.FEE_RATE_MULTIPLIER
+        ).to_bytes(4)
+        buffer[self._GOOD_UNTIL_TIME] = int(
+            intent_data.good_until_time.timestamp()
+        ).to_bytes(32)
+        buffer[self._SIDE] = ORDER_SIDE_MAPPING[intent_data.side]
+        buffer[self._REFERRAL] = self._encode_referral(intent_data.referral)
+        return HexBytes(keccak(bytes(buffer)))
+
+    def hash_batch(
+        self,
+        nonces: "npt.ArrayLike",
+        limit_prices: "npt.ArrayLike",
+        quantities: "npt.ArrayLike",
+        *,
+        side: OrderSide,
+        max_trading_fee_rate: Decimal,
+        good_until_time: datetime,
+        referral: str = CHECKSUM_ADDRESSS_ZERO,
+    ) -> "npt.NDArray[np.uint8]":
+        """Generates the hashes of intents that only differ in nonce, limit price and
+        quantity.
+
+        The intents are packed into a single buffer with vectorized NumPy operations,
+        which is then hashed in a tight loop. Requires NumPy; see the `numpy` extra.
+
+        Parameters
+        ----------
+        nonces : array_like of int
+        limit_prices : array_like of int
+            Limit prices as fixed-point integers in ticks of the product, e.g. as
+            converted by `afp.columnar.to_ticks()`.
+        quantities : array_like of int
+        side : afp.enums.OrderSide
+        max_trading_fee_rate : decimal.Decimal
+        good_until_time : datetime.datetime
+        referral : str, optional
+            Defaults to the zero address.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape `(n, 32)` with one hash per row. The arguments are broadcast
+            against each other, e.g. a single quantity can be used for all intents.
+
+        Raises
+        ------
+        ValueError
+            If a nonce or quantity is negative or the referral is not a valid address.
+        OverflowError
+            If a shared field does not fit into its Solidity type.
+        """
+        try:
+            import numpy as np
+        except ImportError as import_error:
+            raise ImportError(
+                "Batch hashing requires NumPy, install it with "
+                "'pip install afp-sdk[numpy]'"
+            ) from import_error
+
+        def to_big_endian(
+            values: "npt.NDArray[np.int64]",
+        ) -> "npt.NDArray[np.uint8]":
+            return values.astype(">i8").view(np.uint8).reshape(-1, 8)
+
+        nonce_array, price_array, quantity_array = np.broadcast_arrays(
+            *(
+                np.asarray(values, dtype=np.int64)
+                for values in (nonces, limit_prices, quantities)
+            )
+        )
+        if nonce_array.ndim != 1:
+            raise ValueError(
+                "Nonces, limit prices and quantities must be 1-dimensional"
+            )
+        if (nonce_array < 0).any() or (quantity_array < 0).any():
+            raise ValueError("Nonces and quantities must not be negative")
+
+        template = bytearray(self._template)
+        template[self._MAX_TRADING_FEE_RATE] = int(
+            max_trading_fee_rate * constants.FEE_RATE_MULTIPLIER
+        ).to_bytes(4)
+        template[self._GOOD_UNTIL_TIME] = int(good_until_time.timestamp()).to_bytes(32)
+        template[self._SIDE] = ORDER_SIDE_MAPPING[side]
+        template[self._REFERRAL] = self._encode_referral(referral)
+
+        size = len(template)
+        count = len(nonce_array)
+        buffer = np.empty((count, size), dtype=np.uint8)
+        buffer[:] = np.frombuffer(template, dtype=np.uint8)
+        # 64-bit values occupy the last 8 bytes of the 32-byte words; negative prices
+        # are sign-extended into the leading bytes
+        buffer[:, self._NONCE.stop - 8 : self._NONCE.stop] = to_big_endian(nonce_array)
+        buffer[:, self._LIMIT_PRICE.start : self._LIMIT_PRICE.stop - 8] = np.where(
+            price_array < 0, 0xFF, 0
+        )[:, np.newaxis]
+        buffer[:, self._LIMIT_PRICE.stop - 8 : self._LIMIT_PRICE.stop] = to_big_endian(
+            price_array
+        )
+        buffer[:, self._QUANTITY.stop - 8 : self._QUANTITY.stop] = to_big_endian(
+            quantity_array
+        )
+
+        data = buffer.tobytes()
+        digests = b"".join(
+            keccak(data[offset : offset + size])
+            for offset in range(0, count * size, size)
+        )
+        return np.frombuffer(digests, dtype=np.uint8).reshape(count, 32)
+
+    def _encode_referral(self, referral: str) -> bytes:
+        cached_referral, encoded_referral = self._referral
+        if referral != cached_referral:
+            encoded_referral = bytes(HexBytes(validators.validate_address(referral)))
+            assert len(encoded_referral) == 20
+            self._referral = (referral, encoded_referral)
+        return encoded_referral
 
 
 def generate_order_cancellation_hash(nonce: int, intent_hash: str) -> HexBytes:
@@ -0,0 +1,230 @@
+import sqlite3
+from datetime import datetime
+from os import PathLike
+from typing import TYPE_CHECKING, Iterable
+
+from .enums import TradeState
+from .schemas import OrderFill
+from .types import ensure_py_datetime, ensure_timestamp
+
+if TYPE_CHECKING:
+    from .api.trading import Trading
+
+
+SCHEMA_VERSION = 1
+COMMIT_INTERVAL = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS order_fills (
+    order_id TEXT NOT NULL,
+    trade_id TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    intent_hash TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (order_id, trade_id)
+);
+CREATE INDEX IF NOT EXISTS order_fills_product ON order_fills (product_id, timestamp);
+CREATE INDEX IF NOT EXISTS order_fills_intent ON order_fills (intent_hash, timestamp);
+CREATE INDEX IF NOT EXISTS order_fills_timestamp ON order_fills (timestamp);
+CREATE INDEX IF NOT EXISTS order_fills_state ON order_fills (state, timestamp);
+"""
+
+# Order fills move from PENDING to a final state but never back, so an update is
+# only applied if it does not regress the stored state
+_UPSERT = """
+INSERT INTO order_fills
+    (order_id, trade_id, product_id, intent_hash, timestamp, state, data)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (order_id, trade_id) DO UPDATE SET
+    timestamp = excluded.timestamp,
+    state = excluded.state,
+    data = excluded.data
+WHERE order_fills.state = 'PENDING' AND excluded.state != 'PENDING'
+"""
+
+
+class Journal:
+    """Persistent local copy of the authenticated account's order fills.
+
+    Order fills are stored in an SQLite database keyed by order ID and trade ID, and
+    indexed by product, intent hash and trade time. `sync()` only requests the order
+    fills that may have been added or changed since the last synchronization, i.e.
+    those after the earliest trade that is still pending.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Path of the database file, which is created if it does not exist. `:memory:`
+        creates a temporary in-memory journal.
+
+    Examples
+    --------
+    >>> with Journal("fills.db") as journal:
+    ...     journal.sync(trading)
+    ...     order_fills = journal.order_fills(product_id=product_id)
+    """
+
+    _connection: sqlite3.Connection
+
+    def __init__(self, path: str | PathLike[str]):
+        self._connection = sqlite3.connect(path)
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version not in (0, SCHEMA_VERSION):
+            self._connection.close()
+            raise ValueError(
+                f"Journal schema version {version} is not supported, "
+                f"expected version {SCHEMA_VERSION}"
+            )
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM order_fills"
+        ).fetchone()
+        return count
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+    @property
+    def cursor(self) -> datetime | None:
+        """The time from which order fills have to be retrieved in the next
+        synchronization, or `None` if the journal is empty."""
+        (timestamp,) = self._connection.execute(
+            """
+            SELECT COALESCE(
+                (SELECT MIN(timestamp) FROM order_fills WHERE state = 'PENDING'),
+                (SELECT MAX(timestamp) FROM order_fills)
+            )
+            """
+        ).fetchone()
+        return None if timestamp is None else ensure_py_datetime(timestamp)
+
+    def sync(self, trading: "Trading") -> int:
+        """Retrieves the order fills that have been added or changed since the last
+        synchronization from the exchange.
+
+        Changes are committed in batches, so an interrupted synchronization is resumed
+        from where it stopped.
+
+        Parameters
+        ----------
+        trading : afp.api.trading.Trading
+
+        Returns
+        -------
+        int
+            The number of order fills that have been added or changed.
+        """
+        return self.add(trading.iter_all_order_fills(start=self.cursor))
+
+    def add(self, order_fills: Iterable[OrderFill]) -> int:
+        """Adds order fills to the journal, or updates the state of order fills that
+        have already been recorded as pending.
+
+        Parameters
+        ----------
+        order_fills : iterable of afp.schemas.OrderFill
+
+        Returns
+        -------
+        int
+            The number of order fills that have been added or changed.
+        """
+        changes = self._connection.total_changes
+        rows: list[tuple[str, str, str, str, int, str, str]] = []
+        for order_fill in order_fills:
+            rows.append(
+                (
+                    order_fill.order.id,
+                    order_fill.trade.id,
+                    order_fill.trade.product_id,
+                    order_fill.order.intent.hash,
+                    ensure_timestamp(order_fill.trade.timestamp),
+                    order_fill.trade.state.value,
+                    order_fill.model_dump_json(),
+                )
+            )
+            if len(rows) == COMMIT_INTERVAL:
+                self._write(rows)
+                rows = []
+        self._write(rows)
+        return self._connection.total_changes - changes
+
+    def order_fills(
+        self,
+        *,
+        product_id: str | None = None,
+        intent_hash: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        trade_states: Iterable[str] = (),
+        newest_first: bool = True,
+        limit: int | None = None,
+    ) -> list[OrderFill]:
+        """Retrieves the recorded order fills that match the given parameters.
+
+        Parameters
+        ----------
+        product_id : str, optional
+        intent_hash : str, optional
+        start : datetime.datetime, optional
+        end : datetime.datetime, optional
+        trade_states : iterable of str
+            Any of `PENDING`, `CLEARED` and `REJECTED`.
+        newest_first : bool, optional
+            Whether to sort order fills in descending or ascending order by trade time.
+        limit : int, optional
+            The maximum number of order fills.
+
+        Returns
+        -------
+        list of afp.schemas.OrderFill
+        """
+        conditions: list[str] = []
+        parameters: list[str | int] = []
+        if product_id is not None:
+            conditions.append("product_id = ?")
+            parameters.append(product_id)
+        if intent_hash is not None:
+            conditions.append("intent_hash = ?")
+            parameters.append(intent_hash)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            parameters.append(ensure_timestamp(start))
+        if end is not None:
+            conditions.append("timestamp <= ?")
+            parameters.append(ensure_timestamp(end))
+        states = [TradeState(state.upper()).value for state in trade_states]
+        if states:
+            conditions.append(f"state IN ({', '.join('?' * len(states))})")
+            parameters.extend(states)
+
+        query = "SELECT data FROM order_fills"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        order = "DESC" if newest_first else "ASC"
+        query += f" ORDER BY timestamp {order}, rowid {order}"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        return [
+            OrderFill.model_validate_json(data)
+            for (data,) in self._connection.execute(query, parameters)
+        ]
+
+    def _write(self, rows: list[tuple[str, str, str, str, int, str, str]]) -> None:
+        with self._connection:
+            self._connection.executemany(_UPSERT, rows)
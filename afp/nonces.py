@@ -0,0 +1,288 @@
+import heapq
+import secrets
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from os import PathLike
+from typing import Any, Callable, Self
+
+from . import constants
+
+# Nonces are stored by the exchange as Postgres integers
+NONCE_LIMIT = 2**31
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nonce_leases (
+    key TEXT PRIMARY KEY,
+    next INTEGER NOT NULL
+)
+"""
+
+
+class NonceAllocator(ABC):
+    """Strategy for allocating the nonces of intents and cancellations.
+
+    Nonces must be unique per intent account, so processes that share an intent
+    account must allocate nonces from disjoint ranges, e.g. with
+    `RangeNonceAllocator.for_process()` or a shared `LeasedNonceAllocator`.
+    """
+
+    @abstractmethod
+    def allocate(self) -> int:
+        """Returns the next nonce."""
+
+
+class RandomNonceAllocator(NonceAllocator):
+    """Allocates random nonces.
+
+    Collisions are unlikely but not impossible.
+    """
+
+    def allocate(self) -> int:
+        return secrets.randbelow(NONCE_LIMIT)
+
+
+class RangeNonceAllocator(NonceAllocator):
+    """Allocates consecutive nonces from a range.
+
+    The allocator does not remember the nonces it has allocated, so an allocator
+    that is created again, e.g. after the process has restarted, must start after
+    the last nonce allocated by the previous one, as recorded from `next`. Use
+    `LeasedNonceAllocator` to keep track of allocated nonces across restarts
+    automatically.
+
+    Parameters
+    ----------
+    start : int
+        The first nonce.
+    stop : int, optional
+        The end of the range, exclusive.
+
+    Raises
+    ------
+    ValueError
+        If the range is empty or exceeds the nonce range of the exchange.
+    """
+
+    _lock: threading.Lock
+    _next: int
+    _stop: int
+
+    def __init__(self, start: int, stop: int = NONCE_LIMIT):
+        if not 0 <= start < stop <= NONCE_LIMIT:
+            raise ValueError(
+                f"Nonce range must satisfy 0 <= start < stop <= {NONCE_LIMIT}"
+            )
+        self._lock = threading.Lock()
+        self._next = start
+        self._stop = stop
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(next={self._next}, stop={self._stop})"
+
+    @property
+    def next(self) -> int:
+        """The next nonce to be allocated."""
+        return self._next
+
+    @classmethod
+    def for_process(cls, index: int, count: int, offset: int) -> Self:
+        """Creates an allocator for one of `count` processes sharing an intent
+        account, which allocates nonces from the `index`-th of `count` equal ranges.
+
+        The range is not restarted from its beginning when the process restarts, as
+        that would allocate the nonces of the previous run again; instead `offset`
+        nonces at the beginning of the range are skipped.
+
+        Parameters
+        ----------
+        index : int
+            The 0-based index of the process.
+        count : int
+            The number of processes.
+        offset : int
+            The number of nonces of the range allocated by previous runs of the
+            process, i.e. `next` of the previous allocator minus the start of the
+            range, or 0 on the first run.
+
+        Returns
+        -------
+        afp.nonces.RangeNonceAllocator
+
+        Raises
+        ------
+        ValueError
+            If the process index is invalid or the offset exceeds the range.
+        """
+        if not 0 <= index < count:
+            raise ValueError("Process index must satisfy 0 <= index < count")
+        size = NONCE_LIMIT // count
+        if not 0 <= offset < size:
+            raise ValueError(f"Offset must satisfy 0 <= offset < {size}")
+        return cls(index * size + offset, (index + 1) * size)
+
+    def allocate(self) -> int:
+        with self._lock:
+            if self._next == self._stop:
+                raise RuntimeError("Nonce range is exhausted")
+            nonce = self._next
+            self._next += 1
+        return nonce
+
+
+class LeasedNonceAllocator(NonceAllocator):
+    """Allocates consecutive nonces from leases that are recorded in an SQLite
+    database shared by the processes of an intent account.
+
+    Each lease reserves `lease_size` nonces for this allocator, so the database is
+    only accessed once per lease. Nonces of a lease that are not used before the
+    allocator is closed are skipped.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Path of the database file, which is created if it does not exist.
+    key : str, optional
+        The name of the nonce sequence, e.g. the intent account's address.
+    lease_size : int, optional
+        The number of nonces reserved at once.
+
+    Examples
+    --------
+    >>> with LeasedNonceAllocator("nonces.db", key=address) as nonces:
+    ...     trading = app.Trading(nonce_allocator=nonces)
+    """
+
+    key: str
+    lease_size: int
+    _connection: sqlite3.Connection
+    _lock: threading.Lock
+    _next: int
+    _stop: int
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        key: str = "default",
+        lease_size: int = constants.NONCE_LEASE_SIZE,
+    ):
+        if lease_size <= 0:
+            raise ValueError("Lease size must be positive")
+        self.key = key
+        self.lease_size = lease_size
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self._next = self._stop = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(key={self.key}, next={self._next}, "
+            f"stop={self._stop})"
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+    def allocate(self) -> int:
+        with self._lock:
+            if self._next == self._stop:
+                self._lease()
+            nonce = self._next
+            self._next += 1
+        return nonce
+
+    def _lease(self) -> None:
+        # An immediate transaction takes the write lock before reading, so that
+        # concurrent processes cannot lease the same range
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._connection.execute(
+                "SELECT next FROM nonce_leases WHERE key = ?", (self.key,)
+            ).fetchone()
+            start = 0 if row is None else row[0]
+            stop = min(start + self.lease_size, NONCE_LIMIT)
+            if start >= stop:
+                raise RuntimeError("Nonce range is exhausted")
+            self._connection.execute(
+                "INSERT INTO nonce_leases (key, next) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET next = excluded.next",
+                (self.key, stop),
+            )
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+        self._next, self._stop = start, stop
+
+
+class TransactionNonceManager:
+    """Thread-safe local counter of the transaction nonces of a blockchain account.
+
+    The counter is seeded from the account's pending transaction count on first use
+    and then incremented locally, so that concurrent transactions of the account are
+    assigned consecutive nonces without querying the node for each of them. Nonces
+    of transactions that have not been sent are released and allocated again first,
+    so that they do not leave a gap in the sequence.
+
+    Parameters
+    ----------
+    get_transaction_count : callable
+        Function that returns the account's pending transaction count.
+    """
+
+    _get_transaction_count: Callable[[], int]
+    _lock: threading.Lock
+    _next: int | None
+    _released: list[int]
+
+    def __init__(self, get_transaction_count: Callable[[], int]):
+        self._get_transaction_count = get_transaction_count
+        self._lock = threading.Lock()
+        self._next = None
+        self._released = []
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(next={self._next})"
+
+    def allocate(self) -> int:
+        """Returns the next transaction nonce."""
+        with self._lock:
+            if self._released:
+                return heapq.heappop(self._released)
+            if self._next is None:
+                self._next = self._get_transaction_count()
+            nonce = self._next
+            self._next += 1
+        return nonce
+
+    def release(self, nonce: int) -> None:
+        """Returns a nonce whose transaction has not been sent, e.g. because it
+        could not be built, so that it is allocated again.
+
+        Parameters
+        ----------
+        nonce : int
+        """
+        with self._lock:
+            if self._next is not None and nonce < self._next:
+                heapq.heappush(self._released, nonce)
+
+    def reset(self) -> None:
+        """Resynchronizes the counter with the node on the next allocation, e.g.
+        after the node has rejected a nonce that has been used by another client.
+
+        Nonces that have been allocated but not yet sent by other threads may be
+        allocated again, so the counter should only be reset on nonce errors."""
+        with self._lock:
+            self._next = None
+            self._released.clear()
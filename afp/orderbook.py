@@ -0,0 +1,325 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import accumulate, islice
+from typing import Generator, Iterable, Iterator
+
+from .enums import OrderSide
+from .records import LazyRecord
+from .schemas import MarketDepthData, MarketDepthItem
+
+
+@dataclass(frozen=True, slots=True)
+class PriceLevel:
+    price: Decimal
+    quantity: int
+
+
+@dataclass(frozen=True, slots=True)
+class LevelChange:
+    side: OrderSide
+    price: Decimal
+    quantity: int
+    previous_quantity: int
+
+
+class OrderBook:
+    """Local copy of the order book of a product maintained from market depth data.
+
+    Each side of the book is kept in sorted arrays that are updated in place with the
+    differences between successive market depth snapshots, so that the best price is
+    available in constant time and price levels can be looked up in logarithmic time.
+
+    In the query methods `side` refers to the side of the book, e.g. the cost of
+    buying a given quantity is found on the `ASK` side.
+
+    Parameters
+    ----------
+    product_id : str, optional
+        If specified then market depth data of other products is rejected.
+
+    Examples
+    --------
+    >>> book = OrderBook(product_id)
+    >>> for changes in book.consume(trading.iter_market_depth(product_id)):
+    ...     print(book.best_bid, book.best_ask, changes)
+    """
+
+    product_id: str | None
+    _bids: "_BookSide"
+    _asks: "_BookSide"
+
+    def __init__(self, product_id: str | None = None):
+        self.product_id = product_id
+        self._bids = _BookSide(OrderSide.BID)
+        self._asks = _BookSide(OrderSide.ASK)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(product_id={self.product_id}, "
+            f"best_bid={self.best_bid}, best_ask={self.best_ask})"
+        )
+
+    def apply(
+        self, market_depth: MarketDepthData | LazyRecord[MarketDepthData]
+    ) -> list[LevelChange]:
+        """Updates the order book to the given market depth snapshot.
+
+        Parameters
+        ----------
+        market_depth : afp.schemas.MarketDepthData or afp.records.LazyRecord
+
+        Returns
+        -------
+        list of afp.orderbook.LevelChange
+            The price levels that have been added, removed (with zero quantity) or
+            changed, bids first.
+
+        Raises
+        ------
+        ValueError
+            If the market depth data belongs to another product.
+        """
+        if self.product_id is None:
+            self.product_id = market_depth.product_id
+        elif market_depth.product_id != self.product_id:
+            raise ValueError(
+                f"Market depth of product {market_depth.product_id} does not belong "
+                f"to order book of product {self.product_id}"
+            )
+        return self._bids.update(market_depth.bids) + self._asks.update(
+            market_depth.asks
+        )
+
+    def consume(
+        self,
+        market_depth_stream: Iterable[MarketDepthData | LazyRecord[MarketDepthData]],
+    ) -> Generator[list[LevelChange], None, None]:
+        """Applies market depth snapshots as they arrive, e.g. from
+        `Trading.iter_market_depth()`, and yields the changes of each update.
+
+        Parameters
+        ----------
+        market_depth_stream : iterable of afp.schemas.MarketDepthData or afp.records.LazyRecord
+
+        Yields
+        ------
+        list of afp.orderbook.LevelChange
+        """
+        for market_depth in market_depth_stream:
+            yield self.apply(market_depth)
+
+    @property
+    def best_bid(self) -> PriceLevel | None:
+        return self._bids.best()
+
+    @property
+    def best_ask(self) -> PriceLevel | None:
+        return self._asks.best()
+
+    @property
+    def spread(self) -> Decimal | None:
+        best_bid, best_ask = self.best_bid, self.best_ask
+        if best_bid is None or best_ask is None:
+            return None
+        return best_ask.price - best_bid.price
+
+    @property
+    def mid_price(self) -> Decimal | None:
+        best_bid, best_ask = self.best_bid, self.best_ask
+        if best_bid is None or best_ask is None:
+            return None
+        return (best_bid.price + best_ask.price) / 2
+
+    def levels(self, side: OrderSide, depth: int | None = None) -> list[PriceLevel]:
+        """Returns the price levels of one side of the book from the best price.
+
+        Parameters
+        ----------
+        side : afp.enums.OrderSide
+        depth : int, optional
+            The maximum number of price levels. Defaults to all price levels.
+
+        Returns
+        -------
+        list of afp.orderbook.PriceLevel
+        """
+        return list(islice(self._side(side), depth))
+
+    def quantity_at(self, side: OrderSide, price: Decimal) -> int:
+        """Returns the quantity offered at the given price, or 0 if there is no such
+        price level.
+
+        Parameters
+        ----------
+        side : afp.enums.OrderSide
+        price : Decimal
+
+        Returns
+        -------
+        int
+        """
+        return self._side(side).quantity_at(price)
+
+    def quantity_within(self, side: OrderSide, limit_price: Decimal) -> int:
+        """Returns the total quantity offered at the limit price or better.
+
+        Parameters
+        ----------
+        side : afp.enums.OrderSide
+        limit_price : Decimal
+
+        Returns
+        -------
+        int
+        """
+        return self._side(side).quantity_within(limit_price)
+
+    def depth_to_quantity(self, side: OrderSide, quantity: int) -> Decimal | None:
+        """Returns the worst price that has to be reached to fill the given quantity.
+
+        Parameters
+        ----------
+        side : afp.enums.OrderSide
+        quantity : int
+
+        Returns
+        -------
+        Decimal or None
+            `None` if the book does not have enough liquidity.
+
+        Raises
+        ------
+        ValueError
+            If the quantity is not positive.
+        """
+        return self._side(side).depth_to_quantity(quantity)
+
+    def vwap(self, side: OrderSide, quantity: int) -> Decimal | None:
+        """Returns the volume-weighted average price of filling the given quantity.
+
+        Parameters
+        ----------
+        side : afp.enums.OrderSide
+        quantity : int
+
+        Returns
+        -------
+        Decimal or None
+            `None` if the book does not have enough liquidity.
+
+        Raises
+        ------
+        ValueError
+            If the quantity is not positive.
+        """
+        return self._side(side).vwap(quantity)
+
+    def _side(self, side: OrderSide) -> "_BookSide":
+        return self._bids if side == OrderSide.BID else self._asks
+
+
+class _BookSide:
+    """Price levels of one side of the book in parallel arrays sorted from the best
+    price. Bid prices are stored negated so that both sides sort in ascending order."""
+
+    _side: OrderSide
+    _sign: int
+    _keys: list[Decimal]
+    _quantities: list[int]
+    _levels: dict[Decimal, int]
+    # Prefix sums of quantity and notional, computed on demand after each update
+    _cumulative_quantities: list[int] | None
+    _cumulative_notionals: list[Decimal] | None
+
+    def __init__(self, side: OrderSide):
+        self._side = side
+        self._sign = -1 if side == OrderSide.BID else 1
+        self._keys = []
+        self._quantities = []
+        self._levels = {}
+        self._cumulative_quantities = None
+        self._cumulative_notionals = None
+
+    def __iter__(self) -> Iterator[PriceLevel]:
+        for key, quantity in zip(self._keys, self._quantities):
+            yield PriceLevel(key * self._sign, quantity)
+
+    def best(self) -> PriceLevel | None:
+        if not self._keys:
+            return None
+        return PriceLevel(self._keys[0] * self._sign, self._quantities[0])
+
+    def quantity_at(self, price: Decimal) -> int:
+        key = price * self._sign
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._quantities[i]
+        return 0
+
+    def quantity_within(self, limit_price: Decimal) -> int:
+        i = bisect_right(self._keys, limit_price * self._sign)
+        return self._cumulative()[0][i - 1] if i else 0
+
+    def depth_to_quantity(self, quantity: int) -> Decimal | None:
+        i = self._fill_index(quantity)
+        return None if i is None else self._keys[i] * self._sign
+
+    def vwap(self, quantity: int) -> Decimal | None:
+        i = self._fill_index(quantity)
+        if i is None:
+            return None
+        cumulative_quantities, cumulative_notionals = self._cumulative()
+        filled = cumulative_quantities[i - 1] if i else 0
+        notional = cumulative_notionals[i - 1] if i else Decimal(0)
+        notional += (quantity - filled) * self._keys[i] * self._sign
+        return notional / quantity
+
+    def update(self, items: list[MarketDepthItem]) -> list[LevelChange]:
+        snapshot = {item.price: item.quantity for item in items if item.quantity > 0}
+        changes = [
+            LevelChange(self._side, price, 0, quantity)
+            for price, quantity in self._levels.items()
+            if price not in snapshot
+        ]
+        changes.extend(
+            LevelChange(self._side, price, quantity, self._levels.get(price, 0))
+            for price, quantity in snapshot.items()
+            if self._levels.get(price) != quantity
+        )
+        if not changes:
+            return changes
+
+        for change in changes:
+            key = change.price * self._sign
+            i = bisect_left(self._keys, key)
+            if change.quantity == 0:
+                del self._keys[i]
+                del self._quantities[i]
+            elif change.previous_quantity:
+                self._quantities[i] = change.quantity
+            else:
+                self._keys.insert(i, key)
+                self._quantities.insert(i, change.quantity)
+        self._levels = snapshot
+        self._cumulative_quantities = None
+        self._cumulative_notionals = None
+        return changes
+
+    def _fill_index(self, quantity: int) -> int | None:
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        cumulative_quantities = self._cumulative()[0]
+        i = bisect_left(cumulative_quantities, quantity)
+        return i if i < len(cumulative_quantities) else None
+
+    def _cumulative(self) -> tuple[list[int], list[Decimal]]:
+        if self._cumulative_quantities is None or self._cumulative_notionals is None:
+            self._cumulative_quantities = list(accumulate(self._quantities))
+            self._cumulative_notionals = list(
+                accumulate(
+                    key * self._sign * quantity
+                    for key, quantity in zip(self._keys, self._quantities)
+                )
+            )
+        return self._cumulative_quantities, self._cumulative_notionals
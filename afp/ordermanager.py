@@ -0,0 +1,450 @@
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Generator, Iterable, Self
+
+from . import constants
+from .enums import OrderSide, OrderState, OrderType
+from .exceptions import ExchangeError
+from .records import LazyRecord
+from .schemas import Intent, Order, OrderFill
+
+if TYPE_CHECKING:
+    from .api.trading import Trading
+
+
+LIVE_ORDER_STATES = (
+    OrderState.RECEIVED,
+    OrderState.PENDING,
+    OrderState.OPEN,
+    OrderState.PARTIAL,
+)
+
+# Order states in the order in which they can occur
+_STATE_RANKS = {
+    OrderState.RECEIVED: 0,
+    OrderState.PENDING: 1,
+    OrderState.OPEN: 2,
+    OrderState.PARTIAL: 3,
+    OrderState.COMPLETED: 4,
+    OrderState.CANCELLED: 4,
+    OrderState.REJECTED: 4,
+}
+
+
+class OrderManager:
+    """Local model of the authenticated account's live limit orders.
+
+    Orders are recorded when they are submitted through the manager, and updated from
+    order responses, order fills (e.g. from `Trading.iter_order_fills()`) and periodic
+    reconciliation with the open orders on the exchange. Updates are applied in the
+    order of the lifecycle of an order, so a stale update never reverts a more recent
+    one. Orders are removed from the model when they reach a final state.
+
+    Live orders are indexed by intent hash, product, side and price level, so that
+    the resting quantity of a product, side or price level is available in constant
+    time. All methods are thread-safe.
+
+    Parameters
+    ----------
+    trading : afp.api.trading.Trading
+    product_id : str, optional
+        If specified then only orders of this product are managed.
+
+    Examples
+    --------
+    >>> manager = OrderManager(trading, product_id)
+    >>> manager.submit(trading.create_intent(...))
+    >>> manager.start_reconciliation(timedelta(seconds=30))
+    >>> for order_fill in manager.consume(trading.iter_order_fills(product_id)):
+    ...     print(manager.resting_quantity(product_id, OrderSide.BID))
+    """
+
+    product_id: str | None
+    _trading: "Trading"
+    _lock: threading.RLock
+    _orders: dict[str, Order]
+    _by_product: defaultdict[str, dict[str, Order]]
+    _quantities: defaultdict[tuple[str, OrderSide], int]
+    _levels: defaultdict[tuple[str, OrderSide], defaultdict[Decimal, int]]
+    _finished: OrderedDict[str, None]
+    _reconciliation: threading.Thread | None
+    _stopped: threading.Event
+    _reconciliation_error: ExchangeError | None
+
+    def __init__(self, trading: "Trading", product_id: str | None = None):
+        self.product_id = product_id
+        self._trading = trading
+        self._lock = threading.RLock()
+        self._orders = {}
+        self._by_product = defaultdict(dict)
+        self._quantities = defaultdict(int)
+        self._levels = defaultdict(lambda: defaultdict(int))
+        self._finished = OrderedDict()
+        self._reconciliation = None
+        self._stopped = threading.Event()
+        self._reconciliation_error = None
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(product_id={self.product_id}, "
+            f"live_orders={len(self)})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops the background reconciliation, if running."""
+        self._stopped.set()
+        if self._reconciliation is not None:
+            self._reconciliation.join()
+            self._reconciliation = None
+
+    # Submission
+
+    def submit(self, intent: Intent) -> Order:
+        """Submits a limit order and records it.
+
+        Parameters
+        ----------
+        intent : afp.schemas.Intent
+
+        Returns
+        -------
+        afp.schemas.Order
+        """
+        order = self._trading.submit_limit_order(intent)
+        self.apply(order)
+        return order
+
+    def submit_many(self, intents: Iterable[Intent]) -> list[Order | ExchangeError]:
+        """Submits multiple limit orders concurrently and records those that have been
+        accepted; see `Trading.submit_limit_orders()`.
+
+        Parameters
+        ----------
+        intents : iterable of afp.schemas.Intent
+
+        Returns
+        -------
+        list of afp.schemas.Order or afp.exceptions.ExchangeError
+        """
+        results = self._trading.submit_limit_orders(intents)
+        self.apply_all(result for result in results if isinstance(result, Order))
+        return results
+
+    def cancel_all(
+        self, product_id: str, side: OrderSide | None = None
+    ) -> dict[str, Order | ExchangeError]:
+        """Cancels the live orders of a product, as known locally, concurrently.
+
+        The orders remain in the model until their cancellation is confirmed by an
+        order update or reconciliation.
+
+        Parameters
+        ----------
+        product_id : str
+        side : afp.enums.OrderSide, optional
+            Defaults to both sides.
+
+        Returns
+        -------
+        dict of str to afp.schemas.Order or afp.exceptions.ExchangeError
+            The cancellation order or the error of the exchange by intent hash.
+        """
+        intent_hashes = self.intent_hashes(product_id, side)
+        results = self._trading.submit_cancel_orders(intent_hashes)
+        return dict(zip(intent_hashes, results))
+
+    # Updates
+
+    def apply(self, order: Order | LazyRecord[Order]) -> bool:
+        """Applies an order update.
+
+        Parameters
+        ----------
+        order : afp.schemas.Order or afp.records.LazyRecord
+
+        Returns
+        -------
+        bool
+            Whether the update has changed the model; `False` if the update is stale,
+            the order is not a limit order or it belongs to another product.
+        """
+        if isinstance(order, LazyRecord):
+            order = order.validate()
+        if order.type != OrderType.LIMIT_ORDER or (
+            self.product_id is not None
+            and order.intent.data.product_id != self.product_id
+        ):
+            return False
+
+        intent_hash = order.intent.hash
+        with self._lock:
+            if intent_hash in self._finished:
+                return False
+            current = self._orders.get(intent_hash)
+            if current is not None:
+                if (
+                    _STATE_RANKS[order.state] < _STATE_RANKS[current.state]
+                    or order.fill_quantity < current.fill_quantity
+                    or (
+                        order.state == current.state
+                        and order.fill_quantity == current.fill_quantity
+                    )
+                ):
+                    return False
+                self._remove(current)
+
+            if order.state in LIVE_ORDER_STATES:
+                self._add(order)
+            else:
+                self._finished[intent_hash] = None
+                if len(self._finished) > constants.ORDER_MANAGER_HISTORY_SIZE:
+                    self._finished.popitem(last=False)
+            return True
+
+    def apply_all(self, orders: Iterable[Order | LazyRecord[Order]]) -> int:
+        """Applies multiple order updates.
+
+        Parameters
+        ----------
+        orders : iterable of afp.schemas.Order or afp.records.LazyRecord
+
+        Returns
+        -------
+        int
+            The number of updates that have changed the model.
+        """
+        return sum(self.apply(order) for order in orders)
+
+    def apply_order_fill(self, order_fill: OrderFill | LazyRecord[OrderFill]) -> bool:
+        """Applies the order update of an order fill.
+
+        Parameters
+        ----------
+        order_fill : afp.schemas.OrderFill or afp.records.LazyRecord
+
+        Returns
+        -------
+        bool
+            Whether the update has changed the model.
+        """
+        return self.apply(order_fill.order)
+
+    def consume[F: OrderFill | LazyRecord[OrderFill]](
+        self, order_fill_stream: Iterable[F]
+    ) -> Generator[F, None, None]:
+        """Applies order fills as they arrive, e.g. from `Trading.iter_order_fills()`,
+        and yields them.
+
+        Parameters
+        ----------
+        order_fill_stream : iterable of afp.schemas.OrderFill or afp.records.LazyRecord
+
+        Yields
+        ------
+        afp.schemas.OrderFill or afp.records.LazyRecord
+        """
+        for order_fill in order_fill_stream:
+            self.apply_order_fill(order_fill)
+            yield order_fill
+
+    # Reconciliation
+
+    def reconcile(self) -> int:
+        """Synchronizes the model with the live orders on the exchange.
+
+        Orders that are live on the exchange are applied as updates. Orders that are
+        live locally but not on the exchange, and that were created before the
+        reconciliation started, are considered finished and removed.
+
+        Returns
+        -------
+        int
+            The number of orders that have been added, updated or removed.
+        """
+        started_at = datetime.now(UTC)
+        remote_orders = list(
+            self._trading.iter_all_orders(
+                product_id=self.product_id, states=LIVE_ORDER_STATES
+            )
+        )
+        remote_hashes = {order.intent.hash for order in remote_orders}
+        with self._lock:
+            changes = self.apply_all(remote_orders)
+            for order in list(self._orders.values()):
+                if (
+                    order.intent.hash not in remote_hashes
+                    and order.timestamp < started_at
+                ):
+                    self._remove(order)
+                    self._finished[order.intent.hash] = None
+                    changes += 1
+            while len(self._finished) > constants.ORDER_MANAGER_HISTORY_SIZE:
+                self._finished.popitem(last=False)
+        return changes
+
+    def start_reconciliation(self, interval: timedelta) -> None:
+        """Starts reconciling the model with the exchange in a background thread at
+        regular intervals, until `close()` is called.
+
+        Errors of the exchange do not stop the reconciliation; the last one is
+        available from `reconciliation_error`.
+
+        Parameters
+        ----------
+        interval : datetime.timedelta
+        """
+        if self._reconciliation is not None:
+            raise RuntimeError("Reconciliation is already running")
+        self._stopped.clear()
+        self._reconciliation = threading.Thread(
+            target=self._reconcile_periodically,
+            args=(interval.total_seconds(),),
+            name="afp-order-manager",
+            daemon=True,
+        )
+        self._reconciliation.start()
+
+    @property
+    def reconciliation_error(self) -> ExchangeError | None:
+        """The error of the last background reconciliation, if it has failed."""
+        return self._reconciliation_error
+
+    # Queries
+
+    def order(self, intent_hash: str) -> Order | None:
+        """Returns the latest state of a live order.
+
+        Parameters
+        ----------
+        intent_hash : str
+
+        Returns
+        -------
+        afp.schemas.Order or None
+        """
+        return self._orders.get(intent_hash)
+
+    def orders(
+        self, product_id: str | None = None, side: OrderSide | None = None
+    ) -> list[Order]:
+        """Returns the live orders, optionally of a product and side.
+
+        Parameters
+        ----------
+        product_id : str, optional
+        side : afp.enums.OrderSide, optional
+
+        Returns
+        -------
+        list of afp.schemas.Order
+        """
+        with self._lock:
+            if product_id is None:
+                orders = list(self._orders.values())
+            else:
+                orders = list(self._by_product.get(product_id, {}).values())
+        if side is not None:
+            orders = [order for order in orders if order.intent.data.side == side]
+        return orders
+
+    def intent_hashes(
+        self, product_id: str, side: OrderSide | None = None
+    ) -> list[str]:
+        """Returns the intent hashes of the live orders of a product.
+
+        Parameters
+        ----------
+        product_id : str
+        side : afp.enums.OrderSide, optional
+
+        Returns
+        -------
+        list of str
+        """
+        return [order.intent.hash for order in self.orders(product_id, side)]
+
+    def resting_quantity(
+        self, product_id: str, side: OrderSide, price: Decimal | None = None
+    ) -> int:
+        """Returns the unfilled quantity of the live orders of a product and side,
+        optionally at a given limit price.
+
+        Parameters
+        ----------
+        product_id : str
+        side : afp.enums.OrderSide
+        price : decimal.Decimal, optional
+
+        Returns
+        -------
+        int
+        """
+        with self._lock:
+            if price is None:
+                return self._quantities.get((product_id, side), 0)
+            levels = self._levels.get((product_id, side))
+            return 0 if levels is None else levels.get(price, 0)
+
+    def price_levels(self, product_id: str, side: OrderSide) -> dict[Decimal, int]:
+        """Returns the unfilled quantity of the live orders of a product and side by
+        limit price.
+
+        Parameters
+        ----------
+        product_id : str
+        side : afp.enums.OrderSide
+
+        Returns
+        -------
+        dict of decimal.Decimal to int
+        """
+        with self._lock:
+            return dict(self._levels.get((product_id, side), {}))
+
+    def _add(self, order: Order) -> None:
+        data = order.intent.data
+        self._orders[order.intent.hash] = order
+        self._by_product[data.product_id][order.intent.hash] = order
+        quantity = data.quantity - order.fill_quantity
+        self._quantities[(data.product_id, data.side)] += quantity
+        self._levels[(data.product_id, data.side)][data.limit_price] += quantity
+
+    def _remove(self, order: Order) -> None:
+        data = order.intent.data
+        del self._orders[order.intent.hash]
+        orders = self._by_product[data.product_id]
+        del orders[order.intent.hash]
+        if not orders:
+            del self._by_product[data.product_id]
+
+        key = (data.product_id, data.side)
+        quantity = data.quantity - order.fill_quantity
+        self._quantities[key] -= quantity
+        if not self._quantities[key]:
+            del self._quantities[key]
+        levels = self._levels[key]
+        levels[data.limit_price] -= quantity
+        if not levels[data.limit_price]:
+            del levels[data.limit_price]
+        if not levels:
+            del self._levels[key]
+
+    def _reconcile_periodically(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            try:
+                self.reconcile()
+            except ExchangeError as error:
+                self._reconciliation_error = error
+            else:
+                self._reconciliation_error = None
@@ -0,0 +1,268 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable, Self
+
+from . import constants
+from .enums import ListingState
+from .exceptions import ExchangeError, NotFoundError
+from .schemas import ExchangeProduct
+
+if TYPE_CHECKING:
+    from .api.trading import Trading
+
+
+@dataclass(frozen=True, slots=True)
+class ListingChange:
+    product_id: str
+    symbol: str
+    listing_state: ListingState | None
+    previous_listing_state: ListingState | None
+
+
+class ProductCache:
+    """In-memory index of the products approved for trading on the exchange.
+
+    All products are loaded in bulk with `Trading.iter_all_products()` on first use
+    and indexed by ID and symbol. Products older than `ttl` are still served from
+    memory while the cache is refreshed in a background thread, so lookups only wait
+    for the exchange when the cache is empty or a product is not yet known. Changes
+    to the listing state of products are reported to the listeners registered with
+    `add_listener()`.
+
+    Parameters
+    ----------
+    trading : afp.api.trading.Trading
+    ttl : datetime.timedelta, optional
+        The time after which the cache is refreshed on the next lookup.
+
+    Examples
+    --------
+    >>> cache = ProductCache(trading)
+    >>> cache.add_listener(print)
+    >>> cache.start_refresh(timedelta(minutes=1))
+    >>> intent = trading.create_intent(product=cache.product(product_id), ...)
+    """
+
+    ttl: timedelta
+    _trading: "Trading"
+    _lock: threading.Lock
+    _by_id: dict[str, ExchangeProduct]
+    _by_symbol: dict[str, ExchangeProduct]
+    _loaded_at: float | None
+    _listeners: list[Callable[[ListingChange], None]]
+    _refreshing: threading.Lock
+    _refresher: threading.Thread | None
+    _background: threading.Thread | None
+    _stopped: threading.Event
+    _refresh_error: ExchangeError | None
+
+    def __init__(
+        self, trading: "Trading", ttl: timedelta = constants.PRODUCT_CACHE_TTL
+    ):
+        self.ttl = ttl
+        self._trading = trading
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_symbol = {}
+        self._loaded_at = None
+        self._listeners = []
+        self._refreshing = threading.Lock()
+        self._refresher = None
+        self._background = None
+        self._stopped = threading.Event()
+        self._refresh_error = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(products={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops the periodic background refresh, if running."""
+        self._stopped.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    # Lookups
+
+    def product(self, product_id: str) -> ExchangeProduct:
+        """Returns a product by its ID.
+
+        Parameters
+        ----------
+        product_id : str
+
+        Returns
+        -------
+        afp.schemas.ExchangeProduct
+
+        Raises
+        ------
+        afp.exceptions.NotFoundError
+            If no such product is approved for trading.
+        """
+        return self._lookup(product_id, by_symbol=False)
+
+    def product_by_symbol(self, symbol: str) -> ExchangeProduct:
+        """Returns a product by its symbol.
+
+        Parameters
+        ----------
+        symbol : str
+
+        Returns
+        -------
+        afp.schemas.ExchangeProduct
+
+        Raises
+        ------
+        afp.exceptions.NotFoundError
+            If no such product is approved for trading.
+        """
+        return self._lookup(symbol.upper(), by_symbol=True)
+
+    def products(self) -> list[ExchangeProduct]:
+        """Returns all cached products, loading them if the cache is empty.
+
+        Returns
+        -------
+        list of afp.schemas.ExchangeProduct
+        """
+        if self._loaded_at is None:
+            self.refresh()
+        else:
+            self._refresh_if_stale()
+        return list(self._by_id.values())
+
+    # Refresh
+
+    def refresh(self) -> list[ListingChange]:
+        """Reloads all products from the exchange and notifies the listeners of the
+        changes of their listing state.
+
+        Returns
+        -------
+        list of afp.productcache.ListingChange
+            The products that have been added, removed (with `None` listing state) or
+            whose listing state has changed.
+        """
+        with self._refreshing:
+            products = list(self._trading.iter_all_products())
+            current = {product.id: product for product in products}
+            with self._lock:
+                previous = self._by_id
+                self._by_id = current
+                self._by_symbol = {product.symbol: product for product in products}
+                self._loaded_at = time.monotonic()
+            changes = [
+                ListingChange(product.id, product.symbol, None, product.listing_state)
+                for product in previous.values()
+                if product.id not in current
+            ]
+            changes.extend(
+                ListingChange(
+                    product.id,
+                    product.symbol,
+                    product.listing_state,
+                    old.listing_state if old is not None else None,
+                )
+                for product in products
+                if (old := previous.get(product.id)) is None
+                or old.listing_state != product.listing_state
+            )
+            for change in changes:
+                for listener in self._listeners:
+                    listener(change)
+        return changes
+
+    def add_listener(self, listener: Callable[[ListingChange], None]) -> None:
+        """Registers a function to be called with each change of the listing state of
+        a product, including products that are loaded for the first time.
+
+        Listeners are called from the thread that refreshes the cache.
+
+        Parameters
+        ----------
+        listener : callable
+        """
+        self._listeners.append(listener)
+
+    def start_refresh(self, interval: timedelta) -> None:
+        """Starts refreshing the cache in a background thread at regular intervals,
+        until `close()` is called.
+
+        Errors of the exchange do not stop the refresh; the last one is available from
+        `refresh_error`.
+
+        Parameters
+        ----------
+        interval : datetime.timedelta
+        """
+        if self._refresher is not None:
+            raise RuntimeError("Refresh is already running")
+        self._stopped.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_periodically,
+            args=(interval.total_seconds(),),
+            name="afp-product-cache",
+            daemon=True,
+        )
+        self._refresher.start()
+
+    @property
+    def refresh_error(self) -> ExchangeError | None:
+        """The error of the last background refresh, if it has failed."""
+        return self._refresh_error
+
+    def _lookup(self, key: str, by_symbol: bool) -> ExchangeProduct:
+        refreshed = self._loaded_at is None
+        if refreshed:
+            self.refresh()
+        else:
+            self._refresh_if_stale()
+        product = (self._by_symbol if by_symbol else self._by_id).get(key)
+        if product is None and not refreshed:
+            # The product may have been approved since the last refresh
+            self.refresh()
+            product = (self._by_symbol if by_symbol else self._by_id).get(key)
+        if product is None:
+            raise NotFoundError(f"Product {key} not found")
+        return product
+
+    def _refresh_if_stale(self) -> None:
+        with self._lock:
+            if self._loaded_at is None or (
+                time.monotonic() - self._loaded_at < self.ttl.total_seconds()
+            ):
+                return
+            # Serve the stale products until the background refresh has completed
+            if self._background is not None and self._background.is_alive():
+                return
+            self._background = threading.Thread(
+                target=self._refresh_in_background,
+                name="afp-product-cache",
+                daemon=True,
+            )
+            self._background.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except ExchangeError as error:
+            self._refresh_error = error
+        else:
+            self._refresh_error = None
+
+    def _refresh_periodically(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            self._refresh_in_background()
@@ -0,0 +1,187 @@
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, cast
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter  # type: ignore (untyped)
+from web3.exceptions import TimeExhausted
+from web3.providers.base import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from . import constants
+from .schemas import Transaction
+
+
+class PendingTransaction(Future[Transaction]):
+    """Handle of a transaction that has been sent to the blockchain but may not have
+    been mined yet.
+
+    The handle is a `concurrent.futures.Future` that resolves to the transaction
+    with its receipt, so it can be awaited with `result()`, observed with
+    `add_done_callback()` or combined with other handles in
+    `concurrent.futures.wait()`. The future fails with `web3.exceptions.TimeExhausted`
+    if the transaction is not mined within the configured timeout. Cancelling the
+    future stops polling its receipt, but not the transaction itself.
+
+    Attributes
+    ----------
+    hash : str
+        The transaction hash.
+    data : dict
+        The transaction parameters.
+    """
+
+    hash: str
+    data: dict[str, Any]
+
+    def __init__(self, hash: str, data: dict[str, Any]):
+        super().__init__()
+        self.hash = hash
+        self.data = data
+
+    def __repr__(self) -> str:
+        state = "done" if self.done() else "pending"
+        return f"{self.__class__.__name__}(hash={self.hash}, {state})"
+
+
+class ReceiptPoller:
+    """Resolves the pending transactions sent to a node.
+
+    The receipts of all outstanding transactions are requested in a single JSON-RPC
+    batch per poll from a background thread, which runs while there are pending
+    transactions.
+
+    Parameters
+    ----------
+    w3 : web3.Web3
+    interval : float, optional
+        The number of seconds between polls.
+    """
+
+    interval: float
+    _w3: Web3
+    _lock: threading.Lock
+    _pending: dict[str, tuple[PendingTransaction, float]]
+    _thread: threading.Thread | None
+
+    def __init__(self, w3: Web3, interval: float = constants.RECEIPT_POLL_INTERVAL):
+        self.interval = interval
+        self._w3 = w3
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(pending={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def watch(
+        self, tx_hash: HexBytes, data: dict[str, Any], timeout: float
+    ) -> PendingTransaction:
+        """Starts polling the receipt of a transaction that has been sent.
+
+        Parameters
+        ----------
+        tx_hash : hexbytes.HexBytes
+        data : dict
+            The transaction parameters.
+        timeout : float
+            The number of seconds after which the transaction is given up.
+
+        Returns
+        -------
+        afp.receipts.PendingTransaction
+        """
+        pending = PendingTransaction(tx_hash.to_0x_hex(), data)
+        with self._lock:
+            self._pending[pending.hash] = (pending, time.monotonic() + timeout)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._poll_periodically,
+                    name="afp-receipt-poller",
+                    daemon=True,
+                )
+                self._thread.start()
+        return pending
+
+    def poll(self) -> None:
+        """Requests the receipts of the pending transactions and resolves the ones
+        that have been mined or have timed out."""
+        with self._lock:
+            outstanding = list(self._pending.values())
+        if not outstanding:
+            return
+
+        try:
+            receipts = self._get_receipts([pending.hash for pending, _ in outstanding])
+        except Exception:
+            # The node may be temporarily unavailable; transactions are given up only
+            # when they time out
+            receipts = [None] * len(outstanding)
+
+        now = time.monotonic()
+        for (pending, deadline), receipt in zip(outstanding, receipts):
+            if pending.cancelled():
+                self._discard(pending)
+            elif receipt is not None:
+                self._resolve(pending, receipt)
+            elif now >= deadline:
+                self._fail(pending)
+
+    def _get_receipts(self, hashes: list[str]) -> list[dict[str, Any] | None]:
+        provider = cast(JSONBaseProvider, self._w3.provider)
+        responses = provider.make_batch_request(
+            [(RPCEndpoint("eth_getTransactionReceipt"), [hash]) for hash in hashes]
+        )
+        if not isinstance(responses, list):
+            raise ValueError(f"Batch request failed: {responses.get('error')}")
+        return [_format_receipt(response) for response in responses]
+
+    def _discard(self, pending: PendingTransaction) -> None:
+        with self._lock:
+            self._pending.pop(pending.hash, None)
+
+    def _resolve(self, pending: PendingTransaction, receipt: dict[str, Any]) -> None:
+        self._discard(pending)
+        try:
+            pending.set_result(
+                Transaction(hash=pending.hash, data=pending.data, receipt=dict(receipt))
+            )
+        except InvalidStateError:
+            # The future has been cancelled since the poll
+            pass
+
+    def _fail(self, pending: PendingTransaction) -> None:
+        self._discard(pending)
+        try:
+            pending.set_exception(
+                TimeExhausted(f"Transaction {pending.hash} is not in the chain")
+            )
+        except InvalidStateError:
+            pass
+
+    def _poll_periodically(self) -> None:
+        try:
+            while True:
+                time.sleep(self.interval)
+                self.poll()
+                with self._lock:
+                    if not self._pending:
+                        self._thread = None
+                        return
+        finally:
+            # Let the next watched transaction start a new thread if this one fails
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+
+def _format_receipt(response: RPCResponse) -> dict[str, Any] | None:
+    result = response.get("result")
+    if result is None:
+        return None
+    return cast(Callable[[Any], dict[str, Any]], receipt_formatter)(result)
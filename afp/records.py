@@ -0,0 +1,123 @@
+from functools import cache
+from typing import Any, Callable
+
+import pydantic_core
+from pydantic import BaseModel, TypeAdapter
+
+
+class LazyRecord[M: BaseModel]:
+    """Read-only view of a JSON object received from the exchange that is validated
+    lazily.
+
+    Parsing a message into a lazy record skips model validation altogether. Fields are
+    validated one at a time when they are first accessed as attributes, with the same
+    validators as the model; nested models are returned as lazy records themselves.
+    The fully validated model can be obtained with `validate()`.
+
+    Lazy records are meant for high-throughput consumers that only look at a few
+    fields of each message, or that filter out most messages before processing them.
+
+    Parameters
+    ----------
+    model_type : type
+        The pydantic model that the JSON object represents.
+    data : dict
+        The JSON object with the serialized field names as keys.
+    """
+
+    __slots__ = ("_model_type", "_data", "_values", "_model")
+
+    _model_type: type[M]
+    _data: dict[str, Any]
+    _values: dict[str, Any] | None
+    _model: M | None
+
+    def __init__(self, model_type: type[M], data: dict[str, Any]):
+        self._model_type = model_type
+        self._data = data
+        self._values = None
+        self._model = None
+
+    @classmethod
+    def from_json(cls, model_type: type[M], json_data: str | bytes) -> "LazyRecord[M]":
+        """Parses a JSON document into a lazy record without validating it.
+
+        Parameters
+        ----------
+        model_type : type
+        json_data : str or bytes
+
+        Returns
+        -------
+        afp.records.LazyRecord
+        """
+        return cls(model_type, pydantic_core.from_json(json_data))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}[{self._model_type.__name__}]({self._data})"
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called if the attribute is not found, i.e. for model fields
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._model is not None:
+            return getattr(self._model, name)
+        if self._values is None:
+            self._values = {}
+        elif name in self._values:
+            return self._values[name]
+
+        try:
+            alias, convert = _field_converters(self._model_type)[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{self._model_type.__name__}' object has no attribute '{name}'"
+            ) from None
+        if alias not in self._data:
+            # Let model validation report the missing field
+            return getattr(self.validate(), name)
+        value = self._values[name] = convert(self._data[alias])
+        return value
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        """The unvalidated JSON object."""
+        return self._data
+
+    def validate(self) -> M:
+        """Validates all fields and returns the model.
+
+        Returns
+        -------
+        pydantic.BaseModel
+
+        Raises
+        ------
+        pydantic.ValidationError
+            If the JSON object is not a valid representation of the model.
+        """
+        if self._model is None:
+            self._model = self._model_type.model_validate(self._data)
+        return self._model
+
+
+@cache
+def _field_converters(
+    model_type: type[BaseModel],
+) -> dict[str, tuple[str, Callable[[Any], Any]]]:
+    converters: dict[str, tuple[str, Callable[[Any], Any]]] = {}
+    for name, field in model_type.model_fields.items():
+        alias = field.alias or name
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            converters[name] = (alias, _nested_converter(annotation))
+        else:
+            adapter = TypeAdapter[Any](field.rebuild_annotation())
+            converters[name] = (alias, adapter.validate_python)
+    return converters
+
+
+def _nested_converter(
+    model_type: type[BaseModel],
+) -> Callable[[Any], LazyRecord[BaseModel]]:
+    return lambda data: LazyRecord(model_type, data)
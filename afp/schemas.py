@@ -132,6 +132,16 @@ class Position(Model):
     pnl: Decimal
 
 
+class MarginAccountSummary(Model):
+    block_number: int
+    capital: Decimal
+    equity: Decimal
+    maintenance_margin_available: Decimal
+    maintenance_margin_used: Decimal
+    profit_and_loss: Decimal
+    withdrawable_amount: Decimal
+
+
 # Product API
 
 
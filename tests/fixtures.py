@@ -296,6 +296,7 @@ def make_ndjson_response(items: list[Any]) -> Response:
     mock_response = Response()
     mock_response.status_code = 200
     mock_response._content = b""  # type: ignore
+    mock_response._content_consumed = True  # type: ignore
     mock_response.iter_lines = Mock(  # type: ignore
         return_value=iter([item.model_dump_json().encode() for item in items])
     )
@@ -0,0 +1,315 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import afp
+from afp import constants
+from afp.enums import OrderState
+from afp.exceptions import (
+    AuthenticationError,
+    ExchangeError,
+    NotFoundError,
+    ValidationError,
+)
+from afp.exchange import AsyncExchangeClient
+
+from . import AuthenticatorStub
+from .fixtures import (
+    make_exchange_parameters,
+    make_market_depth_data,
+    make_order,
+    make_order_submission,
+)
+
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def run_with_server(
+    routes: list[tuple[str, str, Handler]],
+    test: Callable[[str], Awaitable[Any]],
+) -> Any:
+    """Start a local exchange stub and run the test coroutine against its URL."""
+
+    async def main() -> Any:
+        app = web.Application()
+        for method, path, handler in routes:
+            app.router.add_route(method, path, handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await test(str(server.make_url("/")))
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def json_handler(data: Any, status: int = 200) -> Handler:
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response(data, status=status)
+
+    return handler
+
+
+def test_generate_login_nonce__success__returns_message():
+    async def test(url: str) -> str:
+        client = AsyncExchangeClient(url)
+        try:
+            return await client.generate_login_nonce()
+        finally:
+            await client.close()
+
+    nonce = run_with_server(
+        [("GET", "/v1/nonce", json_handler({"message": "test-nonce-12345"}))], test
+    )
+    assert nonce == "test-nonce-12345"
+
+
+def test_submit_order__success__returns_order():
+    order = make_order(id="order123", state=OrderState.OPEN)
+    received: list[dict[str, Any]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        received.append(await request.json())
+        assert request.headers["Accept"] == "application/json"
+        assert "afp-sdk/" in request.headers["User-Agent"]
+        return web.json_response(order.model_dump(mode="json"))
+
+    async def test(url: str) -> Any:
+        client = AsyncExchangeClient(url)
+        try:
+            return await client.submit_order(make_order_submission())
+        finally:
+            await client.close()
+
+    result = run_with_server([("POST", "/v1/orders", handler)], test)
+
+    assert result.id == "order123"
+    assert result.state == OrderState.OPEN
+    assert received[0]["type"] == "LIMIT_ORDER"
+
+
+def test_iter_market_depth_data__success__yields_snapshots():
+    depth = make_market_depth_data(product_id="prod123")
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        assert request.headers["Accept"] == "application/x-ndjson"
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for _ in range(2):
+            await response.write(depth.model_dump_json().encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    async def test(url: str) -> list[Any]:
+        client = AsyncExchangeClient(url)
+        try:
+            return [item async for item in client.iter_market_depth_data("prod123")]
+        finally:
+            await client.close()
+
+    snapshots = run_with_server(
+        [("GET", "/v1/stream/market-depth/prod123", handler)], test
+    )
+
+    assert len(snapshots) == 2
+    assert all(s.product_id == "prod123" for s in snapshots)
+
+
+@pytest.mark.parametrize(
+    "status,detail,exception",
+    [
+        (400, "Invalid quantity", ValidationError),
+        (401, "Invalid credentials", AuthenticationError),
+        (404, "Resource not found", NotFoundError),
+        (500, "Internal server error", ExchangeError),
+    ],
+)
+def test_send_request__error_status__raises_mapped_error(status, detail, exception):
+    async def test(url: str) -> None:
+        client = AsyncExchangeClient(url)
+        try:
+            await client.submit_order(make_order_submission())
+        finally:
+            await client.close()
+
+    with pytest.raises(exception):
+        run_with_server(
+            [("POST", "/v1/orders", json_handler({"detail": detail}, status))], test
+        )
+
+
+@pytest.mark.parametrize("status", [400, 422])
+def test_send_request__undecodable_error_body__raises_validation_error(status):
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=b"\xff\xfe", status=status)
+
+    async def test(url: str) -> None:
+        client = AsyncExchangeClient(url)
+        try:
+            await client.submit_order(make_order_submission())
+        finally:
+            await client.close()
+
+    with pytest.raises(ValidationError):
+        run_with_server([("POST", "/v1/orders", handler)], test)
+
+
+def test_send_request__connection_error__raises_exchange_error():
+    async def test() -> None:
+        client = AsyncExchangeClient("http://127.0.0.1:1")
+        try:
+            await client.generate_login_nonce()
+        finally:
+            await client.close()
+
+    with pytest.raises(ExchangeError, match="Failed to send request"):
+        asyncio.run(test())
+
+
+def test_send_request__timeout__retries_and_raises_exchange_error(monkeypatch):
+    monkeypatch.setattr(constants, "EXCHANGE_REQUEST_TIMEOUT", 0.1)
+    attempts = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            await asyncio.sleep(1)
+        return web.json_response({"message": "12345678"})
+
+    async def test(url: str) -> str:
+        for max_retries in (0, 1):
+            client = AsyncExchangeClient(url, max_retries=max_retries)
+            try:
+                return await client.generate_login_nonce()
+            except ExchangeError as error:
+                assert isinstance(error.__cause__, asyncio.TimeoutError)
+            finally:
+                await client.close()
+        raise AssertionError("Unreachable")
+
+    result = run_with_server([("GET", "/v1/nonce", handler)], test)
+
+    assert result == "12345678"
+    assert attempts == 3
+
+
+def test_iter_lines__timeout__raises_exchange_error(monkeypatch):
+    depth = make_market_depth_data(product_id="prod123")
+    readline = aiohttp.StreamReader.readline
+    reads = 0
+
+    async def timing_out_readline(self) -> bytes:
+        nonlocal reads
+        reads += 1
+        if reads > 1:
+            raise asyncio.TimeoutError()
+        return await readline(self)
+
+    monkeypatch.setattr(aiohttp.StreamReader, "readline", timing_out_readline)
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(depth.model_dump_json().encode() + b"\n")
+        await asyncio.sleep(3600)
+        return response
+
+    async def test(url: str) -> list[Any]:
+        client = AsyncExchangeClient(url)
+        received = []
+        try:
+            async for item in client.iter_market_depth_data("prod123"):
+                received.append(item)
+        except ExchangeError as error:
+            assert isinstance(error.__cause__, asyncio.TimeoutError)
+        finally:
+            await client.close()
+        return received
+
+    received = run_with_server(
+        [("GET", "/v1/stream/market-depth/prod123", handler)], test
+    )
+
+    assert [item.product_id for item in received] == ["prod123"]
+
+
+def test_send_request__retries_after_rate_limit():
+    order = make_order(id="order123")
+    attempts = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            return web.json_response(
+                {"detail": "Too many requests"},
+                status=429,
+                headers={"Retry-After": "0"},
+            )
+        return web.json_response(order.model_dump(mode="json"))
+
+    async def test(url: str) -> Any:
+        client = AsyncExchangeClient(url, max_retries=1)
+        try:
+            return await client.submit_order(make_order_submission())
+        finally:
+            await client.close()
+
+    result = run_with_server([("POST", "/v1/orders", handler)], test)
+
+    assert result.id == "order123"
+    assert attempts == 2
+
+
+def test_AsyncTrading__logs_in_on_enter_and_refreshes_expired_token():
+    login_count = 0
+    order_requests = 0
+    order = make_order(id="order123")
+
+    async def login_handler(request: web.Request) -> web.Response:
+        nonlocal login_count
+        login_count += 1
+        return web.json_response(
+            make_exchange_parameters(trading_protocol_id="0xabcd").model_dump(
+                mode="json"
+            )
+        )
+
+    async def order_handler(request: web.Request) -> web.Response:
+        nonlocal order_requests
+        order_requests += 1
+        if order_requests == 1:
+            return web.json_response({"detail": "Token expired"}, status=401)
+        return web.json_response(order.model_dump(mode="json"))
+
+    async def test(url: str) -> Any:
+        app = afp.AFP(authenticator=AuthenticatorStub(), exchange_url=url)
+        async with app.AsyncTrading() as trading:
+            assert trading._trading_protocol_id == "0xabcd"  # type: ignore
+            return await trading.order(
+                "0x1234567890123456789012345678901234567890123456789012345678901234"
+            )
+
+    result = run_with_server(
+        [
+            ("GET", "/v1/nonce", json_handler({"message": "12345678"})),
+            ("POST", "/v1/login", login_handler),
+            (
+                "GET",
+                "/v1/orders/0x1234567890123456789012345678901234567890123456789012345678901234",
+                order_handler,
+            ),
+        ],
+        test,
+    )
+
+    assert result.id == "order123"
+    assert login_count == 2
+    assert order_requests == 2
@@ -1,4 +1,5 @@
 import re
+import threading
 from decimal import Decimal
 from unittest.mock import Mock
 
@@ -8,14 +9,23 @@ from hexbytes import HexBytes
 from web3 import Web3, HTTPProvider
 from web3.contract.contract import ContractFunction
 from web3.eth import Eth
+from web3.exceptions import ContractLogicError, Web3RPCError
 
 import afp
-from afp.api.base import BaseAPI, ClearingSystemAPI, ExchangeAPI
+from afp.api.base import (
+    BaseAPI,
+    ClearingSystemAPI,
+    ExchangeAPI,
+    _fee_oracles,
+    _receipt_pollers,
+)
 from afp.bindings import MarginAccount
 from afp.constants import defaults
 from afp.dtos import ExchangeParameters
 from afp.exceptions import ConfigurationError
 from afp.exchange import ExchangeClient
+from afp.gas import FeeOracle
+from afp.receipts import ReceiptPoller
 
 from . import NULL_ADDRESS, AuthenticatorStub
 
@@ -94,11 +104,16 @@ def test_ExchangeAPI__applies_exchange_parameters(monkeypatch):
     )
 
     app = afp.AFP(
-        authenticator=AuthenticatorStub(), exchange_url="http://foobar", chain_id=12345
+        authenticator=AuthenticatorStub(),
+        exchange_url="http://foobar",
+        exchange_pool_size=7,
+        chain_id=12345,
     )
     api = ExchangeAPI(app.config)
 
     assert api._exchange._base_url == "http://foobar"
+    adapter = api._exchange._session.get_adapter("http://foobar")
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 7  # type: ignore
     mock_login.assert_called_once()
     login_submission = mock_login.call_args_list[0].args[0]
     assert "Chain ID: 12345" in login_submission.message
@@ -126,3 +141,194 @@ def test_ExchangeAPI__generates_eip4361_message(monkeypatch):
     actual_message = ExchangeAPI(app.config)._generate_eip4361_message(nonce)
 
     assert expected_message_regex.match(actual_message)
+
+
+def _transacting_api(monkeypatch, rpc_url, transaction_counts, send_results):
+    mock_build_transaction = Mock(return_value={})
+    monkeypatch.setattr(ContractFunction, "build_transaction", mock_build_transaction)
+    mock_get_transaction_count = Mock(side_effect=transaction_counts)
+    monkeypatch.setattr(Eth, "get_transaction_count", mock_get_transaction_count)
+    monkeypatch.setattr(Eth, "send_raw_transaction", Mock(side_effect=send_results))
+    monkeypatch.setattr(Eth, "wait_for_transaction_receipt", Mock(return_value={}))
+    app = afp.AFP(
+        authenticator=AuthenticatorStub(),
+        rpc_url=rpc_url,
+        gas_limit=1,
+        max_fee_per_gas=2,
+        max_priority_fee_per_gas=3,
+    )
+    authorize = MarginAccount(Web3(), NULL_ADDRESS).authorize(NULL_ADDRESS)
+    return ClearingSystemAPI(app.config), authorize, mock_build_transaction
+
+
+def test_ClearingSystemAPI__allocates_nonces_locally(monkeypatch):
+    api, authorize, mock_build_transaction = _transacting_api(
+        monkeypatch, "http://local-nonces", [5], [HexBytes("0x01"), HexBytes("0x02")]
+    )
+    other_api = ClearingSystemAPI(api._config)
+
+    api._transact(authorize)
+    other_api._transact(authorize)
+
+    nonces = [call.args[0]["nonce"] for call in mock_build_transaction.call_args_list]
+    assert nonces == [5, 6]
+    Eth.get_transaction_count.assert_called_once_with(NULL_ADDRESS, "pending")  # type: ignore
+
+
+def test_ClearingSystemAPI__resynchronizes_nonce_after_rejection(monkeypatch):
+    api, authorize, mock_build_transaction = _transacting_api(
+        monkeypatch,
+        "http://resync-nonces",
+        [5, 7],
+        [
+            Web3RPCError("{'code': -32000, 'message': 'nonce too low'}"),
+            HexBytes("0x01"),
+            Web3RPCError("{'code': -32000, 'message': 'insufficient funds'}"),
+            HexBytes("0x02"),
+        ],
+    )
+
+    api._transact(authorize)
+    with pytest.raises(Web3RPCError):
+        api._transact(authorize)
+    api._transact(authorize)
+
+    nonces = [call.args[0]["nonce"] for call in mock_build_transaction.call_args_list]
+    assert nonces == [5, 7, 8, 8]
+    # The nonce of the transaction rejected for other reasons is reused without
+    # resynchronizing
+    assert Eth.get_transaction_count.call_count == 2  # type: ignore
+
+
+def test_ClearingSystemAPI__reuses_nonce_of_reverted_transaction(monkeypatch):
+    api, authorize, _ = _transacting_api(monkeypatch, "http://reverted-nonces", [5], [])
+    built = []
+    sending = threading.Event()
+    reverted = threading.Event()
+
+    def build_transaction(self, tx_params):
+        built.append((self.fn_name, tx_params["nonce"]))
+        if self.fn_name == "withdraw":
+            raise ContractLogicError("execution reverted")
+        return {}
+
+    def send_raw_transaction(self, raw_transaction):
+        if threading.current_thread().name == "slow-sender":
+            # Keep the nonce allocated but unsent while the other transactions run
+            sending.set()
+            assert reverted.wait(5)
+        return HexBytes("0x01")
+
+    monkeypatch.setattr(ContractFunction, "build_transaction", build_transaction)
+    monkeypatch.setattr(Eth, "send_raw_transaction", send_raw_transaction)
+    withdraw = MarginAccount(Web3(), NULL_ADDRESS).withdraw(1)
+    thread = threading.Thread(
+        target=api._transact, args=(authorize,), name="slow-sender"
+    )
+    thread.start()
+    assert sending.wait(5)
+
+    with pytest.raises(ContractLogicError):
+        api._transact(withdraw)
+    api._transact(authorize)
+    reverted.set()
+    thread.join(5)
+
+    assert built == [("authorize", 5), ("withdraw", 6), ("authorize", 6)]
+    Eth.get_transaction_count.assert_called_once()  # type: ignore
+
+
+def test_ClearingSystemAPI__returns_pending_transaction(monkeypatch):
+    api, authorize, _ = _transacting_api(
+        monkeypatch, "http://pending-transactions", [5], [HexBytes("0x" + "01" * 32)]
+    )
+    poller = ReceiptPoller(api._w3, interval=0.01)
+    monkeypatch.setitem(_receipt_pollers, "http://pending-transactions", poller)
+    monkeypatch.setattr(
+        HTTPProvider,
+        "make_batch_request",
+        Mock(return_value=[{"jsonrpc": "2.0", "id": 0, "result": {"status": "0x1"}}]),
+    )
+
+    pending = api._transact_nowait(authorize)
+
+    assert pending.hash == "0x" + "01" * 32
+    assert pending.result(timeout=5).receipt == {"status": 1}
+    Eth.wait_for_transaction_receipt.assert_not_called()  # type: ignore
+
+
+def test_ClearingSystemAPI__takes_unset_gas_parameters_from_fee_oracle(monkeypatch):
+    mock_build_transaction = Mock(return_value={})
+    mock_estimate_gas = Mock(return_value=1000)
+    monkeypatch.setattr(ContractFunction, "build_transaction", mock_build_transaction)
+    monkeypatch.setattr(ContractFunction, "estimate_gas", mock_estimate_gas)
+    monkeypatch.setattr(Eth, "get_transaction_count", Mock(return_value=0))
+    monkeypatch.setattr(Eth, "send_raw_transaction", Mock(return_value=HexBytes("0x")))
+    monkeypatch.setattr(Eth, "wait_for_transaction_receipt", Mock(return_value={}))
+    monkeypatch.setattr(
+        HTTPProvider,
+        "make_batch_request",
+        Mock(
+            return_value=[
+                {"jsonrpc": "2.0", "id": 0, "result": {"baseFeePerGas": "0x64"}},
+                {"jsonrpc": "2.0", "id": 1, "result": "0x5"},
+            ]
+        ),
+    )
+    app = afp.AFP(
+        authenticator=AuthenticatorStub(), rpc_url="http://fee-oracle", chain_id=7
+    )
+    api = ClearingSystemAPI(app.config)
+    authorize = MarginAccount(Web3(), NULL_ADDRESS).authorize(NULL_ADDRESS)
+
+    api._transact(authorize)
+    api._transact(authorize)
+
+    for call in mock_build_transaction.call_args_list:
+        tx_params = call.args[0]
+        assert tx_params["gas"] == 1200
+        assert tx_params["maxFeePerGas"] == 205
+        assert tx_params["maxPriorityFeePerGas"] == 5
+        assert tx_params["chainId"] == 7
+        assert "gasLimit" not in tx_params
+    mock_estimate_gas.assert_called_once()
+    HTTPProvider.make_batch_request.assert_called_once()  # type: ignore
+
+
+def test_ClearingSystemAPI__forgets_gas_estimate_of_failed_pending_transaction(
+    monkeypatch,
+):
+    monkeypatch.setattr(ContractFunction, "build_transaction", Mock(return_value={}))
+    monkeypatch.setattr(Eth, "get_transaction_count", Mock(return_value=0))
+    monkeypatch.setattr(
+        Eth, "send_raw_transaction", Mock(return_value=HexBytes("0x" + "02" * 32))
+    )
+    monkeypatch.setattr(
+        HTTPProvider,
+        "make_batch_request",
+        Mock(return_value=[{"jsonrpc": "2.0", "id": 0, "result": {"status": "0x0"}}]),
+    )
+    app = afp.AFP(
+        authenticator=AuthenticatorStub(),
+        rpc_url="http://failed-transactions",
+        max_fee_per_gas=2,
+        max_priority_fee_per_gas=3,
+    )
+    api = ClearingSystemAPI(app.config)
+    forgotten = threading.Event()
+    oracle = Mock(spec=FeeOracle)
+    oracle.gas.return_value = 1000
+    oracle.forget.side_effect = lambda func: forgotten.set()
+    monkeypatch.setitem(_fee_oracles, "http://failed-transactions", oracle)
+    monkeypatch.setitem(
+        _receipt_pollers,
+        "http://failed-transactions",
+        ReceiptPoller(api._w3, interval=0.01),
+    )
+    authorize = MarginAccount(Web3(), NULL_ADDRESS).authorize(NULL_ADDRESS)
+
+    pending = api._transact_nowait(authorize)
+
+    assert pending.result(timeout=5).receipt == {"status": 0}
+    assert forgotten.wait(5)
+    oracle.forget.assert_called_once_with(authorize)
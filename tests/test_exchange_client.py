@@ -1,3 +1,5 @@
+import json
+import socket
 from datetime import datetime
 from unittest.mock import Mock
 
@@ -11,7 +13,7 @@ from afp.dtos import (
     OrderFillFilter,
     OrderFilter,
 )
-from afp.enums import OrderSide, OrderState, TradeState
+from afp.enums import OrderSide, OrderState, OrderType, TradeState
 from afp.exceptions import (
     AuthenticationError,
     AuthorizationError,
@@ -21,11 +23,14 @@ from afp.exceptions import (
     ValidationError,
 )
 from afp.exchange import ExchangeClient
+from afp.records import LazyRecord
+from afp.schemas import Order
 
 from .fixtures import (
     make_error_response,
     make_exchange_parameters,
     make_exchange_product,
+    make_intent_data,
     make_login_submission,
     make_market_depth_data,
     make_ndjson_response,
@@ -385,6 +390,42 @@ def test_get_market_depth_data__success__returns_depth(monkeypatch):
     assert "v1/market-depth/prod123" in request.url
 
 
+def test_iter_market_depth_data__trusted__yields_lazy_records(monkeypatch):
+    """Test NDJSON streaming without model validation."""
+    depth = make_market_depth_data(product_id="prod123")
+    fake_response = make_ndjson_response([depth])
+    monkeypatch.setattr(HTTPAdapter, "send", Mock(return_value=fake_response))
+
+    client = ExchangeClient("http://test.com")
+    records = list(client.iter_market_depth_data("prod123", trusted=True))
+
+    assert len(records) == 1
+    assert isinstance(records[0], LazyRecord)
+    assert records[0].product_id == "prod123"
+    assert records[0].validate() == depth
+
+
+def test_iter_market_depth_data__connection_lost__raises_exchange_error(monkeypatch):
+    """Test that dropped streaming connections are reported as exchange errors."""
+    depth = make_market_depth_data(product_id="prod123")
+    fake_response = make_ndjson_response([])
+
+    def lines():
+        yield depth.model_dump_json().encode()
+        yield b""
+        raise requests.exceptions.ChunkedEncodingError()
+
+    fake_response.iter_lines = Mock(return_value=lines())  # type: ignore
+    monkeypatch.setattr(HTTPAdapter, "send", Mock(return_value=fake_response))
+
+    client = ExchangeClient("http://test.com")
+    stream = client.iter_market_depth_data("prod123")
+
+    assert next(stream).product_id == "prod123"
+    with pytest.raises(ExchangeError, match="Lost connection"):
+        next(stream)
+
+
 def test_iter_market_depth_data__success__yields_snapshots(monkeypatch):
     """Test NDJSON streaming for market depth data."""
     depth1 = make_market_depth_data(product_id="prod123")
@@ -626,3 +667,159 @@ def test_send_request__always_sets_content_type_header(monkeypatch):
 
     request = mock_send.call_args[0][0]
     assert request.headers["Content-Type"] == "application/json"
+
+
+def test_init__configures_connection_pool_and_socket_options():
+    """Test that the transport parameters are applied to the pooled connections."""
+    client = ExchangeClient("http://test.com", pool_size=64, tcp_keepalive=True)
+
+    adapter = client._session.get_adapter("https://test.com")
+    pool_kwargs = adapter.poolmanager.connection_pool_kw  # type: ignore
+    assert pool_kwargs["maxsize"] == 64
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in pool_kwargs["socket_options"]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in pool_kwargs["socket_options"]
+
+
+def test_init__tcp_keepalive_disabled__omits_keepalive_option():
+    """Test that TCP keep-alive can be disabled."""
+    client = ExchangeClient("http://test.com", tcp_keepalive=False)
+
+    adapter = client._session.get_adapter("http://test.com")
+    pool_kwargs = adapter.poolmanager.connection_pool_kw  # type: ignore
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) not in pool_kwargs[
+        "socket_options"
+    ]
+
+
+def test_submit_orders__mixed_outcomes__returns_results_in_input_order(monkeypatch):
+    """Test concurrent order submission with per-item results."""
+    order1 = make_order(id="order1")
+    order3 = make_order(id="order3")
+
+    def fake_send(request, **kwargs):
+        nonce = json.loads(request.body)["intent"]["data"]["nonce"]
+        if nonce == 2:
+            return make_error_response(400, "Invalid quantity")
+        return make_success_response(
+            (order1 if nonce == 1 else order3).model_dump(mode="json")
+        )
+
+    monkeypatch.setattr(HTTPAdapter, "send", Mock(side_effect=fake_send))
+
+    client = ExchangeClient("http://test.com", pool_size=2)
+    submissions = [
+        make_order_submission(
+            intent={
+                **make_order_submission().intent.model_dump(),  # type: ignore
+                "data": make_intent_data(nonce=nonce).model_dump(),
+            }
+        )
+        for nonce in (1, 2, 3)
+    ]
+    results = client.submit_orders(submissions)
+
+    assert len(results) == 3
+    assert isinstance(results[0], Order) and results[0].id == "order1"
+    assert isinstance(results[1], ValidationError)
+    assert isinstance(results[2], Order) and results[2].id == "order3"
+
+
+def test_submit_orders__empty__returns_empty_list(monkeypatch):
+    """Test that no requests are sent for an empty batch."""
+    mock_send = Mock()
+    monkeypatch.setattr(HTTPAdapter, "send", mock_send)
+
+    client = ExchangeClient("http://test.com")
+    assert client.submit_orders([]) == []
+    mock_send.assert_not_called()
+
+
+def make_retry_response(status_code: int, retry_after: str | None = None) -> Response:
+    response = make_error_response(status_code, "Unavailable")
+    response._content_consumed = True  # type: ignore
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def test_send_request__retries_idempotent_request_with_backoff(monkeypatch):
+    fake_response = make_success_response({"message": "test-nonce-12345"})
+    mock_send = Mock(
+        side_effect=[
+            requests.exceptions.ConnectionError(),
+            make_retry_response(503),
+            fake_response,
+        ]
+    )
+    monkeypatch.setattr(HTTPAdapter, "send", mock_send)
+    mock_sleep = Mock()
+    monkeypatch.setattr("afp.exchange.time.sleep", mock_sleep)
+
+    client = ExchangeClient("http://test.com", max_retries=2)
+    nonce = client.generate_login_nonce()
+
+    assert nonce == "test-nonce-12345"
+    assert mock_send.call_count == 3
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert len(delays) == 2
+    assert all(0 <= delay <= 0.2 for delay in delays)
+
+
+def test_send_request__honors_retry_after_and_gives_up(monkeypatch):
+    mock_send = Mock(return_value=make_retry_response(429, retry_after="3"))
+    monkeypatch.setattr(HTTPAdapter, "send", mock_send)
+    mock_sleep = Mock()
+    monkeypatch.setattr("afp.exchange.time.sleep", mock_sleep)
+
+    client = ExchangeClient("http://test.com", max_retries=2)
+    with pytest.raises(RateLimitExceeded):
+        client.login(make_login_submission())
+
+    assert mock_send.call_count == 3
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [3.0, 3.0]
+
+
+def test_send_request__retries_only_idempotent_order_submissions(monkeypatch):
+    order = make_order()
+    mock_send = Mock(
+        side_effect=[
+            make_retry_response(503),
+            make_success_response(order.model_dump(mode="json", by_alias=True)),
+            make_retry_response(503),
+        ]
+    )
+    monkeypatch.setattr(HTTPAdapter, "send", mock_send)
+    monkeypatch.setattr("afp.exchange.time.sleep", Mock())
+    cancellation = make_order_submission(
+        type=OrderType.CANCEL_ORDER,
+        intent=None,
+        cancellation_data={
+            "intent_hash": order.intent.hash,
+            "nonce": 1,
+            "intent_account_id": order.intent.intent_account_id,
+            "signature": "0xabcdef",
+        },
+    )
+
+    client = ExchangeClient("http://test.com", max_retries=1)
+
+    assert client.submit_order(make_order_submission()) == order
+    with pytest.raises(ExchangeError):
+        client.submit_order(cancellation)
+    assert mock_send.call_count == 3
+
+
+def test_send_request__rate_limit__delays_requests(monkeypatch):
+    fake_response = make_success_response({"message": "test-nonce-12345"})
+    monkeypatch.setattr(HTTPAdapter, "send", Mock(return_value=fake_response))
+    mock_sleep = Mock()
+    monkeypatch.setattr("afp.exchange.time.sleep", mock_sleep)
+
+    client = ExchangeClient("http://test.com", rate_limit=2)
+    for _ in range(4):
+        client.generate_login_nonce()
+
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.5, abs=0.05)
+    assert delays[3] == pytest.approx(1.0, abs=0.05)
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.contract.contract import ContractFunction
+
+from afp.bindings import ClearingDiamond, MarginAccount
+from afp.gas import FeeOracle
+
+from . import NULL_ADDRESS
+
+
+def make_w3() -> Mock:
+    w3 = Mock(spec=Web3)
+    w3.provider.make_batch_request.return_value = [
+        {"jsonrpc": "2.0", "id": 0, "result": {"baseFeePerGas": "0x64"}},
+        {"jsonrpc": "2.0", "id": 1, "result": "0x5"},
+    ]
+    return w3
+
+
+def test_fees__requests_fees_in_one_batch_per_ttl():
+    w3 = make_w3()
+    oracle = FeeOracle(w3, ttl=timedelta(minutes=1))
+
+    assert oracle.fees() == (100, 5)
+    assert oracle.fees() == (100, 5)
+
+    w3.provider.make_batch_request.assert_called_once()
+    methods = [method for method, _ in w3.provider.make_batch_request.call_args.args[0]]
+    assert methods == ["eth_getBlockByNumber", "eth_maxPriorityFeePerGas"]
+
+
+def test_fees__refreshes_fees_after_ttl():
+    w3 = make_w3()
+    oracle = FeeOracle(w3, ttl=timedelta(0))
+
+    oracle.fees()
+    oracle.fees()
+
+    assert w3.provider.make_batch_request.call_count == 2
+
+
+def test_gas__memoizes_estimates_per_function_and_array_lengths(monkeypatch):
+    mock_estimate_gas = Mock(side_effect=[1000, 2000, 3000, 4000, 5000])
+    monkeypatch.setattr(ContractFunction, "estimate_gas", mock_estimate_gas)
+    w3 = Web3()
+    margin_contract = MarginAccount(w3, NULL_ADDRESS)
+    clearing_contract = ClearingDiamond(w3, NULL_ADDRESS)
+    product_id = HexBytes("0x" + "01" * 32)
+    oracle = FeeOracle(w3, gas_multiplier=1.5)
+
+    assert oracle.gas(margin_contract.deposit(1), NULL_ADDRESS) == 1500
+    assert oracle.gas(margin_contract.deposit(2), NULL_ADDRESS) == 1500
+    assert oracle.gas(margin_contract.withdraw(1), NULL_ADDRESS) == 3000
+    settle = clearing_contract.initiate_final_settlement
+    assert oracle.gas(settle(product_id, [NULL_ADDRESS]), NULL_ADDRESS) == 4500
+    assert oracle.gas(settle(product_id, [NULL_ADDRESS] * 2), NULL_ADDRESS) == 6000
+
+    oracle.forget(margin_contract.deposit(3))
+
+    assert oracle.gas(margin_contract.deposit(1), NULL_ADDRESS) == 7500
+    assert mock_estimate_gas.call_count == 5
+
+
+def test_gas__estimates_without_holding_the_lock(monkeypatch):
+    w3 = make_w3()
+    oracle = FeeOracle(w3)
+
+    def estimate_gas(*args, **kwargs):
+        # Would deadlock if the oracle's lock were held during the estimate
+        oracle.fees()
+        return 1000
+
+    monkeypatch.setattr(ContractFunction, "estimate_gas", estimate_gas)
+    margin_contract = MarginAccount(Web3(), NULL_ADDRESS)
+
+    assert oracle.gas(margin_contract.deposit(1), NULL_ADDRESS) == 1200
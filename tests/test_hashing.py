@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import UTC, datetime
 from decimal import Decimal
 from typing import cast
 
 import eth_account
 from eth_typing.evm import ChecksumAddress
+import pytest
 from hexbytes import HexBytes
 
 from afp import hashing
@@ -42,6 +43,112 @@ def test_generate_intent_hash():
     assert actual_hash == expected_hash
 
 
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"side": OrderSide.BID, "nonce": 2**256 - 1},
+        {"limit_price": Decimal("-12.345"), "quantity": 10**30},
+        {
+            "max_trading_fee_rate": Decimal("0.000001"),
+            "good_until_time": datetime.fromtimestamp(0, UTC),
+        },
+        {"referral": "0x44163AaD36b0f6986fd09D0d6AD990F0341F16E7"},
+    ],
+)
+def test_IntentHasher__matches_generate_intent_hash(overrides):
+    intent_data = IntentData(
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        product_id="0xa74b5c2da3083e4189f56b2582c4455d21bbbd199d7699fc6ebddd82e8fd02b5",
+        limit_price=Decimal("1.0"),
+        quantity=1,
+        max_trading_fee_rate=Decimal("0.1"),
+        side=OrderSide.ASK,
+        good_until_time=datetime.fromisoformat("2030-01-01T12:00:00Z"),
+        nonce=42,
+        referral="0x0000000000000000000000000000000000000000",
+    ).model_copy(update=overrides)
+    margin_account_id = cast(
+        ChecksumAddress, "0x51541B823f9C28e8E43E18c0F0d50B405FCB8aD4"
+    )
+    intent_account_id = cast(
+        ChecksumAddress, "0x44163AaD36b0f6986fd09D0d6AD990F0341F16E7"
+    )
+    hasher = hashing.IntentHasher(
+        margin_account_id=margin_account_id,
+        intent_account_id=intent_account_id,
+        trading_protocol_id=intent_data.trading_protocol_id,
+        product_id=intent_data.product_id,
+        tick_size=3,
+    )
+
+    assert hasher.hash(intent_data) == hashing.generate_intent_hash(
+        intent_data=intent_data,
+        margin_account_id=margin_account_id,
+        intent_account_id=intent_account_id,
+        tick_size=3,
+    )
+
+
+def test_IntentHasher__rejects_other_product():
+    hasher = hashing.IntentHasher(
+        margin_account_id=cast(ChecksumAddress, "0x" + "11" * 20),
+        intent_account_id=cast(ChecksumAddress, "0x" + "11" * 20),
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        product_id="0x" + "22" * 32,
+        tick_size=0,
+    )
+    intent_data = IntentData(
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        product_id="0x" + "33" * 32,
+        limit_price=Decimal("1"),
+        quantity=1,
+        max_trading_fee_rate=Decimal("0"),
+        side=OrderSide.ASK,
+        good_until_time=datetime.fromisoformat("2030-01-01T12:00:00Z"),
+        nonce=1,
+        referral="0x0000000000000000000000000000000000000000",
+    )
+
+    with pytest.raises(ValueError):
+        hasher.hash(intent_data)
+
+
+@pytest.mark.parametrize("referral", ["0x1234", "0x" + "zz" * 20, "0x" + "11" * 32])
+def test_IntentHasher__rejects_malformed_referral(referral):
+    hasher = hashing.IntentHasher(
+        margin_account_id=cast(ChecksumAddress, "0x" + "11" * 20),
+        intent_account_id=cast(ChecksumAddress, "0x" + "11" * 20),
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        product_id="0x" + "22" * 32,
+        tick_size=0,
+    )
+    intent_data = IntentData.model_construct(
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        product_id="0x" + "22" * 32,
+        limit_price=Decimal("1"),
+        quantity=1,
+        max_trading_fee_rate=Decimal("0"),
+        side=OrderSide.ASK,
+        good_until_time=datetime.fromisoformat("2030-01-01T12:00:00Z"),
+        nonce=1,
+        referral=referral,
+    )
+
+    with pytest.raises(ValueError):
+        hasher.hash(intent_data)
+    with pytest.raises(ValueError):
+        hasher.hash_batch(
+            [1],
+            [1],
+            [1],
+            side=OrderSide.ASK,
+            max_trading_fee_rate=Decimal("0"),
+            good_until_time=datetime.fromisoformat("2030-01-01T12:00:00Z"),
+            referral=referral,
+        )
+
+
 def test_generate_order_cancellation_hash():
     intent_hash = "0x9540b615aa488fb276c71231926d81b2d5f1d43711d306c630df1cf86c81ed88"
     nonce = 42
@@ -64,3 +171,64 @@ def test_generate_product_id():
     )
     actual_hash = hashing.generate_product_id(builder.address, symbol)
     assert actual_hash == expected_hash
+
+
+def test_IntentHasher__hash_batch__matches_hash():
+    referral = "0x44163AaD36b0f6986fd09D0d6AD990F0341F16E7"
+    hasher = hashing.IntentHasher(
+        margin_account_id=cast(ChecksumAddress, referral),
+        intent_account_id=cast(ChecksumAddress, referral),
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        product_id="0x" + "22" * 32,
+        tick_size=2,
+    )
+    limit_prices = [1, 12345, -250, 2**62]
+    intents = [
+        IntentData(
+            trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+            product_id="0x" + "22" * 32,
+            limit_price=Decimal(limit_price) / 100,
+            quantity=7,
+            max_trading_fee_rate=Decimal("0.002"),
+            side=OrderSide.BID,
+            good_until_time=datetime.fromisoformat("2030-01-01T12:00:00Z"),
+            nonce=nonce,
+            referral=referral,
+        )
+        for nonce, limit_price in enumerate(limit_prices)
+    ]
+
+    digests = hasher.hash_batch(
+        range(len(limit_prices)),
+        limit_prices,
+        7,
+        side=OrderSide.BID,
+        max_trading_fee_rate=Decimal("0.002"),
+        good_until_time=datetime.fromisoformat("2030-01-01T12:00:00Z"),
+        referral=referral,
+    )
+
+    assert digests.shape == (4, 32)
+    assert [HexBytes(digest.tobytes()) for digest in digests] == [
+        hasher.hash(intent_data) for intent_data in intents
+    ]
+
+
+def test_IntentHasher__hash_batch__rejects_negative_quantities():
+    hasher = hashing.IntentHasher(
+        margin_account_id=cast(ChecksumAddress, "0x" + "11" * 20),
+        intent_account_id=cast(ChecksumAddress, "0x" + "11" * 20),
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        product_id="0x" + "22" * 32,
+        tick_size=0,
+    )
+
+    with pytest.raises(ValueError):
+        hasher.hash_batch(
+            [1, 2],
+            [100, 101],
+            [1, -1],
+            side=OrderSide.ASK,
+            max_trading_fee_rate=Decimal("0"),
+            good_until_time=datetime.fromisoformat("2030-01-01T12:00:00Z"),
+        )
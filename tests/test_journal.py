@@ -0,0 +1,94 @@
+from datetime import UTC, datetime
+from unittest.mock import Mock
+
+import pytest
+
+from afp.enums import TradeState
+from afp.journal import Journal
+
+from .fixtures import make_order, make_order_fill, make_trade
+
+
+def order_fill(order_id, trade_id, timestamp, state=TradeState.CLEARED, **trade):
+    return make_order_fill(
+        order=make_order(id=order_id).model_dump(),
+        trade=make_trade(
+            id=trade_id, timestamp=timestamp, state=state, **trade
+        ).model_dump(),
+    )
+
+
+@pytest.fixture
+def journal():
+    with Journal(":memory:") as journal:
+        yield journal
+
+
+def test_add__stores_and_merges_state_transitions(journal):
+    assert journal.add([order_fill("a", "1", 100, TradeState.PENDING)]) == 1
+    assert journal.add([order_fill("a", "1", 100, TradeState.PENDING)]) == 0
+    assert journal.add([order_fill("a", "1", 100, TradeState.CLEARED)]) == 1
+    # Final states are not reverted by stale updates
+    assert journal.add([order_fill("a", "1", 100, TradeState.PENDING)]) == 0
+
+    (stored,) = journal.order_fills()
+    assert stored == order_fill("a", "1", 100, TradeState.CLEARED)
+    assert len(journal) == 1
+
+
+def test_order_fills__filters_and_sorts(journal):
+    other_product_id = "0x" + "ab" * 32
+    journal.add(
+        [
+            order_fill("a", "1", 100),
+            order_fill("a", "2", 200, TradeState.REJECTED),
+            order_fill("b", "3", 300, product_id=other_product_id),
+        ]
+    )
+
+    def trade_ids(**kwargs):
+        return [fill.trade.id for fill in journal.order_fills(**kwargs)]
+
+    assert trade_ids() == ["3", "2", "1"]
+    assert trade_ids(newest_first=False, limit=2) == ["1", "2"]
+    assert trade_ids(product_id=other_product_id) == ["3"]
+    assert trade_ids(trade_states=["cleared"]) == ["3", "1"]
+    assert trade_ids(
+        start=datetime.fromtimestamp(150, UTC), end=datetime.fromtimestamp(300, UTC)
+    ) == ["3", "2"]
+
+
+def test_cursor__starts_from_earliest_pending_fill(journal):
+    assert journal.cursor is None
+
+    journal.add([order_fill("a", "1", 100), order_fill("a", "2", 300)])
+    assert journal.cursor == datetime.fromtimestamp(300, UTC)
+
+    journal.add([order_fill("b", "3", 200, TradeState.PENDING)])
+    assert journal.cursor == datetime.fromtimestamp(200, UTC)
+
+
+def test_sync__requests_order_fills_since_cursor(journal):
+    trading = Mock()
+    trading.iter_all_order_fills.return_value = iter(
+        [order_fill("a", "1", 100), order_fill("a", "2", 200, TradeState.PENDING)]
+    )
+    assert journal.sync(trading) == 2
+    trading.iter_all_order_fills.assert_called_once_with(start=None)
+
+    trading.iter_all_order_fills.return_value = iter(
+        [order_fill("a", "2", 200), order_fill("b", "3", 300)]
+    )
+    assert journal.sync(trading) == 2
+    trading.iter_all_order_fills.assert_called_with(
+        start=datetime.fromtimestamp(200, UTC)
+    )
+
+
+def test_journal__persists_across_connections(tmp_path):
+    path = tmp_path / "journal.db"
+    with Journal(path) as journal:
+        journal.add([order_fill("a", "1", 100)])
+
+    with Journal(path) as journal:
+        assert [fill.trade.id for fill in journal.order_fills()] == ["1"]
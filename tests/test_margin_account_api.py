@@ -0,0 +1,78 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+from hexbytes import HexBytes
+from web3 import HTTPProvider
+from web3.eth import Eth
+
+import afp
+from afp.bindings import MarginAccount as MarginContract, SystemViewer
+from afp.bindings.system_viewer import PositionData
+
+from . import NULL_ADDRESS, AuthenticatorStub
+
+
+def test_summary__reads_all_values_in_one_batch_at_same_block(monkeypatch):
+    amounts = [1000, 900, 500, 400, -100, 300]
+    mock_batch_request = Mock(
+        return_value=[
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "result": "0x" + amount.to_bytes(32, signed=True).hex(),
+            }
+            for i, amount in enumerate(amounts)
+        ]
+    )
+    monkeypatch.setattr(HTTPProvider, "make_batch_request", mock_batch_request)
+    monkeypatch.setattr(Eth, "block_number", 16)
+    app = afp.AFP(authenticator=AuthenticatorStub(), rpc_url="http://summary")
+    margin_account = app.MarginAccount()
+    monkeypatch.setattr(margin_account, "_decimals", Mock(return_value=2))
+    monkeypatch.setattr(
+        margin_account, "_margin_contract_address", Mock(return_value=NULL_ADDRESS)
+    )
+
+    summary = margin_account.summary(NULL_ADDRESS)
+
+    assert summary.block_number == 16
+    assert summary.capital == Decimal("10")
+    assert summary.equity == Decimal("9")
+    assert summary.maintenance_margin_available == Decimal("5")
+    assert summary.maintenance_margin_used == Decimal("4")
+    assert summary.profit_and_loss == Decimal("-1")
+    assert summary.withdrawable_amount == Decimal("3")
+    mock_batch_request.assert_called_once()
+    requests = mock_batch_request.call_args.args[0]
+    assert len(requests) == 6
+    assert all(method == "eth_call" for method, _ in requests)
+    assert all(params[1] == "0x10" for _, params in requests)
+
+
+def test_positions__reads_all_positions_in_one_call(monkeypatch):
+    product_ids = [HexBytes("0x" + "01" * 32), HexBytes("0x" + "02" * 32)]
+    mock_positions = Mock(
+        return_value=[
+            [
+                PositionData(product_ids[0], 5, 1000, 200, 50),
+                PositionData(product_ids[1], -3, 600, 100, -20),
+            ]
+        ]
+    )
+    monkeypatch.setattr(SystemViewer, "positions_by_collateral_asset", mock_positions)
+    monkeypatch.setattr(MarginContract, "position_data", Mock())
+    app = afp.AFP(authenticator=AuthenticatorStub(), rpc_url="http://positions")
+    margin_account = app.MarginAccount()
+    monkeypatch.setattr(margin_account, "_decimals", Mock(return_value=2))
+
+    positions = margin_account.positions(NULL_ADDRESS)
+
+    assert [position.id for position in positions] == [
+        product_id.to_0x_hex() for product_id in product_ids
+    ]
+    assert positions[1].quantity == -3
+    assert positions[1].cost_basis == Decimal("6")
+    assert positions[1].maintenance_margin == Decimal("1")
+    assert positions[1].pnl == Decimal("-0.2")
+    mock_positions.assert_called_once_with(NULL_ADDRESS, [NULL_ADDRESS])
+    MarginContract.position_data.assert_not_called()  # type: ignore
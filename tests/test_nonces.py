@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from afp.nonces import (
+    NONCE_LIMIT,
+    LeasedNonceAllocator,
+    RandomNonceAllocator,
+    RangeNonceAllocator,
+)
+
+
+def test_random_nonce_allocator__stays_in_range():
+    allocator = RandomNonceAllocator()
+
+    assert all(0 <= allocator.allocate() < NONCE_LIMIT for _ in range(100))
+
+
+def test_range_nonce_allocator__allocates_consecutive_nonces():
+    allocator = RangeNonceAllocator(10, 13)
+
+    assert [allocator.allocate() for _ in range(3)] == [10, 11, 12]
+    with pytest.raises(RuntimeError):
+        allocator.allocate()
+
+
+def test_range_nonce_allocator__for_process__splits_range():
+    first = RangeNonceAllocator.for_process(0, 4, 0)
+    last = RangeNonceAllocator.for_process(3, 4, 0)
+
+    assert first.allocate() == 0
+    assert last.allocate() == 3 * (NONCE_LIMIT // 4)
+    with pytest.raises(ValueError):
+        RangeNonceAllocator.for_process(4, 4, 0)
+    with pytest.raises(ValueError):
+        RangeNonceAllocator.for_process(0, 4, NONCE_LIMIT // 4)
+    with pytest.raises(ValueError):
+        RangeNonceAllocator(0, NONCE_LIMIT + 1)
+
+
+def test_range_nonce_allocator__for_process__resumes_after_restart():
+    start = NONCE_LIMIT // 4
+    allocator = RangeNonceAllocator.for_process(1, 4, 0)
+    used = [allocator.allocate() for _ in range(3)]
+
+    restarted = RangeNonceAllocator.for_process(1, 4, allocator.next - start)
+
+    assert restarted.allocate() == used[-1] + 1
+
+
+def test_leased_nonce_allocator__allocates_disjoint_nonces(tmp_path):
+    path = tmp_path / "nonces.db"
+    with (
+        LeasedNonceAllocator(path, lease_size=10) as first,
+        LeasedNonceAllocator(path, lease_size=10) as second,
+    ):
+        with ThreadPoolExecutor(4) as executor:
+            nonces = list(
+                executor.map(
+                    lambda i: (first if i % 2 else second).allocate(), range(100)
+                )
+            )
+        other_key = LeasedNonceAllocator(path, key="other", lease_size=10)
+        assert other_key.allocate() == 0
+        other_key.close()
+
+    assert len(set(nonces)) == 100
+
+    with LeasedNonceAllocator(path, lease_size=10) as restarted:
+        assert restarted.allocate() > max(nonces)
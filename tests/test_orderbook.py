@@ -0,0 +1,117 @@
+from decimal import Decimal
+
+import pytest
+
+from afp.enums import OrderSide
+from afp.orderbook import LevelChange, OrderBook, PriceLevel
+
+from .fixtures import make_market_depth_data, make_market_depth_item
+
+
+PRODUCT_ID = "0x1234567890123456789012345678901234567890123456789012345678901234"
+
+
+def make_depth(bids, asks):
+    return make_market_depth_data(
+        product_id=PRODUCT_ID,
+        bids=[
+            make_market_depth_item(price=Decimal(p), quantity=q).model_dump()
+            for p, q in bids
+        ],
+        asks=[
+            make_market_depth_item(price=Decimal(p), quantity=q).model_dump()
+            for p, q in asks
+        ],
+    )
+
+
+@pytest.fixture
+def book() -> OrderBook:
+    book = OrderBook(PRODUCT_ID)
+    book.apply(
+        make_depth(
+            bids=[("99", 5), ("100", 10), ("98", 20)],
+            asks=[("102", 15), ("101", 10), ("103", 25)],
+        )
+    )
+    return book
+
+
+def test_apply__sorts_levels_from_best_price(book):
+    assert book.best_bid == PriceLevel(Decimal("100"), 10)
+    assert book.best_ask == PriceLevel(Decimal("101"), 10)
+    assert book.spread == Decimal("1")
+    assert book.mid_price == Decimal("100.5")
+    assert [level.price for level in book.levels(OrderSide.BID)] == [
+        Decimal("100"),
+        Decimal("99"),
+        Decimal("98"),
+    ]
+    assert book.levels(OrderSide.ASK, depth=2) == [
+        PriceLevel(Decimal("101"), 10),
+        PriceLevel(Decimal("102"), 15),
+    ]
+
+
+def test_apply__returns_level_changes(book):
+    changes = book.apply(
+        make_depth(
+            bids=[("100", 10), ("99", 7), ("98", 20)],
+            asks=[("101.5", 3), ("102", 15), ("103", 25)],
+        )
+    )
+
+    assert changes == [
+        LevelChange(OrderSide.BID, Decimal("99"), 7, 5),
+        LevelChange(OrderSide.ASK, Decimal("101"), 0, 10),
+        LevelChange(OrderSide.ASK, Decimal("101.5"), 3, 0),
+    ]
+    assert book.best_ask == PriceLevel(Decimal("101.5"), 3)
+    assert book.quantity_at(OrderSide.BID, Decimal("99")) == 7
+    assert book.quantity_at(OrderSide.ASK, Decimal("101")) == 0
+
+
+def test_apply__unchanged_snapshot__returns_no_changes(book):
+    snapshot = make_depth(
+        bids=[("100", 10), ("99", 5), ("98", 20)],
+        asks=[("101", 10), ("102", 15), ("103", 25)],
+    )
+    assert book.apply(snapshot) == []
+
+
+def test_apply__other_product__raises_error(book):
+    with pytest.raises(ValueError):
+        book.apply(make_market_depth_data(product_id="0x" + "ab" * 32))
+
+
+def test_consume__yields_changes_per_snapshot():
+    book = OrderBook()
+    stream = [make_depth([("100", 1)], []), make_depth([], [])]
+
+    assert [len(changes) for changes in book.consume(stream)] == [1, 1]
+    assert book.product_id == PRODUCT_ID
+    assert book.best_bid is None
+    assert book.spread is None
+
+
+def test_quantity_within__sums_levels_at_limit_price_or_better(book):
+    assert book.quantity_within(OrderSide.BID, Decimal("99")) == 15
+    assert book.quantity_within(OrderSide.BID, Decimal("100.5")) == 0
+    assert book.quantity_within(OrderSide.ASK, Decimal("102.5")) == 25
+    assert book.quantity_within(OrderSide.ASK, Decimal("1000")) == 50
+
+
+def test_depth_to_quantity__returns_worst_price_reached(book):
+    assert book.depth_to_quantity(OrderSide.ASK, 10) == Decimal("101")
+    assert book.depth_to_quantity(OrderSide.ASK, 11) == Decimal("102")
+    assert book.depth_to_quantity(OrderSide.BID, 35) == Decimal("98")
+    assert book.depth_to_quantity(OrderSide.BID, 36) is None
+
+
+def test_vwap__returns_average_fill_price(book):
+    assert book.vwap(OrderSide.ASK, 10) == Decimal("101")
+    assert book.vwap(OrderSide.ASK, 20) == Decimal("101.5")
+    assert book.vwap(OrderSide.BID, 12) == Decimal("1198") / 12
+    assert book.vwap(OrderSide.ASK, 51) is None
+    with pytest.raises(ValueError):
+        book.vwap(OrderSide.ASK, 0)
@@ -0,0 +1,135 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from afp.enums import OrderSide, OrderState, OrderType
+from afp.exceptions import ExchangeError
+from afp.ordermanager import OrderManager
+
+from .fixtures import make_intent_data, make_order, make_order_fill
+
+PRODUCT_ID = "0x1234567890123456789012345678901234567890123456789012345678901234"
+
+
+def order(
+    intent_hash,
+    state=OrderState.OPEN,
+    fill_quantity=0,
+    side=OrderSide.BID,
+    limit_price="100",
+    quantity=10,
+    timestamp=1700000000,
+    product_id=PRODUCT_ID,
+):
+    return make_order(
+        id=f"order-{intent_hash}",
+        state=state,
+        fill_quantity=fill_quantity,
+        timestamp=timestamp,
+        intent={
+            **make_order().intent.model_dump(),
+            "hash": intent_hash,
+            "data": make_intent_data(
+                product_id=product_id,
+                side=side,
+                limit_price=Decimal(limit_price),
+                quantity=quantity,
+            ).model_dump(),
+        },
+    )
+
+
+@pytest.fixture
+def manager():
+    with OrderManager(Mock()) as manager:
+        yield manager
+
+
+def test_apply__maintains_resting_quantities(manager):
+    manager.apply_all(
+        [
+            order("0x01", limit_price="100"),
+            order("0x02", limit_price="100", quantity=5),
+            order("0x03", limit_price="101"),
+            order("0x04", side=OrderSide.ASK),
+        ]
+    )
+
+    assert len(manager) == 4
+    assert manager.resting_quantity(PRODUCT_ID, OrderSide.BID) == 25
+    assert manager.resting_quantity(PRODUCT_ID, OrderSide.BID, Decimal("100")) == 15
+    assert manager.resting_quantity(PRODUCT_ID, OrderSide.ASK) == 10
+
+    assert manager.apply(order("0x01", OrderState.PARTIAL, fill_quantity=4))
+    assert manager.apply(order("0x02", OrderState.CANCELLED))
+
+    assert manager.resting_quantity(PRODUCT_ID, OrderSide.BID) == 16
+    assert manager.price_levels(PRODUCT_ID, OrderSide.BID) == {
+        Decimal("100"): 6,
+        Decimal("101"): 10,
+    }
+    assert manager.order("0x02") is None
+    assert sorted(manager.intent_hashes(PRODUCT_ID, OrderSide.BID)) == ["0x01", "0x03"]
+
+
+def test_apply__ignores_stale_updates(manager):
+    manager.apply(order("0x01", OrderState.PARTIAL, fill_quantity=4))
+
+    assert not manager.apply(order("0x01", OrderState.OPEN))
+    assert not manager.apply(order("0x01", OrderState.PARTIAL, fill_quantity=2))
+    assert manager.apply(order("0x01", OrderState.COMPLETED, fill_quantity=10))
+    # Finished orders are not resurrected by late updates
+    assert not manager.apply(order("0x01", OrderState.PARTIAL, fill_quantity=6))
+    assert len(manager) == 0
+    assert manager.resting_quantity(PRODUCT_ID, OrderSide.BID) == 0
+
+
+def test_apply__ignores_cancellations_and_other_products():
+    manager = OrderManager(Mock(), product_id=PRODUCT_ID)
+
+    assert not manager.apply(
+        order("0x01").model_copy(update={"type": OrderType.CANCEL_ORDER})
+    )
+    assert not manager.apply(order("0x02", product_id="0x" + "ab" * 32))
+    assert len(manager) == 0
+
+
+def test_consume__applies_order_fills(manager):
+    manager.apply(order("0x01"))
+    fills = [
+        make_order_fill(
+            order=order("0x01", OrderState.PARTIAL, fill_quantity=3).model_dump()
+        )
+    ]
+
+    assert list(manager.consume(fills)) == fills
+    assert manager.resting_quantity(PRODUCT_ID, OrderSide.BID) == 7
+
+
+def test_reconcile__removes_orders_missing_on_exchange(manager):
+    manager.apply_all([order("0x01"), order("0x02"), order("0x03")])
+    manager._trading.iter_all_orders.return_value = iter(
+        [order("0x01", OrderState.PARTIAL, fill_quantity=1), order("0x04")]
+    )
+
+    assert manager.reconcile() == 4
+    assert {o.intent.hash for o in manager.orders()} == {"0x01", "0x04"}
+    assert manager.resting_quantity(PRODUCT_ID, OrderSide.BID) == 19
+    manager._trading.iter_all_orders.assert_called_once()
+
+
+def test_submit_many_and_cancel_all(manager):
+    manager._trading.submit_limit_orders.return_value = [
+        order("0x01"),
+        ExchangeError("rejected"),
+        order("0x03", side=OrderSide.ASK),
+    ]
+    results = manager.submit_many([Mock(), Mock(), Mock()])
+    assert isinstance(results[1], ExchangeError)
+    assert len(manager) == 2
+
+    cancellation = Mock()
+    manager._trading.submit_cancel_orders.return_value = [cancellation]
+    assert manager.cancel_all(PRODUCT_ID, OrderSide.ASK) == {"0x03": cancellation}
+    manager._trading.submit_cancel_orders.assert_called_once_with(["0x03"])
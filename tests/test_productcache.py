@@ -0,0 +1,117 @@
+import threading
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from afp.enums import ListingState
+from afp.exceptions import ExchangeError, NotFoundError
+from afp.productcache import ListingChange, ProductCache
+
+from .fixtures import make_exchange_product
+
+BTC_ID = "0x" + "01" * 32
+ETH_ID = "0x" + "02" * 32
+
+
+def serve(*snapshots):
+    trading = Mock()
+    trading.iter_all_products.side_effect = [iter(products) for products in snapshots]
+    return trading
+
+
+def test_product__loads_all_products_once():
+    btc = make_exchange_product(id=BTC_ID, symbol="BTCUSD")
+    eth = make_exchange_product(id=ETH_ID, symbol="ETHUSD")
+    trading = serve([btc, eth])
+
+    with ProductCache(trading) as cache:
+        assert cache.product(BTC_ID) == btc
+        assert cache.product_by_symbol("ethusd") == eth
+        assert cache.products() == [btc, eth]
+
+    trading.iter_all_products.assert_called_once()
+    trading.product.assert_not_called()
+
+
+def test_product__reloads_once_for_unknown_product():
+    btc = make_exchange_product(id=BTC_ID, symbol="BTCUSD")
+    eth = make_exchange_product(id=ETH_ID, symbol="ETHUSD")
+    trading = serve([btc], [btc, eth], [btc, eth])
+
+    cache = ProductCache(trading)
+    cache.product(BTC_ID)
+
+    assert cache.product(ETH_ID) == eth
+    with pytest.raises(NotFoundError):
+        cache.product_by_symbol("SOLUSD")
+    assert trading.iter_all_products.call_count == 3
+
+
+def test_product__serves_stale_products_while_refreshing():
+    old = make_exchange_product(id=BTC_ID, max_price=1000)
+    new = make_exchange_product(
+        id=BTC_ID, max_price=2000, listing_state=ListingState.READ_ONLY
+    )
+    release = threading.Event()
+    refreshed = threading.Event()
+
+    def load_new():
+        release.wait(5)
+        return iter([new])
+
+    trading = serve([old])
+    cache = ProductCache(trading, ttl=timedelta(0))
+    cache.product(BTC_ID)
+    trading.iter_all_products.side_effect = load_new
+    cache.add_listener(lambda change: refreshed.set())
+
+    assert cache.product(BTC_ID) == old
+    assert cache.product(BTC_ID) == old
+    release.set()
+    assert refreshed.wait(5)
+    assert cache.product(BTC_ID) == new
+    assert trading.iter_all_products.call_count <= 3
+
+
+def test_refresh__reports_listing_changes():
+    btc = make_exchange_product(id=BTC_ID, symbol="BTCUSD")
+    eth = make_exchange_product(id=ETH_ID, symbol="ETHUSD")
+    delisted = make_exchange_product(
+        id=BTC_ID, symbol="BTCUSD", listing_state=ListingState.DELISTED
+    )
+    trading = serve([btc, eth], [delisted, eth], [delisted])
+    changes: list[ListingChange] = []
+
+    cache = ProductCache(trading)
+    cache.add_listener(changes.append)
+    cache.refresh()
+    cache.refresh()
+    cache.refresh()
+
+    assert changes == [
+        ListingChange(BTC_ID, "BTCUSD", ListingState.PUBLIC, None),
+        ListingChange(ETH_ID, "ETHUSD", ListingState.PUBLIC, None),
+        ListingChange(BTC_ID, "BTCUSD", ListingState.DELISTED, ListingState.PUBLIC),
+        ListingChange(ETH_ID, "ETHUSD", None, ListingState.PUBLIC),
+    ]
+
+
+def test_start_refresh__records_errors():
+    trading = Mock()
+    error = ExchangeError("Unavailable")
+    failed = threading.Event()
+
+    def fail():
+        failed.set()
+        raise error
+
+    trading.iter_all_products.side_effect = fail
+
+    with ProductCache(trading) as cache:
+        cache.start_refresh(timedelta(milliseconds=1))
+        assert failed.wait(5)
+        with pytest.raises(RuntimeError):
+            cache.start_refresh(timedelta(seconds=1))
+
+    assert cache.refresh_error is error
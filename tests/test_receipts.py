@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import Future
+from unittest.mock import Mock
+
+import pytest
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+
+from afp.receipts import ReceiptPoller
+from afp.schemas import Transaction
+
+HASH_1 = HexBytes("0x" + "01" * 32)
+HASH_2 = HexBytes("0x" + "02" * 32)
+
+
+def make_receipt(tx_hash: HexBytes) -> dict[str, object]:
+    return {
+        "transactionHash": tx_hash.to_0x_hex(),
+        "blockNumber": "0x10",
+        "status": "0x1",
+        "gasUsed": "0x5208",
+    }
+
+
+def make_w3(*batches):
+    w3 = Mock(spec=Web3)
+    w3.provider.make_batch_request.side_effect = [
+        [{"jsonrpc": "2.0", "id": i, "result": result} for i, result in enumerate(b)]
+        for b in batches
+    ]
+    return w3
+
+
+def test_poll__batches_receipt_requests_of_pending_transactions():
+    w3 = make_w3([None, make_receipt(HASH_2)], [make_receipt(HASH_1)])
+    poller = ReceiptPoller(w3, interval=60)
+    first = poller.watch(HASH_1, {"nonce": 1}, timeout=60)
+    second = poller.watch(HASH_2, {"nonce": 2}, timeout=60)
+
+    poller.poll()
+
+    assert not first.done()
+    assert second.result(0).receipt["blockNumber"] == 16
+    assert second.result(0).data == {"nonce": 2}
+
+    poller.poll()
+
+    assert first.result(0).hash == HASH_1.to_0x_hex()
+    assert len(poller) == 0
+    requests = w3.provider.make_batch_request.call_args_list
+    assert [len(call.args[0]) for call in requests] == [2, 1]
+    assert requests[0].args[0][0] == (
+        "eth_getTransactionReceipt",
+        [HASH_1.to_0x_hex()],
+    )
+
+
+def test_poll__fails_transactions_after_timeout():
+    w3 = make_w3([None])
+    poller = ReceiptPoller(w3, interval=60)
+    pending = poller.watch(HASH_1, {}, timeout=0)
+
+    poller.poll()
+
+    with pytest.raises(TimeExhausted):
+        pending.result(0)
+
+
+def test_watch__resolves_callbacks_from_background_thread():
+    w3 = make_w3([None], [make_receipt(HASH_1)])
+    poller = ReceiptPoller(w3, interval=0.01)
+    resolved = threading.Event()
+    results: list[Future[Transaction]] = []
+
+    def callback(pending: Future[Transaction]) -> None:
+        results.append(pending)
+        resolved.set()
+
+    poller.watch(HASH_1, {}, timeout=60).add_done_callback(callback)
+
+    assert resolved.wait(5)
+    assert results[0].result().receipt["status"] == 1
+
+
+def test_watch__resolves_transactions_after_cancellation():
+    w3 = make_w3([None, None], [make_receipt(HASH_1), make_receipt(HASH_2)])
+    poller = ReceiptPoller(w3, interval=0.01)
+    cancelled = poller.watch(HASH_1, {}, timeout=60)
+    pending = poller.watch(HASH_2, {}, timeout=60)
+
+    assert cancelled.cancel()
+
+    assert pending.result(5).hash == HASH_2.to_0x_hex()
+    assert cancelled.cancelled()
+    assert len(poller) == 0
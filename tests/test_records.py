@@ -0,0 +1,63 @@
+from datetime import datetime, UTC
+from decimal import Decimal
+
+import pydantic
+import pytest
+
+from afp.enums import TradeState
+from afp.records import LazyRecord
+from afp.schemas import OrderFill, Trade
+
+from .fixtures import make_order_fill, make_trade
+
+
+def test_from_json__validates_fields_on_access():
+    order_fill = make_order_fill(
+        trade=make_trade(id="42", state=TradeState.PENDING).model_dump()
+    )
+    record = LazyRecord.from_json(OrderFill, order_fill.model_dump_json(by_alias=True))
+
+    assert record.quantity == order_fill.quantity
+    assert record.price == Decimal("50000")
+    assert record.trade.state == TradeState.PENDING
+    assert record.trade.timestamp == datetime.fromtimestamp(1700000000, UTC)
+    assert (
+        record.order.intent.data.limit_price == order_fill.order.intent.data.limit_price
+    )
+    assert record.validate() == order_fill
+
+
+def test_from_json__returns_nested_models_as_lazy_records():
+    record = LazyRecord.from_json(
+        OrderFill, make_order_fill().model_dump_json(by_alias=True)
+    )
+
+    assert isinstance(record.trade, LazyRecord)
+    assert record.raw["tradingFeeRate"] == "0.001"
+
+
+def test_getattr__invalid_field__raises_validation_error():
+    data = make_trade().model_dump(mode="json", by_alias=True)
+    record = LazyRecord(Trade, {**data, "state": "UNKNOWN"})
+
+    assert record.price == Decimal("50000")
+    with pytest.raises(pydantic.ValidationError):
+        record.state
+    with pytest.raises(pydantic.ValidationError):
+        record.validate()
+
+
+def test_getattr__missing_field__raises_validation_error():
+    data = make_trade().model_dump(mode="json", by_alias=True)
+    del data["price"]
+    record = LazyRecord(Trade, data)
+
+    with pytest.raises(pydantic.ValidationError):
+        record.price
+
+
+def test_getattr__unknown_attribute__raises_attribute_error():
+    record = LazyRecord(Trade, make_trade().model_dump(mode="json", by_alias=True))
+
+    with pytest.raises(AttributeError):
+        record.foo
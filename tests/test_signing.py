@@ -24,3 +24,14 @@ def test_KeyfileAuthenticator():
     assert authenticator.sign_message(b"foobar") == HexBytes(
         "0x32b31738559341bdcdd56ef3bb38dbbb9f218d3ac7b84c0118e364c1e036dc1c07d82f0bc9b2c6428966b7a2a10689ae047b8e765df3b66f5c16e90e20632b681b"
     )
+
+
+def test_PrivateKeyAuthenticator__sign_messages():
+    authenticator = afp.PrivateKeyAuthenticator(
+        "0x93f2348b2b890be53f55344b7b118b53778440eea0dc84a6f86fb6e7f6bd77a6"
+    )
+    messages = [b"foobar", b"", bytes(32), bytes(range(100))]
+
+    assert authenticator.sign_messages(messages) == [
+        authenticator.sign_message(message) for message in messages
+    ]
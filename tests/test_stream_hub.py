@@ -0,0 +1,219 @@
+import asyncio
+import time
+from typing import Any, Callable
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+import afp
+from afp.enums import OverflowPolicy, TradeState
+from afp.exceptions import ExchangeError, NotFoundError
+from afp.exchange import AsyncExchangeClient
+
+from . import AuthenticatorStub
+from .fixtures import (
+    make_exchange_parameters,
+    make_market_depth_data,
+    make_order_fill,
+    make_trade,
+)
+
+
+PRODUCT_ID = "0x1234567890123456789012345678901234567890123456789012345678901234"
+
+
+@pytest.fixture
+def app(monkeypatch) -> afp.AFP:
+    monkeypatch.setattr(
+        AsyncExchangeClient, "generate_login_nonce", AsyncMock(return_value="12345678")
+    )
+    monkeypatch.setattr(
+        AsyncExchangeClient,
+        "login",
+        AsyncMock(return_value=make_exchange_parameters()),
+    )
+    return afp.AFP(authenticator=AuthenticatorStub())
+
+
+def wait_until(condition: Callable[[], Any], timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def mock_market_depth_stream(monkeypatch, count: int) -> Mock:
+    state = {"cancelled": False}
+
+    async def fake_iter_market_depth_data(self, product_id):
+        try:
+            for i in range(count):
+                yield make_market_depth_data(product_id=str(i))
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    mock = Mock(side_effect=fake_iter_market_depth_data, state=state)
+    monkeypatch.setattr(
+        AsyncExchangeClient,
+        "iter_market_depth_data",
+        lambda self, product_id: mock(self, product_id),
+    )
+    return mock
+
+
+def test_market_depth__subscribers_share_one_stream(monkeypatch, app):
+    mock = mock_market_depth_stream(monkeypatch, 0)
+
+    with app.StreamHub() as hub:
+        subscription1 = hub.market_depth(PRODUCT_ID)
+        subscription2 = hub.market_depth(PRODUCT_ID)
+        wait_until(lambda: mock.call_count == 1)
+
+        subscription1.close()
+        assert mock.state["cancelled"] is False
+        subscription2.close()
+        wait_until(lambda: mock.state["cancelled"])
+
+    assert mock.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "overflow,expected",
+    [
+        (OverflowPolicy.DROP_OLDEST, ["3", "4"]),
+        (OverflowPolicy.DROP_NEWEST, ["0", "1"]),
+        (OverflowPolicy.COALESCE, ["0", "4"]),
+    ],
+)
+def test_market_depth__slow_consumer__applies_overflow_policy(
+    monkeypatch, app, overflow, expected
+):
+    mock_market_depth_stream(monkeypatch, 5)
+
+    with app.StreamHub(queue_size=2, overflow=overflow) as hub:
+        with hub.market_depth(PRODUCT_ID) as subscription:
+            wait_until(lambda: subscription.dropped == 3)
+            assert [next(subscription).product_id for _ in range(2)] == expected
+            assert subscription.queued == 0
+
+
+def test_market_depth__async_consumer__raises_permanent_error(monkeypatch, app):
+    async def fake_iter_market_depth_data(self, product_id):
+        yield make_market_depth_data(product_id="0")
+        raise NotFoundError("Product not found")
+
+    monkeypatch.setattr(
+        AsyncExchangeClient, "iter_market_depth_data", fake_iter_market_depth_data
+    )
+
+    async def consume(subscription) -> list[str]:
+        received = []
+        async for market_depth in subscription:
+            received.append(market_depth.product_id)
+        return received
+
+    with app.StreamHub() as hub:
+        subscription = hub.market_depth(PRODUCT_ID)
+        with pytest.raises(NotFoundError):
+            asyncio.run(consume(subscription))
+        with pytest.raises(NotFoundError):
+            next(subscription)
+        subscription.close()
+        assert list(subscription) == []
+
+
+def test_market_depth__timeout__resubscribes(monkeypatch, app):
+    async def fake_iter_market_depth_data(self, product_id):
+        yield make_market_depth_data(product_id=str(mock.call_count))
+        if mock.call_count == 1:
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(3600)
+
+    mock = Mock(side_effect=fake_iter_market_depth_data)
+    monkeypatch.setattr(
+        AsyncExchangeClient,
+        "iter_market_depth_data",
+        lambda self, product_id: mock(self, product_id),
+    )
+
+    with app.StreamHub() as hub:
+        with hub.market_depth(PRODUCT_ID) as subscription:
+            assert [next(subscription).product_id for _ in range(2)] == ["1", "2"]
+
+    assert mock.call_count == 2
+
+
+def test_close__ends_iteration_of_open_subscriptions(monkeypatch, app):
+    mock_market_depth_stream(monkeypatch, 1)
+
+    hub = app.StreamHub()
+    subscription = hub.market_depth(PRODUCT_ID)
+    wait_until(lambda: subscription.queued == 1)
+    hub.close()
+
+    assert [item.product_id for item in subscription] == ["0"]
+    with pytest.raises(RuntimeError):
+        hub.market_depth(PRODUCT_ID)
+
+
+def make_fill(trade_id, state=TradeState.PENDING):
+    return make_order_fill(trade=make_trade(id=trade_id, state=state).model_dump())
+
+
+def mock_order_fill_streams(monkeypatch, *streams) -> None:
+    remaining = list(streams)
+    monkeypatch.setattr(
+        AsyncExchangeClient,
+        "iter_order_fills",
+        lambda self, filter: remaining.pop(0)(),
+    )
+
+
+def test_order_fills__reconnect__backfills_missed_fills_once(monkeypatch, app):
+    async def first_stream():
+        yield make_fill("1")
+        raise ExchangeError("Lost connection to the exchange")
+
+    async def second_stream():
+        yield make_fill("2")
+        yield make_fill("3")
+        await asyncio.sleep(3600)
+
+    mock_order_fill_streams(monkeypatch, first_stream, second_stream)
+    mock_get_order_fills = AsyncMock(
+        return_value=[
+            make_fill("1"),
+            make_fill("2"),
+            make_fill("4", TradeState.CLEARED),
+        ]
+    )
+    monkeypatch.setattr(AsyncExchangeClient, "get_order_fills", mock_get_order_fills)
+
+    with app.StreamHub() as hub:
+        with hub.order_fills() as subscription:
+            fills = [next(subscription) for _ in range(4)]
+
+    assert [fill.trade.id for fill in fills] == ["1", "2", "4", "3"]
+    backfill_filter = mock_get_order_fills.call_args[0][0]
+    assert backfill_filter.trade_states == []
+    assert backfill_filter.newest_first is False
+
+
+def test_order_fills__slow_consumer__fails_subscription(monkeypatch, app):
+    async def stream():
+        for i in range(3):
+            yield make_fill(str(i))
+        await asyncio.sleep(3600)
+
+    mock_order_fill_streams(monkeypatch, stream)
+
+    with app.StreamHub() as hub:
+        with pytest.raises(ValueError):
+            hub.order_fills(overflow=OverflowPolicy.DROP_OLDEST)
+        with hub.order_fills(queue_size=2) as subscription:
+            wait_until(lambda: subscription.dropped == 1)
+            assert [next(subscription).trade.id for _ in range(2)] == ["0", "1"]
+            with pytest.raises(RuntimeError):
+                next(subscription)
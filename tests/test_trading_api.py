@@ -0,0 +1,684 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+from hexbytes import HexBytes
+
+import afp
+from afp import hashing
+from afp.api.trading import IntentSpec, Trading
+from afp.dtos import ExchangeParameters
+from afp.enums import OrderSide, OrderState, OrderType, TradeState
+from afp.exceptions import (
+    AuthenticationError,
+    ExchangeError,
+    NotFoundError,
+    ReplaceOrderError,
+    ValidationError,
+)
+from afp.exchange import AsyncExchangeClient, ExchangeClient
+from afp.nonces import RangeNonceAllocator
+from afp.schemas import Order
+
+from . import AuthenticatorStub
+from .fixtures import (
+    make_exchange_parameters,
+    make_exchange_product,
+    make_intent_data,
+    make_ohlcv_item,
+    make_order,
+    make_order_fill,
+    make_trade,
+)
+
+
+PRIVATE_KEY = "0x32df57bd2cbdca044227974f6937d5722da13344218daa4286071e7850d28694"
+INTENT_HASH = "0x9876543210987654321098765432109876543210987654321098765432109876"
+
+
+@pytest.fixture
+def trading(monkeypatch) -> Trading:
+    fake_exchange_params = ExchangeParameters(
+        trading_protocol_id="0x783b16190c71278E78f69Af32815CcA818A9822f",
+        maker_trading_fee_rate=Decimal("0"),
+        taker_trading_fee_rate=Decimal("0"),
+    )
+    monkeypatch.setattr(
+        ExchangeClient, "login", Mock(return_value=fake_exchange_params)
+    )
+    monkeypatch.setattr(
+        ExchangeClient, "generate_login_nonce", Mock(return_value="12345678")
+    )
+    app = afp.AFP(authenticator=afp.PrivateKeyAuthenticator(PRIVATE_KEY))
+    return app.Trading()
+
+
+def test_submit_cancel_orders__relogins_and_resubmits_expired(monkeypatch, trading):
+    order = make_order(id="cancel-1")
+    mock_submit_order = Mock(side_effect=[AuthenticationError(), order])
+    monkeypatch.setattr(ExchangeClient, "submit_order", mock_submit_order)
+    login_count = ExchangeClient.login.call_count  # type: ignore
+
+    results = trading.submit_cancel_orders([INTENT_HASH])
+
+    assert results == [order]
+    assert mock_submit_order.call_count == 2
+    assert ExchangeClient.login.call_count == login_count + 1  # type: ignore
+
+
+def test_submit_cancel_orders__returns_errors_in_input_order(monkeypatch, trading):
+    order = make_order(id="cancel-1")
+    error = ValidationError("Unknown intent")
+
+    def fake_submit_order(submission):
+        if submission.cancellation_data.intent_hash == INTENT_HASH:
+            return order
+        raise error
+
+    monkeypatch.setattr(
+        ExchangeClient, "submit_order", Mock(side_effect=fake_submit_order)
+    )
+
+    other_hash = "0x" + "ab" * 32
+    results = trading.submit_cancel_orders([other_hash, INTENT_HASH])
+
+    assert results == [error, order]
+
+
+def test_AsyncTrading__submit_cancel_orders__signs_in_bulk(monkeypatch):
+    trading = afp.AFP(
+        authenticator=afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    ).AsyncTrading()
+    sign_messages = Mock(wraps=trading._sign_messages)
+    monkeypatch.setattr(trading, "_sign_messages", sign_messages)
+    submit_orders = AsyncMock(return_value=[])
+    monkeypatch.setattr(trading, "_submit_orders", submit_orders)
+    other_hash = "0x" + "ab" * 32
+
+    asyncio.run(trading.submit_cancel_orders([INTENT_HASH, other_hash]))
+
+    sign_messages.assert_called_once()
+    (submissions,) = submit_orders.call_args.args
+    assert [submission.cancellation_data.intent_hash for submission in submissions] == [
+        INTENT_HASH,
+        other_hash,
+    ]
+
+
+def test_AsyncTrading__concurrent_token_expiry__logs_in_once(monkeypatch):
+    logged_in = False
+
+    async def login(self, submission):
+        nonlocal logged_in
+        await asyncio.sleep(0.01)
+        logged_in = True
+        return make_exchange_parameters()
+
+    async def get_order_by_id(self, order_id):
+        await asyncio.sleep(0)
+        if not logged_in:
+            raise AuthenticationError("Token expired")
+        return make_order(id=order_id)
+
+    mock_login = Mock(side_effect=login)
+    monkeypatch.setattr(
+        AsyncExchangeClient,
+        "generate_login_nonce",
+        AsyncMock(return_value="12345678"),
+    )
+    monkeypatch.setattr(
+        AsyncExchangeClient,
+        "login",
+        lambda self, submission: mock_login(self, submission),
+    )
+    monkeypatch.setattr(AsyncExchangeClient, "get_order_by_id", get_order_by_id)
+    trading = afp.AFP(authenticator=AuthenticatorStub()).AsyncTrading()
+    order_ids = ["0x" + f"{i:02x}" * 32 for i in range(10)]
+
+    async def fetch_orders() -> list[Order]:
+        return await asyncio.gather(*(trading.order(id) for id in order_ids))
+
+    orders = asyncio.run(fetch_orders())
+
+    assert [order.id for order in orders] == order_ids
+    assert mock_login.call_count == 1
+
+
+def test_iter_order_fills__reconnect__backfills_missed_fills_once(monkeypatch, trading):
+    monkeypatch.setattr("afp.api.trading.time.sleep", Mock())
+
+    def make_fill(trade_id, state=TradeState.PENDING):
+        return make_order_fill(trade=make_trade(id=trade_id, state=state).model_dump())
+
+    def first_stream():
+        yield make_fill("1")
+        raise ExchangeError("Lost connection to the exchange")
+
+    def second_stream():
+        yield make_fill("2")
+        yield make_fill("3")
+
+    monkeypatch.setattr(
+        ExchangeClient,
+        "iter_order_fills",
+        Mock(side_effect=[first_stream(), second_stream()]),
+    )
+    mock_get_order_fills = Mock(
+        return_value=[
+            make_fill("1"),
+            make_fill("2"),
+            make_fill("4", TradeState.CLEARED),
+        ]
+    )
+    monkeypatch.setattr(ExchangeClient, "get_order_fills", mock_get_order_fills)
+
+    fills = list(islice(trading.iter_order_fills(reconnect=True), 4))
+
+    assert [fill.trade.id for fill in fills] == ["1", "2", "4", "3"]
+    backfill_filter = mock_get_order_fills.call_args[0][0]
+    assert backfill_filter.trade_states == []
+    assert backfill_filter.newest_first is False
+
+
+def test_iter_order_fills__reconnect__logs_in_after_token_expiry(monkeypatch, trading):
+    monkeypatch.setattr("afp.api.trading.time.sleep", Mock())
+
+    def expired_stream():
+        raise AuthenticationError("Token expired")
+        yield
+
+    fill = make_order_fill()
+    monkeypatch.setattr(
+        ExchangeClient,
+        "iter_order_fills",
+        Mock(side_effect=[expired_stream(), iter([fill])]),
+    )
+    monkeypatch.setattr(ExchangeClient, "get_order_fills", Mock(return_value=[]))
+    login_count = ExchangeClient.login.call_count  # type: ignore
+
+    fills = list(islice(trading.iter_order_fills(reconnect=True), 1))
+
+    assert fills == [fill]
+    assert ExchangeClient.login.call_count == login_count + 1  # type: ignore
+
+
+def test_iter_market_depth__reconnect__raises_permanent_errors(monkeypatch, trading):
+    monkeypatch.setattr(
+        ExchangeClient,
+        "iter_market_depth_data",
+        Mock(side_effect=NotFoundError("Product not found")),
+    )
+
+    with pytest.raises(NotFoundError):
+        next(trading.iter_market_depth(INTENT_HASH, reconnect=True))
+
+
+def test_iter_ohlcv__reconnect__resumes_from_last_data_point(monkeypatch, trading):
+    monkeypatch.setattr("afp.api.trading.time.sleep", Mock())
+
+    def first_stream():
+        yield make_ohlcv_item(timestamp=1700000000)
+        yield make_ohlcv_item(timestamp=1700000005)
+        raise ExchangeError("Lost connection to the exchange")
+
+    mock_iter = Mock(
+        side_effect=[
+            first_stream(),
+            iter([make_ohlcv_item(timestamp=1700000005, volume=5)]),
+        ]
+    )
+    monkeypatch.setattr(ExchangeClient, "iter_time_series_data", mock_iter)
+
+    items = list(islice(trading.iter_ohlcv(INTENT_HASH, reconnect=True), 3))
+
+    assert [item.volume for item in items] == [1000, 1000, 5]
+    assert mock_iter.call_args_list[1][0][1] == 1700000005
+
+
+def test_ohlcv_array__returns_fixed_point_prices(monkeypatch, trading):
+    monkeypatch.setattr(
+        ExchangeClient,
+        "get_product_by_id",
+        Mock(return_value=make_exchange_product(id=INTENT_HASH, tick_size=2)),
+    )
+    items = [
+        make_ohlcv_item(timestamp=1700000000, close=Decimal("50500.25")),
+        make_ohlcv_item(timestamp=1700000300, open=Decimal("0.07"), volume=7),
+    ]
+    monkeypatch.setattr(
+        ExchangeClient,
+        "get_raw_time_series_data",
+        Mock(return_value=[item.model_dump(mode="json") for item in items]),
+    )
+
+    array = trading.ohlcv_array(INTENT_HASH)
+
+    assert array["timestamp"].tolist() == [1700000000, 1700000300]
+    assert array["close"].tolist() == [5050025, 5050000]
+    assert array["open"].tolist() == [5000000, 7]
+    assert array["volume"].tolist() == [1000, 7]
+    assert array["high"].dtype == np.int64
+
+
+def test_ohlcv_array__scales_prices_exactly(monkeypatch, trading):
+    monkeypatch.setattr(
+        ExchangeClient,
+        "get_product_by_id",
+        Mock(return_value=make_exchange_product(id=INTENT_HASH, tick_size=4)),
+    )
+    # 9007199254740993 (2^53 + 1) ticks cannot be represented as a float64
+    items = [make_ohlcv_item(close=Decimal("900719925474.0993"))]
+    monkeypatch.setattr(
+        ExchangeClient,
+        "get_raw_time_series_data",
+        Mock(return_value=[item.model_dump(mode="json") for item in items]),
+    )
+
+    array = trading.ohlcv_array(INTENT_HASH)
+
+    assert array["close"].tolist() == [9007199254740993]
+
+
+def test_order_fills_table__returns_columns(monkeypatch, trading):
+    other_product_id = "0x" + "ab" * 32
+    products = {
+        INTENT_HASH: make_exchange_product(id=INTENT_HASH, tick_size=2),
+        other_product_id: make_exchange_product(id=other_product_id, tick_size=0),
+    }
+    monkeypatch.setattr(
+        ExchangeClient, "get_product_by_id", Mock(side_effect=products.__getitem__)
+    )
+    order_fills = [
+        make_order_fill(
+            trade=make_trade(id="1", product_id=INTENT_HASH).model_dump(),
+            price=Decimal("101.25"),
+        ),
+        make_order_fill(
+            trade=make_trade(id="2", product_id=other_product_id).model_dump(),
+            price=Decimal("99"),
+            quantity=3,
+        ),
+    ]
+    monkeypatch.setattr(
+        ExchangeClient,
+        "get_raw_order_fills",
+        Mock(return_value=[fill.model_dump(mode="json") for fill in order_fills]),
+    )
+
+    table = trading.order_fills_table()
+
+    assert table["price"].tolist() == [10125, 99]
+    assert table["quantity"].tolist() == [50, 3]
+    assert table["trade_id"].tolist() == ["1", "2"]
+    assert table["product_id"].tolist() == [INTENT_HASH, other_product_id]
+    assert table["side"].tolist() == [str(order_fills[0].order.intent.data.side)] * 2
+    assert table["timestamp"].tolist() == [1700000000, 1700000000]
+
+
+def _serve_batches(items):
+    requests = []
+
+    def get_batch(filter):
+        requests.append((filter.batch, filter.batch_size))
+        offset = (filter.batch - 1) * filter.batch_size
+        return items[offset : offset + filter.batch_size]
+
+    return get_batch, requests
+
+
+def test_iter_all_order_fills__grows_batch_size_without_gaps(monkeypatch, trading):
+    order_fills = [
+        make_order_fill(trade=make_trade(id=str(i)).model_dump()) for i in range(230)
+    ]
+    get_batch, requests = _serve_batches(order_fills)
+    monkeypatch.setattr(ExchangeClient, "get_order_fills", Mock(side_effect=get_batch))
+
+    result = list(trading.iter_all_order_fills(batch_size=10, max_batch_size=40))
+
+    assert [order_fill.trade.id for order_fill in result] == [
+        str(i) for i in range(230)
+    ]
+    assert requests == [
+        (1, 10),
+        (2, 10),
+        (2, 20),
+        (2, 40),
+        (3, 40),
+        (4, 40),
+        (5, 40),
+        (6, 40),
+    ]
+
+
+def test_iter_all_orders__stops_at_end_bound(monkeypatch, trading):
+    orders = [make_order(id=str(i), timestamp=1700000000 + i) for i in range(100)]
+    get_batch, requests = _serve_batches(orders)
+    monkeypatch.setattr(ExchangeClient, "get_orders", Mock(side_effect=get_batch))
+
+    result = list(
+        trading.iter_all_orders(
+            end=datetime.fromtimestamp(1700000014, UTC), batch_size=10
+        )
+    )
+
+    assert [order.id for order in result] == [str(i) for i in range(15)]
+    # The batch after the one containing the bound may have been prefetched
+    assert len(requests) <= 3
+
+
+def test_iter_all_products__relogins_after_token_expiry(monkeypatch, trading):
+    products = [make_exchange_product(id=f"0x{i:064x}") for i in range(5)]
+    get_batch, requests = _serve_batches(products)
+
+    def get_approved_products(filter):
+        if not requests:
+            requests.append(None)
+            raise AuthenticationError("expired")
+        return get_batch(filter)
+
+    monkeypatch.setattr(
+        ExchangeClient,
+        "get_approved_products",
+        Mock(side_effect=get_approved_products),
+    )
+    login = Mock()
+    monkeypatch.setattr(ExchangeClient, "login", login)
+
+    result = list(trading.iter_all_products(batch_size=2))
+
+    assert result == products
+    login.assert_called_once()
+
+
+def test_create_intents__matches_create_intent(monkeypatch, trading):
+    monkeypatch.setattr(Trading, "_generate_nonce", Mock(side_effect=[1, 2, 1, 2]))
+    product = make_exchange_product(
+        id=INTENT_HASH, tick_size=2, min_price=Decimal("1"), max_price=Decimal("1000")
+    )
+    specs = [
+        IntentSpec(
+            product=product,
+            side=side,
+            limit_price=Decimal(limit_price),
+            quantity=quantity,
+            max_trading_fee_rate=Decimal("0.01"),
+            good_until_time=datetime.fromtimestamp(1800000000, UTC),
+        )
+        for side, limit_price, quantity in [("bid", "100.5", 3), ("ask", "101", 1)]
+    ]
+
+    intents = trading.create_intents(specs)
+    expected = [trading.create_intent(**vars(spec)) for spec in specs]
+
+    assert intents == expected
+    assert [intent.data.side for intent in intents] == [OrderSide.BID, OrderSide.ASK]
+    assert intents[0].hash != intents[1].hash
+    authenticator = afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    for intent in intents:
+        signature = authenticator.sign_message(HexBytes(intent.hash))
+        assert intent.signature == signature.to_0x_hex()
+
+
+def test_cancel_all__cancels_live_orders_of_product(monkeypatch, trading):
+    intent_hashes = ["0x" + f"{i:02x}" * 32 for i in range(3)]
+    orders = [
+        make_order(
+            id=str(i), intent={**make_order().intent.model_dump(), "hash": intent_hash}
+        )
+        for i, intent_hash in enumerate(intent_hashes)
+    ]
+    get_orders = Mock(return_value=orders)
+    monkeypatch.setattr(ExchangeClient, "get_orders", get_orders)
+    error = ValidationError("Order is already cancelled")
+
+    def fake_submit_order(submission):
+        if submission.cancellation_data.intent_hash == intent_hashes[1]:
+            raise error
+        return make_order(id="cancel-" + submission.cancellation_data.intent_hash)
+
+    submit_order = Mock(side_effect=fake_submit_order)
+    monkeypatch.setattr(ExchangeClient, "submit_order", submit_order)
+
+    results = trading.cancel_all(product_id=INTENT_HASH, side="bid")
+
+    assert list(results) == intent_hashes
+    assert results[intent_hashes[1]] is error
+    assert results[intent_hashes[2]].id == "cancel-" + intent_hashes[2]
+    (filter,) = get_orders.call_args.args
+    assert filter.product_id == INTENT_HASH
+    assert filter.side == OrderSide.BID
+    assert set(filter.states) == {"RECEIVED", "PENDING", "OPEN", "PARTIAL"}
+
+    authenticator = afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    for (submission,), _ in submit_order.call_args_list:
+        data = submission.cancellation_data
+        cancellation_hash = hashing.generate_order_cancellation_hash(
+            data.nonce, data.intent_hash
+        )
+        signature = authenticator.sign_message(cancellation_hash)
+        assert data.signature == signature.to_0x_hex()
+
+
+def _make_live_order(i: int, product_id: str = INTENT_HASH) -> Order:
+    intent_data = make_intent_data(
+        product_id=product_id, good_until_time=datetime.now(UTC) + timedelta(hours=1)
+    )
+    intent = make_order().intent.model_copy(
+        update={"hash": "0x" + f"{i:02x}" * 32, "data": intent_data}
+    )
+    return make_order(id=str(i), intent=intent.model_dump())
+
+
+def test_presign_cancellations__cancels_without_signing(monkeypatch, trading):
+    presigning = afp.AFP(
+        authenticator=afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    ).Trading(presign_cancellations=True)
+    other_product_id = "0x" + "cd" * 32
+    orders = [_make_live_order(0), _make_live_order(1, other_product_id)]
+    submitted = iter(orders)
+    monkeypatch.setattr(
+        ExchangeClient,
+        "submit_order",
+        Mock(
+            side_effect=lambda submission: (
+                next(submitted)
+                if submission.intent is not None
+                else make_order(id="cancel-" + submission.cancellation_data.intent_hash)
+            )
+        ),
+    )
+
+    presigning.submit_limit_orders([order.intent for order in orders])
+    sign_messages = Mock()
+    monkeypatch.setattr(Trading, "_sign_messages", sign_messages)
+    results = presigning.kill_switch(product_id=INTENT_HASH)
+
+    assert list(results) == [orders[0].intent.hash]
+    (cancellation,) = results.values()
+    assert isinstance(cancellation, Order)
+    assert cancellation.id == "cancel-" + orders[0].intent.hash
+    sign_messages.assert_not_called()
+
+    cancellation = presigning.submit_cancel_order(orders[1].intent.hash)
+
+    assert cancellation.id == "cancel-" + orders[1].intent.hash
+    sign_messages.assert_not_called()
+    assert presigning.kill_switch() == {}
+    with pytest.raises(RuntimeError):
+        trading.kill_switch()
+
+
+def test_presign_cancellations__keeps_rejected_cancellations(monkeypatch, trading):
+    presigning = afp.AFP(
+        authenticator=afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    ).Trading(presign_cancellations=True)
+    order = _make_live_order(0)
+    monkeypatch.setattr(ExchangeClient, "submit_order", Mock(return_value=order))
+    presigning.submit_limit_order(order.intent)
+    sign_messages = Mock()
+    monkeypatch.setattr(Trading, "_sign_messages", sign_messages)
+
+    monkeypatch.setattr(
+        ExchangeClient,
+        "submit_order",
+        Mock(side_effect=ExchangeError("Lost connection to the exchange")),
+    )
+    (result,) = presigning.kill_switch().values()
+
+    assert isinstance(result, ExchangeError)
+    assert len(presigning._presigned or ()) == 1  # type: ignore
+
+    cancellation = make_order(id="cancel")
+    monkeypatch.setattr(ExchangeClient, "submit_order", Mock(return_value=cancellation))
+
+    assert presigning.kill_switch() == {order.intent.hash: cancellation}
+    assert len(presigning._presigned or ()) == 0  # type: ignore
+    sign_messages.assert_not_called()
+
+
+def test_presign_cancellations__discards_finished_orders(monkeypatch, trading):
+    presigning = afp.AFP(
+        authenticator=afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    ).Trading(presign_cancellations=True)
+    orders = [_make_live_order(i) for i in range(3)]
+    submitted = iter(orders)
+    monkeypatch.setattr(
+        ExchangeClient, "submit_order", Mock(side_effect=lambda _: next(submitted))
+    )
+    for order in orders:
+        presigning.submit_limit_order(order.intent)
+    finished = [
+        orders[0].model_copy(update={"state": OrderState.COMPLETED}),
+        orders[1].model_copy(update={"state": OrderState.PARTIAL}),
+    ]
+    monkeypatch.setattr(ExchangeClient, "get_orders", Mock(return_value=finished))
+    monkeypatch.setattr(
+        ExchangeClient,
+        "get_order_by_id",
+        Mock(return_value=orders[2].model_copy(update={"state": OrderState.CANCELLED})),
+    )
+
+    presigning.orders()
+    presigning.order(INTENT_HASH)
+
+    assert len(presigning._presigned or ()) == 1  # type: ignore
+
+
+def test_replace_order__signs_once_and_submits_both_legs(monkeypatch, trading):
+    product = make_exchange_product(
+        id=INTENT_HASH, tick_size=2, min_price=Decimal("1"), max_price=Decimal("1000")
+    )
+    submit_order = Mock(
+        side_effect=lambda submission: make_order(id=submission.type.value)
+    )
+    monkeypatch.setattr(ExchangeClient, "submit_order", submit_order)
+    sign_messages = Mock(wraps=trading._sign_messages)
+    monkeypatch.setattr(trading, "_sign_messages", sign_messages)
+
+    cancellation, order = trading.replace_order(
+        INTENT_HASH,
+        product=product,
+        side="ask",
+        limit_price=Decimal("101"),
+        quantity=2,
+        max_trading_fee_rate=Decimal("0.01"),
+        good_until_time=datetime.fromtimestamp(1800000000, UTC),
+    )
+
+    assert (cancellation.id, order.id) == ("CANCEL_ORDER", "LIMIT_ORDER")
+    sign_messages.assert_called_once()
+    submissions = {
+        submission.type: submission for (submission,), _ in submit_order.call_args_list
+    }
+    authenticator = afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    data = submissions[OrderType.CANCEL_ORDER].cancellation_data
+    assert data.intent_hash == INTENT_HASH
+    assert data.signature == (
+        authenticator.sign_message(
+            hashing.generate_order_cancellation_hash(data.nonce, data.intent_hash)
+        ).to_0x_hex()
+    )
+    intent = submissions[OrderType.LIMIT_ORDER].intent
+    assert intent.data.limit_price == Decimal("101")
+    assert intent.signature == (
+        authenticator.sign_message(HexBytes(intent.hash)).to_0x_hex()
+    )
+
+
+def test_replace_order__raises_with_result_of_each_leg(monkeypatch, trading):
+    product = make_exchange_product(
+        id=INTENT_HASH, tick_size=2, min_price=Decimal("1"), max_price=Decimal("1000")
+    )
+    error = ValidationError("Order is already filled")
+    order = make_order(id="new")
+
+    def fake_submit_order(submission):
+        if submission.type == OrderType.CANCEL_ORDER:
+            raise error
+        return order
+
+    monkeypatch.setattr(
+        ExchangeClient, "submit_order", Mock(side_effect=fake_submit_order)
+    )
+
+    with pytest.raises(ReplaceOrderError) as exc_info:
+        trading.replace_order(
+            INTENT_HASH,
+            product=product,
+            side="bid",
+            limit_price=Decimal("99"),
+            quantity=1,
+            max_trading_fee_rate=Decimal("0.01"),
+            good_until_time=datetime.fromtimestamp(1800000000, UTC),
+        )
+
+    assert exc_info.value.cancellation is error
+    assert exc_info.value.order is order
+
+
+def test_product__served_from_cache(monkeypatch, trading):
+    caching = afp.AFP(authenticator=afp.PrivateKeyAuthenticator(PRIVATE_KEY)).Trading(
+        cache_products=True
+    )
+    product = make_exchange_product(id=INTENT_HASH)
+    get_approved_products = Mock(return_value=[product])
+    get_product_by_id = Mock()
+    monkeypatch.setattr(ExchangeClient, "get_approved_products", get_approved_products)
+    monkeypatch.setattr(ExchangeClient, "get_product_by_id", get_product_by_id)
+
+    assert caching.product(INTENT_HASH) == product
+    assert caching.product(INTENT_HASH) == product
+    get_approved_products.assert_called_once()
+    get_product_by_id.assert_not_called()
+    assert caching.product_cache is not None
+    assert trading.product_cache is None
+
+
+def test_create_intent__uses_nonce_allocator(monkeypatch, trading):
+    allocating = afp.AFP(
+        authenticator=afp.PrivateKeyAuthenticator(PRIVATE_KEY)
+    ).Trading(nonce_allocator=RangeNonceAllocator(100))
+    product = make_exchange_product(
+        id=INTENT_HASH, tick_size=2, min_price=Decimal("1"), max_price=Decimal("1000")
+    )
+    spec = IntentSpec(
+        product=product,
+        side="bid",
+        limit_price=Decimal("100.5"),
+        quantity=1,
+        max_trading_fee_rate=Decimal("0.01"),
+        good_until_time=datetime.fromtimestamp(1800000000, UTC),
+    )
+
+    intents = allocating.create_intents([spec, spec])
+
+    assert [intent.data.nonce for intent in intents] == [100, 101]
+    # Intents with the same nonce are identical, so a retry cannot be placed twice
+    replayed = trading.create_intents([spec])
+    monkeypatch.setattr(trading, "_nonce_allocator", RangeNonceAllocator(100))
+    assert replayed[0].hash != intents[0].hash
+    assert trading.create_intents([spec])[0].hash == intents[0].hash